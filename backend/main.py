@@ -2,6 +2,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from dotenv import load_dotenv
+import asyncio
 import logging
 import os
 import sys
@@ -10,9 +11,14 @@ from alembic.config import Config
 from alembic import command
 from contextlib import asynccontextmanager
 
-from routers import users, events, meals, checkout, reviews, onboarding
+from routers import users, events, meals, checkout, reviews, onboarding, uploads
 from routers.gateways.stripe import webhook, connect_webhook
+from services import email_outbox_service, seat_service, upload_service
+from services.gateways import storage_service, stripe_service
 from utils.config import Config as AppConfig
+from utils.database import pool_stats
+from utils.http_cache import HTTPCacheMiddleware
+from utils.password import token_cache_stats
 
 import sentry_sdk
 
@@ -55,8 +61,23 @@ async def lifespan(app: FastAPI):
             raise
     else:
         logger.info("RUN_MIGRATIONS_ON_STARTUP disabled - skipping migrations")
+    workers = []
+    if AppConfig.EMAIL_OUTBOX_WORKER_ENABLED:
+        workers.append(asyncio.create_task(email_outbox_service.run_worker()))
+    if AppConfig.SEAT_HOLD_SWEEPER_ENABLED:
+        workers.append(asyncio.create_task(seat_service.run_hold_sweeper()))
+    if AppConfig.UPLOAD_STAGING_SWEEPER_ENABLED:
+        workers.append(asyncio.create_task(upload_service.run_staging_sweeper()))
     yield
     # Code after yield runs on application shutdown
+    for worker in workers:
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+    await stripe_service.close_http_client()
+    await storage_service.close_http_client()
     logger.info("Application shutdown")
 
 
@@ -73,6 +94,9 @@ allowed_origins = [
     if o.strip()
 ]
 
+# ETag / 304 / Cache-Control for endpoints marked @cacheable
+app.add_middleware(HTTPCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -114,6 +138,7 @@ app.include_router(meals.router)
 app.include_router(checkout.router)
 app.include_router(reviews.router)
 app.include_router(onboarding.router)
+app.include_router(uploads.router)
 app.include_router(webhook.router)
 app.include_router(connect_webhook.router)
 
@@ -123,6 +148,18 @@ async def root():
     return {"message": "Welcome to Dorm Made - Culinary Social Network API"}
 
 
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Connection pool usage and checkout wait times for this worker (tuning aid)"""
+    return pool_stats()
+
+
+@app.get("/health/auth-cache")
+async def auth_cache_health():
+    """Verified-token cache size and hit rate for this worker"""
+    return token_cache_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
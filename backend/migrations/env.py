@@ -28,10 +28,29 @@ from models.event import EventModel
 from models.event_participant import EventParticipantModel
 from models.event_review import EventReviewModel
 from models.guest_review import GuestReviewModel
+from models.user_rating_aggregate import UserRatingAggregateModel
+from models.email_outbox import EmailOutboxModel
+from models.seat_hold import SeatHoldModel
+from models.stripe_webhook_event import StripeWebhookEventModel
 
 # Set target_metadata to our Base.metadata for autogenerate support
 target_metadata = Base.metadata
 
+# Search columns/indexes (migration a7c3e9f1b2d4) exist only in the database;
+# keep autogenerate from proposing to drop them
+_UNMAPPED_SEARCH_OBJECTS = {
+    "search_vector",
+    "ix_events_search_vector",
+    "ix_events_title_trgm",
+    "ix_meals_search_vector",
+    "ix_meals_title_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in _UNMAPPED_SEARCH_OBJECTS)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -54,6 +73,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -76,7 +96,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,36 @@
+"""Allow 'sending' on email_outbox rows claimed by a delivery worker
+
+Revision ID: a3d7f2b9c4e6
+Revises: f7c1d9e3a5b2
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d7f2b9c4e6"
+down_revision: Union[str, Sequence[str], None] = "f7c1d9e3a5b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("valid_status", "email_outbox", type_="check")
+    op.create_check_constraint(
+        "valid_status",
+        "email_outbox",
+        "status IN ('pending', 'sending', 'sent', 'failed')",
+    )
+
+
+def downgrade() -> None:
+    # Claimed but unrecorded sends go back to the queue
+    op.execute("UPDATE email_outbox SET status = 'pending' WHERE status = 'sending'")
+    op.drop_constraint("valid_status", "email_outbox", type_="check")
+    op.create_check_constraint(
+        "valid_status",
+        "email_outbox",
+        "status IN ('pending', 'sent', 'failed')",
+    )
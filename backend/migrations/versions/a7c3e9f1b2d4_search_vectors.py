@@ -0,0 +1,58 @@
+"""Add full-text search vectors and trigram title indexes to events and meals
+
+search_vector is a generated tsvector (title A, description B, location /
+ingredients C) with a GIN index; pg_trgm GIN indexes on title back the
+typo-tolerant `<%` match. Queries live in utils/search.py. The columns are
+generated by Postgres and deliberately not mapped on the models.
+
+Revision ID: a7c3e9f1b2d4
+Revises: d8b2f6a1e5c9
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1b2d4"
+down_revision: Union[str, Sequence[str], None] = "d8b2f6a1e5c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SEARCH_FIELDS = {
+    "events": ("title", "description", "location"),
+    "meals": ("title", "description", "ingredients"),
+}
+
+
+def _vector_sql(fields) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('english', coalesce({field}, '')), '{weight}')"
+        for field, weight in zip(fields, "ABC")
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, fields in _SEARCH_FIELDS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_vector_sql(fields)}) STORED"
+        )
+        op.execute(
+            f"CREATE INDEX ix_{table}_search_vector ON {table} "
+            f"USING gin (search_vector) WHERE is_deleted = false"
+        )
+        op.execute(
+            f"CREATE INDEX ix_{table}_title_trgm ON {table} "
+            f"USING gin (title gin_trgm_ops) WHERE is_deleted = false"
+        )
+
+
+def downgrade() -> None:
+    for table in _SEARCH_FIELDS:
+        op.drop_index(f"ix_{table}_title_trgm", table_name=table)
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
+    # pg_trgm is left installed: other objects may depend on it
@@ -0,0 +1,83 @@
+"""Add user_rating_aggregates (incremental per-user review totals)
+
+One row per reviewed user with review counts and per-layer star sums, so
+profile rating reads are a primary-key lookup. Backfilled here from
+event_reviews / guest_reviews; `python -m services.rating_aggregate_service`
+rebuilds it the same way later if it ever drifts.
+
+Revision ID: a7d5e2f9c3b1
+Revises: f3a8c1d2e4b6
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d5e2f9c3b1"
+down_revision: Union[str, Sequence[str], None] = "f3a8c1d2e4b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_rating_aggregates",
+        sa.Column("user_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column(
+            "host_review_count", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column("host_food_sum", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("host_space_sum", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("host_host_sum", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "guest_review_count", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column(
+            "guest_sociability_sum", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column(
+            "guest_etiquette_sum", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute("""
+        INSERT INTO user_rating_aggregates (
+            user_id,
+            host_review_count, host_food_sum, host_space_sum, host_host_sum,
+            guest_review_count, guest_sociability_sum, guest_etiquette_sum
+        )
+        SELECT
+            COALESCE(h.user_id, g.user_id),
+            COALESCE(h.cnt, 0), COALESCE(h.food, 0), COALESCE(h.space, 0),
+            COALESCE(h.host, 0),
+            COALESCE(g.cnt, 0), COALESCE(g.sociability, 0), COALESCE(g.etiquette, 0)
+        FROM (
+            SELECT host_user_id AS user_id, COUNT(*) AS cnt,
+                SUM(food_stars) AS food, SUM(space_stars) AS space,
+                SUM(host_stars) AS host
+            FROM event_reviews
+            GROUP BY host_user_id
+        ) h
+        FULL OUTER JOIN (
+            SELECT guest_id AS user_id, COUNT(*) AS cnt,
+                SUM(sociability_stars) AS sociability,
+                SUM(etiquette_stars) AS etiquette
+            FROM guest_reviews
+            GROUP BY guest_id
+        ) g ON g.user_id = h.user_id
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("user_rating_aggregates")
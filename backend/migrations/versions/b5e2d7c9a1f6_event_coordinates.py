@@ -0,0 +1,42 @@
+"""Add geocoded coordinates to events with a GiST point index
+
+Backs the `near=lat,lng&radius=` feed mode (utils/geo.py). Uses the
+built-in point type, so no PostGIS extension is required. Existing events
+start with NULL coordinates; fill them with
+`python -m services.event_service` (backfill_event_coordinates), or they are
+geocoded on their next update.
+
+Revision ID: b5e2d7c9a1f6
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e2d7c9a1f6"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9f1b2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("events", sa.Column("longitude", sa.Float(), nullable=True))
+    op.create_index(
+        "ix_events_location_point",
+        "events",
+        [sa.text("point(longitude, latitude)")],
+        unique=False,
+        postgresql_using="gist",
+        postgresql_where=sa.text("is_deleted = false AND latitude IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_location_point", table_name="events")
+    op.drop_column("events", "longitude")
+    op.drop_column("events", "latitude")
@@ -0,0 +1,40 @@
+"""Cache Stripe Connect capabilities on users
+
+charges_enabled / payouts_enabled from account.updated (or the last live
+lookup), plus when they were synced, so checkout validation can skip the
+live stripe.Account.retrieve while the stored value is fresh.
+
+Revision ID: c4e1b8a6d2f7
+Revises: a7d5e2f9c3b1
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e1b8a6d2f7"
+down_revision: Union[str, Sequence[str], None] = "a7d5e2f9c3b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users", sa.Column("stripe_charges_enabled", sa.Boolean(), nullable=True)
+    )
+    op.add_column(
+        "users", sa.Column("stripe_payouts_enabled", sa.Boolean(), nullable=True)
+    )
+    op.add_column(
+        "users",
+        sa.Column("stripe_status_synced_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "stripe_status_synced_at")
+    op.drop_column("users", "stripe_payouts_enabled")
+    op.drop_column("users", "stripe_charges_enabled")
@@ -0,0 +1,44 @@
+"""Add events.campus (from the host's university) and a campus feed index
+
+campus is the host's university normalized like user_service.campus_of
+(trimmed, inner whitespace collapsed, lower-cased). The partial
+(campus, event_date, id) index serves the campus-scoped keyset feed.
+
+Revision ID: c6f1a3e8d2b7
+Revises: b5e2d7c9a1f6
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f1a3e8d2b7"
+down_revision: Union[str, Sequence[str], None] = "b5e2d7c9a1f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("campus", sa.String(), nullable=True))
+    op.execute(r"""
+        UPDATE events
+        SET campus = lower(regexp_replace(btrim(users.university), '\s+', ' ', 'g'))
+        FROM users
+        WHERE users.id = events.host_user_id
+          AND btrim(coalesce(users.university, '')) <> ''
+        """)
+    op.create_index(
+        "ix_events_campus_feed",
+        "events",
+        ["campus", "event_date", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_campus_feed", table_name="events")
+    op.drop_column("events", "campus")
@@ -0,0 +1,38 @@
+"""Recount events.current_participants from active participations
+
+The seat counter becomes authoritative (services/seat_service): bookings
+take seats with a conditional UPDATE instead of counting participation rows.
+Reset it once from the rows it used to mirror so it starts out exact.
+
+Revision ID: d2a8f4c7e1b3
+Revises: c6f1a3e8d2b7
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a8f4c7e1b3"
+down_revision: Union[str, Sequence[str], None] = "c6f1a3e8d2b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE events
+        SET current_participants = (
+            SELECT count(*)
+            FROM events_participants
+            WHERE events_participants.event_id = events.id
+              AND events_participants.status IN ('booked', 'confirmed')
+        )
+        WHERE is_deleted = false
+        """)
+
+
+def downgrade() -> None:
+    # Data-only: the recounted values are valid under the old scheme too
+    pass
@@ -0,0 +1,47 @@
+"""Add seat_holds: seats set aside while a foodie is in Stripe Checkout
+
+Revision ID: e4b9c2d6f8a1
+Revises: d2a8f4c7e1b3
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b9c2d6f8a1"
+down_revision: Union[str, Sequence[str], None] = "d2a8f4c7e1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "seat_holds",
+        sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("foodie_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("checkout_session_id", sa.Text(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.ForeignKeyConstraint(["foodie_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id", "foodie_id", name="uq_seat_hold_event_foodie"),
+    )
+    op.create_index(
+        "ix_seat_holds_expires_at", "seat_holds", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_seat_holds_expires_at", table_name="seat_holds")
+    op.drop_table("seat_holds")
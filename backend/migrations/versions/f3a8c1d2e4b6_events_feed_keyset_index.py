@@ -0,0 +1,34 @@
+"""Add partial (event_date, id) index for the keyset-paginated event feed
+
+GET /events/feed seeks with WHERE (event_date, id) > (cursor) ORDER BY
+event_date, id over non-deleted events; this index serves that directly.
+
+Revision ID: f3a8c1d2e4b6
+Revises: e9d2c4a7b1f3
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a8c1d2e4b6"
+down_revision: Union[str, Sequence[str], None] = "e9d2c4a7b1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_feed_keyset",
+        "events",
+        ["event_date", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_feed_keyset", table_name="events")
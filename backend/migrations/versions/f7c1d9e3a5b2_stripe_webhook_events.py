@@ -0,0 +1,59 @@
+"""Add stripe_webhook_events: processed-event ledger for webhook dedup
+
+Revision ID: f7c1d9e3a5b2
+Revises: e4b9c2d6f8a1
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c1d9e3a5b2"
+down_revision: Union[str, Sequence[str], None] = "e4b9c2d6f8a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stripe_webhook_events",
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), server_default="processing", nullable=False),
+        sa.Column("outcome", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column(
+            "received_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('processing', 'processed', 'failed')", name="valid_status"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_stripe_webhook_events_type_received",
+        "stripe_webhook_events",
+        ["type", "received_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_stripe_webhook_events_type_received", table_name="stripe_webhook_events"
+    )
+    op.drop_table("stripe_webhook_events")
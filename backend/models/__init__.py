@@ -4,6 +4,10 @@ from .event_participant import EventParticipantModel
 from .meal import MealModel
 from .event_review import EventReviewModel
 from .guest_review import GuestReviewModel
+from .user_rating_aggregate import UserRatingAggregateModel
+from .email_outbox import EmailOutboxModel
+from .seat_hold import SeatHoldModel
+from .stripe_webhook_event import StripeWebhookEventModel
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import MetaData
 
@@ -14,6 +18,10 @@ __all__ = [
     "MealModel",
     "EventReviewModel",
     "GuestReviewModel",
+    "UserRatingAggregateModel",
+    "EmailOutboxModel",
+    "SeatHoldModel",
+    "StripeWebhookEventModel",
 ]
 
 # Define the base and metadata once
@@ -0,0 +1,53 @@
+from sqlalchemy import String, Integer, DateTime, Text, CheckConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from utils.database import Base
+from typing import Optional
+from datetime import datetime
+import uuid
+
+
+class EmailOutboxModel(Base):
+    """An email waiting to be (or already) delivered through Resend.
+
+    Written in the same transaction as the change that triggers it, drained
+    by services/email_outbox_service.py with retries and backoff - so a
+    Resend outage delays mail instead of dropping it, and webhook latency
+    never includes Resend.
+    """
+
+    __tablename__ = "email_outbox"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    # Which message this is (e.g. booking_confirmation) - for logs/ops only
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    # JSON-encoded Resend payload
+    params: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String, nullable=False, default="pending", server_default="pending"
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # For 'pending' rows when they are due; for 'sending' rows when the
+    # worker's lease runs out and another worker may claim them
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'sending', 'sent', 'failed')", name="valid_status"
+        ),
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
@@ -6,6 +6,9 @@ from sqlalchemy import (
     Text,
     Boolean,
     INTEGER,
+    Float,
+    Index,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -33,6 +36,13 @@ class EventModel(Base):
     max_participants: Mapped[int] = mapped_column(Integer, nullable=False)
     current_participants: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     location: Mapped[str] = mapped_column(String, nullable=False)
+    # Host's university at creation, normalized (user_service.campus_of);
+    # partitions the feed so one school's query never sorts another's events
+    campus: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Geocoded from `location` (services/gateways/geocoding_service.py);
+    # NULL when the geocoder couldn't place it
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     event_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     image_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     price: Mapped[int] = mapped_column(INTEGER, nullable=False)
@@ -41,3 +51,31 @@ class EventModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+    __table_args__ = (
+        # Keyset-paginated public feed: ORDER BY (event_date, id) over live events
+        Index(
+            "ix_events_feed_keyset",
+            "event_date",
+            "id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Campus-scoped feed: WHERE campus = ? ORDER BY (event_date, id)
+        Index(
+            "ix_events_campus_feed",
+            "campus",
+            "event_date",
+            "id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Radius queries (utils/geo.py): GiST over the built-in point type,
+        # so no PostGIS needed. Postgres-only DDL; SQLite has no point()
+        Index(
+            "ix_events_location_point",
+            func.point(text("longitude"), text("latitude")),
+            postgresql_using="gist",
+            postgresql_where=text("is_deleted = false AND latitude IS NOT NULL"),
+        ).ddl_if(dialect="postgresql"),
+        # Postgres also has a generated search_vector column with GIN and
+        # title trigram indexes; unmapped on purpose, see utils/search.py
+    )
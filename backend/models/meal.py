@@ -25,3 +25,5 @@ class MealModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Postgres also has a generated search_vector column with GIN and title
+    # trigram indexes; unmapped on purpose, see utils/search.py
@@ -0,0 +1,43 @@
+from sqlalchemy import DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from utils.database import Base
+from typing import Optional
+from datetime import datetime
+import uuid
+
+
+class SeatHoldModel(Base):
+    """A seat set aside for a foodie while they are in Stripe Checkout.
+
+    Counted in events.current_participants from the moment checkout opens.
+    checkout.session.completed turns it into a participation; otherwise it
+    is released by checkout.session.expired or, as a backstop, by the
+    sweeper in services/seat_service.py once expires_at has passed.
+    """
+
+    __tablename__ = "seat_holds"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    event_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("events.id"), nullable=False
+    )
+    foodie_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("users.id"), nullable=False
+    )
+    # Stripe Checkout Session the hold was last handed to
+    checkout_session_id: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # One hold per foodie per event; reopening checkout extends it
+        UniqueConstraint("event_id", "foodie_id", name="uq_seat_hold_event_foodie"),
+    )
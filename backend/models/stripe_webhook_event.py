@@ -0,0 +1,49 @@
+from sqlalchemy import String, Integer, DateTime, Text, CheckConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from utils.database import Base
+from typing import Optional
+from datetime import datetime
+
+
+class StripeWebhookEventModel(Base):
+    """One Stripe webhook event, keyed by Stripe's event id.
+
+    Written before the event is handled and updated with the outcome, so a
+    redelivery of a processed event is answered from one primary-key lookup
+    (services/webhook_ledger_service.py), and the table doubles as an audit
+    trail for reconciling against the Stripe dashboard.
+    """
+
+    __tablename__ = "stripe_webhook_events"
+
+    # Stripe's event id (evt_...)
+    id: Mapped[str] = mapped_column(Text, primary_key=True)
+    type: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String, nullable=False, default="processing", server_default="processing"
+    )
+    # The handler's response message, or the error it failed with
+    outcome: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Deliveries that were actually handled (a failed one is retried by Stripe)
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # When the current attempt started; lets a crashed attempt be taken over
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('processing', 'processed', 'failed')", name="valid_status"
+        ),
+        Index("ix_stripe_webhook_events_type_received", "type", "received_at"),
+    )
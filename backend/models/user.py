@@ -22,6 +22,13 @@ class UserModel(Base):
     profile_picture: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     stripe_account_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
     stripe_onboarding_complete: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    # Last known Connect account capabilities, written by the account.updated
+    # webhook (and by live lookups) so checkout doesn't call Stripe every time
+    stripe_charges_enabled: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    stripe_payouts_enabled: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    stripe_status_synced_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     # Referral system
     invite_code: Mapped[Optional[str]] = mapped_column(
         String, unique=True, nullable=True, index=True
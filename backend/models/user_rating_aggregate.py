@@ -0,0 +1,50 @@
+from sqlalchemy import Integer, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from utils.database import Base
+from datetime import datetime
+
+
+class UserRatingAggregateModel(Base):
+    """Running review totals per user, so profile ratings are a PK lookup.
+
+    Maintained incrementally in the same transaction as each new review
+    (services/rating_aggregate_service.py); averages are sum / count. Rebuild
+    from the review tables with `python -m services.rating_aggregate_service`.
+    """
+
+    __tablename__ = "user_rating_aggregates"
+
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("users.id"), primary_key=True
+    )
+    # As a chef/host (event_reviews.host_user_id)
+    host_review_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    host_food_sum: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    host_space_sum: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    host_host_sum: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # As a foodie/guest (guest_reviews.guest_id)
+    guest_review_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    guest_sociability_sum: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    guest_etiquette_sum: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
@@ -1,8 +1,25 @@
-from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    UploadFile,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+)
 from typing import List, Annotated, Optional, cast
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from schemas.event import Event, EventCreate, EventUpdate, CalendarInviteRequest
+from schemas.event import (
+    Event,
+    EventCreate,
+    EventDetail,
+    EventPage,
+    EventUpdate,
+    CalendarInviteRequest,
+)
 from schemas.event_participant import (
     EventParticipant,
     AcceptParticipationRequest,
@@ -10,9 +27,11 @@ from schemas.event_participant import (
 )
 from schemas.checkout import CreateCheckoutSessionResponse
 from schemas.refund import RefundResponse
-from utils.auth import get_current_user_id
-from utils.database import get_db
-from services import event_service
+from utils.auth import get_current_user_id, get_optional_user_id
+from utils.database import get_async_db, get_db
+from utils.geo import check_radius, parse_near
+from utils.http_cache import cacheable, mark_private
+from services import event_service, seat_service, user_service
 from services.gateways import stripe_service
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -21,7 +40,7 @@ router = APIRouter(prefix="/events", tags=["events"])
 @router.get("/me", response_model=List[Event], response_model_by_alias=True)
 async def get_my_events_endpoint(
     current_user_id: Annotated[str, Depends(get_current_user_id)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all events created by the authenticated user"""
     return await event_service.get_user_events(current_user_id, db)
@@ -109,17 +128,29 @@ async def create_checkout_session_endpoint(
             f"Event on {event.event_date.strftime('%B %d, %Y at %I:%M %p')}"
         )
 
-        # validate_checkout_requirements ensures stripe_account_id is not None
-        result = await stripe_service.create_checkout_session(
-            event_id=event_id,
-            event_title=event.title,
-            event_description=event_description,
-            price_cents=event.price,
-            chef_stripe_account_id=cast(str, chef.stripe_account_id),
-            foodie_id=current_user_id,
-            chef_id=chef.id,
-            currency=event.currency,
-        )
+        # The seat is set aside before the foodie can pay for it
+        hold, created = seat_service.hold_seat(event_id, current_user_id, db)
+        # Computed right before the call so Stripe's 30 min minimum holds
+        expires_at = seat_service.hold_expiry()
+        try:
+            # validate_checkout_requirements ensures stripe_account_id is not None
+            result = await stripe_service.create_checkout_session(
+                event_id=event_id,
+                event_title=event.title,
+                event_description=event_description,
+                price_cents=event.price,
+                chef_stripe_account_id=cast(str, chef.stripe_account_id),
+                foodie_id=current_user_id,
+                chef_id=chef.id,
+                currency=event.currency,
+                expires_at=expires_at,
+            )
+        except Exception:
+            if created:
+                seat_service.release_hold(event_id, current_user_id, db)
+                db.commit()
+            raise
+        seat_service.attach_checkout_session(hold, result["id"], expires_at, db)
 
         return CreateCheckoutSessionResponse(client_secret=result["client_secret"])
 
@@ -131,28 +162,132 @@ async def create_checkout_session_endpoint(
         )
 
 
+async def _feed_campus(
+    request: Request,
+    campus: Optional[str],
+    all_campuses: bool,
+    viewer_id: Optional[str],
+    db: AsyncSession,
+) -> Optional[str]:
+    """Campus a listing is scoped to: explicit, else the viewer's, else none.
+
+    A listing scoped by the viewer's token is theirs alone, so it is marked
+    private and never stored by a CDN.
+    """
+    if campus:
+        return user_service.campus_of(campus)
+    if all_campuses or not viewer_id:
+        return None
+    mark_private(request)
+    return await user_service.get_user_campus(viewer_id, db)
+
+
+@router.get("/feed", response_model=EventPage, response_model_by_alias=True)
+@cacheable(
+    max_age=30,
+    s_maxage=60,
+    stale_while_revalidate=60,
+    tags=("events", "meals"),
+    vary=("Authorization",),
+)
+async def list_events_feed_endpoint(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    include_past: bool = False,
+    near: Optional[str] = None,
+    radius: float = 2.0,
+    campus: Optional[str] = None,
+    all_campuses: bool = False,
+    viewer_id: Optional[str] = Depends(get_optional_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Cursor-paginated event feed; pass nextCursor back as cursor for the next page.
+
+    Signed-in users get their own campus by default (all_campuses=true for
+    everything); `campus` picks one explicitly. With near=lat,lng: upcoming
+    events within `radius` km, nearest first, on any campus."""
+    if near:
+        lat, lng = parse_near(near)
+        return await event_service.list_events_near(
+            db, lat, lng, check_radius(radius), limit=limit, cursor=cursor
+        )
+    return await event_service.list_events_page(
+        db,
+        limit=limit,
+        cursor=cursor,
+        include_past=include_past,
+        campus=await _feed_campus(request, campus, all_campuses, viewer_id, db),
+    )
+
+
+@router.get("/search", response_model=EventPage, response_model_by_alias=True)
+@cacheable(
+    max_age=30, s_maxage=60, stale_while_revalidate=60, tags=("events", "meals")
+)
+async def search_events_endpoint(
+    q: Annotated[str, Query(min_length=2, max_length=100)],
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Search upcoming events by title, description and location (typo-tolerant
+    on titles), best match first; pass nextCursor back as cursor"""
+    return await event_service.search_events(q, db, limit=limit, cursor=cursor)
+
+
 @router.get("/", response_model=List[Event], response_model_by_alias=True)
+@cacheable(
+    max_age=30,
+    s_maxage=60,
+    stale_while_revalidate=60,
+    tags=("events", "meals"),
+    vary=("Authorization",),
+)
 async def list_events_endpoint(
+    request: Request,
     user_id: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
     include_past: bool = False,
-    db: Session = Depends(get_db),
+    campus: Optional[str] = None,
+    all_campuses: bool = False,
+    viewer_id: Optional[str] = Depends(get_optional_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List events (upcoming only by default, paginated), optionally filtered by user_id"""
+    """List events (upcoming only by default, paginated), optionally filtered by
+    user_id; campus-scoped like /events/feed"""
     if user_id:
         return await event_service.get_user_events(user_id, db)
     return await event_service.list_events(
-        db, limit=limit, offset=offset, include_past=include_past
+        db,
+        limit=limit,
+        offset=offset,
+        include_past=include_past,
+        campus=await _feed_campus(request, campus, all_campuses, viewer_id, db),
     )
 
 
 @router.get("/{event_id}", response_model=Event, response_model_by_alias=True)
-async def get_event_details_endpoint(event_id: str, db: Session = Depends(get_db)):
+@cacheable(max_age=15, s_maxage=30, tags=("events", "meals"))
+async def get_event_details_endpoint(
+    event_id: str, db: AsyncSession = Depends(get_async_db)
+):
     """Get details of a specific event"""
     return await event_service.get_event_details(event_id, db)
 
 
+@router.get(
+    "/{event_id}/detail", response_model=EventDetail, response_model_by_alias=True
+)
+@cacheable(max_age=15, s_maxage=30, tags=("events", "meals", "reviews"))
+async def get_event_detail_endpoint(
+    event_id: str, db: AsyncSession = Depends(get_async_db)
+):
+    """Everything the event page needs (event, meal, host, rating, seats) in one call"""
+    return await event_service.get_event_detail(event_id, db)
+
+
 @router.get("/{event_id}/participants", response_model=List[EventParticipantUser])
 async def get_event_participants_endpoint(
     event_id: str,
@@ -5,7 +5,7 @@ import uuid
 
 from utils.database import get_db
 from services.gateways import stripe_service
-from services import user_service
+from services import user_service, webhook_ledger_service
 from schemas.stripe import WebhookResponse
 from models.event import EventModel
 from models.event_participant import EventParticipantModel
@@ -24,7 +24,11 @@ async def handle_account_updated(event: Dict[str, Any], db: Session) -> WebhookR
         return WebhookResponse(received=True, message="Account not found in system")
 
     await user_service.update_stripe_status(
-        user_model.id, account.get("details_submitted", False), db
+        user_model.id,
+        account.get("details_submitted", False),
+        db,
+        charges_enabled=account.get("charges_enabled", False),
+        payouts_enabled=account.get("payouts_enabled", False),
     )
 
     return WebhookResponse(
@@ -45,6 +49,10 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
         payload, signature, use_connect=True
     )
 
+    return await webhook_ledger_service.process_once(event, db, _dispatch)
+
+
+async def _dispatch(event: Dict[str, Any], db: Session) -> WebhookResponse:
     event_type = event["type"]
 
     if event_type == "account.updated":
@@ -7,9 +7,17 @@ import logging
 
 from utils.database import get_db
 from utils.calendar import build_event_ics
+from utils.http_cache import invalidate
 from services.gateways import stripe_service
 from services.gateways import email_service
-from services import user_service
+from services import user_service, webhook_ledger_service
+from services.seat_service import (
+    ACTIVE_STATUSES,
+    consume_hold,
+    release_hold,
+    release_seat,
+    reserve_seat,
+)
 from schemas.stripe import WebhookResponse
 from models.event import EventModel
 from models.event_participant import EventParticipantModel
@@ -19,21 +27,64 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhooks/stripe", tags=["stripe_webhook"])
 
-# Statuses that hold (or may hold) a seat. Capacity decisions always COUNT
-# these rows; EventModel.current_participants is a denormalized mirror kept
-# in sync here and in event_service, but is never the source of truth.
-ACTIVE_STATUSES = ("booked", "confirmed")
 
+def _enqueue_booking_emails(event_model: EventModel, foodie_id: str, db: Session):
+    """Queue the chef alert and the foodie's confirmation (.ics attached).
 
-def count_active_participants(event_id: str, db: Session) -> int:
-    return (
-        db.query(EventParticipantModel)
-        .filter(
-            EventParticipantModel.event_id == event_id,
-            EventParticipantModel.status.in_(ACTIVE_STATUSES),
-        )
-        .count()
-    )
+    Best-effort: a failure to build either email is logged and must never be
+    confused with a booking failure.
+    """
+    try:
+        chef_model = user_service.get_user_by_id(event_model.host_user_id, db)
+        if chef_model and chef_model.email:
+            email_service.enqueue(
+                db,
+                "chef_notification",
+                email_service.chef_notification_params(
+                    chef_email=chef_model.email, event_name=event_model.title
+                ),
+            )
+    except Exception as e:
+        logger.error("Chef notification email not queued (booking OK): %s", e)
+
+    # Sent regardless of whether they use the in-app "email me the invite" prompt.
+    try:
+        foodie = user_service.get_user_by_id(foodie_id, db)
+        if foodie and foodie.email:
+            meal = None
+            if event_model.meal_id:
+                meal = (
+                    db.query(MealModel)
+                    .filter(
+                        MealModel.id == event_model.meal_id,
+                        MealModel.is_deleted == False,
+                    )
+                    .first()
+                )
+            host = user_service.get_user_by_id(event_model.host_user_id, db)
+            ics = build_event_ics(
+                event_id=event_model.id,
+                title=event_model.title,
+                description=event_model.description,
+                location=event_model.location,
+                start=event_model.event_date,
+                host_name=host.name if host else None,
+                ingredients=meal.ingredients if meal else None,
+            )
+            when_str = event_model.event_date.strftime("%A, %B %d, %Y at %I:%M %p")
+            email_service.enqueue(
+                db,
+                "booking_confirmation",
+                email_service.booking_confirmation_params(
+                    to_email=foodie.email,
+                    event_title=event_model.title,
+                    event_when=when_str,
+                    event_location=event_model.location,
+                    ics_content=ics,
+                ),
+            )
+    except Exception as e:
+        logger.error("Foodie confirmation email not queued (booking OK): %s", e)
 
 
 async def handle_checkout_session_completed(
@@ -58,9 +109,6 @@ async def handle_checkout_session_completed(
             received=True, message="Missing required metadata, skipping"
         )
 
-    chef_email = None
-    event_title = None
-
     try:
         event_model = db.query(EventModel).filter(EventModel.id == event_id).first()
         if not event_model:
@@ -75,6 +123,8 @@ async def handle_checkout_session_completed(
                 EventParticipantModel.event_id == event_id,
                 EventParticipantModel.participant_id == foodie_id,
             )
+            # Locked so a concurrent redelivery waits, then sees it booked
+            .with_for_update()
             .first()
         )
 
@@ -85,10 +135,12 @@ async def handle_checkout_session_completed(
             )
             return WebhookResponse(received=True, message="Payment already processed")
 
-        # Re-check capacity at webhook time: two foodies can both pass the
-        # checkout-creation check and complete payment for the last seat.
-        active_count = count_active_participants(event_id, db)
-        if active_count >= event_model.max_participants:
+        # The seat was set aside when checkout opened. Without a hold (already
+        # swept, or the event was deleted) it has to be taken now, atomically.
+        if not consume_hold(event_id, foodie_id, db) and not reserve_seat(
+            event_id, db
+        ):
+            db.rollback()
             logger.warning(
                 "Event %s full at webhook time; cancelling payment %s for user %s",
                 event_id,
@@ -119,12 +171,9 @@ async def handle_checkout_session_completed(
                 )
             )
 
-        event_model.current_participants = active_count + 1
-
-        chef_model = user_service.get_user_by_id(event_model.host_user_id, db)
-        if chef_model:
-            chef_email = chef_model.email
-            event_title = event_model.title
+        # Queued in the booking's own transaction: committed together or not
+        # at all, and delivered by the outbox worker off the webhook's path.
+        _enqueue_booking_emails(event_model, foodie_id, db)
 
         try:
             db.commit()
@@ -138,6 +187,7 @@ async def handle_checkout_session_completed(
             )
             return WebhookResponse(received=True, message="Payment already processed")
 
+        invalidate("events")
         logger.info(
             "Created participation request for event %s, user %s", event_id, foodie_id
         )
@@ -157,52 +207,6 @@ async def handle_checkout_session_completed(
         # 500 so Stripe retries; do NOT return 200 here.
         raise HTTPException(status_code=500, detail="Webhook processing failed")
 
-    # Emails are best-effort and must never be confused with a booking failure:
-    # they run after the commit and swallow their own errors.
-    if chef_email and event_title:
-        try:
-            await email_service.send_chef_notification(
-                chef_email=chef_email, event_name=event_title
-            )
-        except Exception as e:
-            logger.error("Chef notification email failed (booking OK): %s", e)
-
-    # Foodie booking confirmation + calendar invite to their on-file email.
-    # Sent regardless of whether they use the in-app "email me the invite" prompt.
-    try:
-        foodie = user_service.get_user_by_id(foodie_id, db)
-        if foodie and foodie.email:
-            meal = None
-            if event_model.meal_id:
-                meal = (
-                    db.query(MealModel)
-                    .filter(
-                        MealModel.id == event_model.meal_id,
-                        MealModel.is_deleted == False,
-                    )
-                    .first()
-                )
-            host = user_service.get_user_by_id(event_model.host_user_id, db)
-            ics = build_event_ics(
-                event_id=event_model.id,
-                title=event_model.title,
-                description=event_model.description,
-                location=event_model.location,
-                start=event_model.event_date,
-                host_name=host.name if host else None,
-                ingredients=meal.ingredients if meal else None,
-            )
-            when_str = event_model.event_date.strftime("%A, %B %d, %Y at %I:%M %p")
-            await email_service.send_booking_confirmation(
-                to_email=foodie.email,
-                event_title=event_model.title,
-                event_when=when_str,
-                event_location=event_model.location,
-                ics_content=ics,
-            )
-    except Exception as e:
-        logger.error("Foodie confirmation email failed (booking OK): %s", e)
-
     return WebhookResponse(
         received=True, message=f"Created participation for event {event_id}"
     )
@@ -223,6 +227,8 @@ async def handle_payment_intent_canceled(
                 EventParticipantModel.payment_intent_id == payment_intent_id,
                 EventParticipantModel.status == "booked",
             )
+            # Locked so a concurrent redelivery can't release the seat twice
+            .with_for_update()
             .first()
         )
 
@@ -232,17 +238,9 @@ async def handle_payment_intent_canceled(
             )
 
         participation.status = "cancelled"
-        event_model = (
-            db.query(EventModel)
-            .filter(EventModel.id == participation.event_id)
-            .first()
-        )
-        if event_model:
-            active = count_active_participants(participation.event_id, db)
-            # participation row is still 'booked' in the DB until commit; the
-            # updated status is pending on this session, so recount defensively.
-            event_model.current_participants = max(active - 1, 0)
+        release_seat(participation.event_id, db)
         db.commit()
+        invalidate("events")
         logger.info(
             "Released seat for cancelled/expired payment %s (event %s, user %s)",
             payment_intent_id,
@@ -261,6 +259,46 @@ async def handle_payment_intent_canceled(
         raise HTTPException(status_code=500, detail="Webhook processing failed")
 
 
+async def handle_checkout_session_expired(
+    event: Dict[str, Any], db: Session
+) -> WebhookResponse:
+    """The foodie abandoned checkout: give their held seat back now rather
+    than waiting for the hold sweeper."""
+    session = event["data"]["object"]
+    metadata = session.get("metadata", {})
+    event_id = metadata.get("event_id")
+    foodie_id = metadata.get("foodie_id")
+
+    if not event_id or not foodie_id:
+        return WebhookResponse(received=True, message="No seat hold for this session")
+
+    try:
+        released = release_hold(
+            event_id, foodie_id, db, checkout_session_id=session.get("id")
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(
+            "Error releasing seat hold for session %s: %s",
+            session.get("id"),
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(status_code=500, detail="Webhook processing failed")
+
+    if not released:
+        return WebhookResponse(received=True, message="No seat hold for this session")
+    invalidate("events")
+    logger.info(
+        "Released held seat for expired checkout %s (event %s, user %s)",
+        session.get("id"),
+        event_id,
+        foodie_id,
+    )
+    return WebhookResponse(received=True, message="Seat hold released")
+
+
 @router.post("", response_model=WebhookResponse)
 async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     """Main webhook endpoint that routes events to appropriate handlers"""
@@ -274,13 +312,20 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     event = stripe_service.validate_webhook_signature(
         payload, signature, use_connect=False
     )
+    logger.info(f"Stripe webhook received: {event['type']} ({event['id']})")
 
+    return await webhook_ledger_service.process_once(event, db, _dispatch)
+
+
+async def _dispatch(event: Dict[str, Any], db: Session) -> WebhookResponse:
     event_type = event["type"]
-    logger.info(f"Stripe webhook received: {event_type}")
 
     if event_type == "checkout.session.completed":
         return await handle_checkout_session_completed(event, db)
 
+    if event_type == "checkout.session.expired":
+        return await handle_checkout_session_expired(event, db)
+
     if event_type == "payment_intent.canceled":
         return await handle_payment_intent_canceled(event, db)
 
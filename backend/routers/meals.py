@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, File, UploadFile, Form
+from fastapi import APIRouter, Depends, File, UploadFile, Form, Query
 from typing import List, Annotated, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from schemas.meal import Meal, MealUpdate
+from schemas.meal import Meal, MealPage, MealUpdate
 from utils.auth import get_current_user_id
-from utils.database import get_db
+from utils.database import get_async_db, get_db
+from utils.http_cache import cacheable
 from services import meal_service
 
 router = APIRouter(prefix="/meals", tags=["meals"])
@@ -40,6 +42,7 @@ async def create_meal_endpoint(
 
 
 @router.get("/", response_model=List[Meal], response_model_by_alias=True)
+@cacheable(max_age=60, s_maxage=120, stale_while_revalidate=60, tags=("meals",))
 async def list_meals_endpoint(
     user_id: Optional[str] = None, db: Session = Depends(get_db)
 ):
@@ -49,7 +52,21 @@ async def list_meals_endpoint(
     return await meal_service.list_all_meals(db)
 
 
+@router.get("/search", response_model=MealPage, response_model_by_alias=True)
+@cacheable(max_age=60, s_maxage=120, stale_while_revalidate=60, tags=("meals",))
+async def search_meals_endpoint(
+    q: Annotated[str, Query(min_length=2, max_length=100)],
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Search meals by title, description and ingredients (typo-tolerant on
+    titles), best match first; pass nextCursor back as cursor"""
+    return await meal_service.search_meals(q, db, limit=limit, cursor=cursor)
+
+
 @router.get("/{meal_id}", response_model=Meal, response_model_by_alias=True)
+@cacheable(max_age=60, s_maxage=120, tags=("meals",))
 async def get_meal_endpoint(meal_id: str, db: Session = Depends(get_db)):
     """Get details of a specific meal"""
     return await meal_service.get_meal(meal_id, db)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends
-from typing import Annotated, Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Annotated
 from sqlalchemy.orm import Session
 
 from schemas.user import InviteCodeResponse, TasteProfileResponse, TasteQuizSubmission
 from utils.auth import get_current_user_id
 from utils.database import get_db
+from utils.http_cache import CachePolicy, precomputed_response
 from services import referral_service, taste_quiz_service
 
 router = APIRouter(tags=["onboarding"])
@@ -31,10 +32,39 @@ async def get_my_invite_code_endpoint(
 # ---------------------------------------------------------------------------
 
 
+_QUIZ_POLICY = CachePolicy(max_age=3600, s_maxage=86400, tags=("taste-quiz",))
+_VERSIONED_QUIZ_POLICY = CachePolicy(
+    max_age=31536000, tags=("taste-quiz",), immutable=True
+)
+
+
 @router.get("/taste-quiz/questions")
-async def get_taste_quiz_questions_endpoint() -> List[Dict]:
-    """The onboarding quiz definition (8 image pairs)."""
-    return taste_quiz_service.get_quiz_questions()
+async def get_taste_quiz_questions_endpoint(request: Request):
+    """The onboarding quiz definition (8 image pairs).
+
+    X-Quiz-Version names the immutable URL for this exact payload."""
+    response = precomputed_response(
+        request,
+        taste_quiz_service.QUESTIONS_JSON,
+        taste_quiz_service.QUESTIONS_ETAG,
+        _QUIZ_POLICY,
+    )
+    response.headers["X-Quiz-Version"] = taste_quiz_service.QUESTIONS_VERSION
+    return response
+
+
+@router.get("/taste-quiz/questions/{version}")
+async def get_versioned_taste_quiz_questions_endpoint(version: str, request: Request):
+    """The quiz definition pinned to a content version; cacheable forever.
+    404 once a deploy changes the quiz - refetch the unversioned URL."""
+    if version != taste_quiz_service.QUESTIONS_VERSION:
+        raise HTTPException(status_code=404, detail="Unknown quiz version")
+    return precomputed_response(
+        request,
+        taste_quiz_service.QUESTIONS_JSON,
+        taste_quiz_service.QUESTIONS_ETAG,
+        _VERSIONED_QUIZ_POLICY,
+    )
 
 
 @router.post("/users/me/taste-quiz", response_model=TasteProfileResponse)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 from typing import List, Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from schemas.review import (
@@ -12,7 +13,8 @@ from schemas.review import (
     PendingReviews,
 )
 from utils.auth import get_current_user_id
-from utils.database import get_db
+from utils.database import get_async_db, get_db
+from utils.http_cache import cacheable
 from services import review_service
 
 router = APIRouter(tags=["reviews"])
@@ -71,7 +73,12 @@ async def get_event_reviews_endpoint(event_id: str, db: Session = Depends(get_db
     response_model=HostRatingSummary,
     response_model_by_alias=True,
 )
-async def get_host_rating_endpoint(user_id: str, db: Session = Depends(get_db)):
+@cacheable(
+    max_age=60, s_maxage=300, stale_while_revalidate=300, tags=("reviews",)
+)
+async def get_host_rating_endpoint(
+    user_id: str, db: AsyncSession = Depends(get_async_db)
+):
     """Aggregate chef/host score (out of 15) for a user's profile"""
     return await review_service.get_host_rating_summary(user_id, db)
 
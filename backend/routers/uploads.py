@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+from typing import Annotated
+from sqlalchemy.orm import Session
+
+from schemas.upload import (
+    SignedUpload,
+    SignedUploadCreate,
+    UploadedImage,
+    UploadFinalize,
+)
+from utils.auth import get_current_user_id
+from utils.database import get_db
+from services import upload_service
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post(
+    "/sign", response_model=SignedUpload, status_code=201, response_model_by_alias=True
+)
+async def create_signed_upload_endpoint(
+    request: SignedUploadCreate,
+    current_user_id: Annotated[str, Depends(get_current_user_id)],
+    db: Session = Depends(get_db),
+):
+    """Get a short-lived URL to upload an event, meal or profile image directly
+    to storage (the API never sees the bytes)"""
+    return await upload_service.create_signed_upload(request, current_user_id, db)
+
+
+@router.post("/finalize", response_model=UploadedImage, response_model_by_alias=True)
+async def finalize_upload_endpoint(
+    request: UploadFinalize,
+    current_user_id: Annotated[str, Depends(get_current_user_id)],
+    db: Session = Depends(get_db),
+):
+    """Validate a directly uploaded image and attach it to its event, meal or
+    profile"""
+    return await upload_service.finalize_upload(request, current_user_id, db)
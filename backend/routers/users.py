@@ -86,7 +86,11 @@ async def get_stripe_status(
     status = await stripe_service.get_stripe_account_status(user.stripe_account_id)
 
     await user_service.update_stripe_status(
-        current_user_id, status["onboarding_complete"], db
+        current_user_id,
+        status["onboarding_complete"],
+        db,
+        charges_enabled=status["charges_enabled"],
+        payouts_enabled=status["payouts_enabled"],
     )
 
     return StripeStatusResponse(
@@ -164,7 +168,7 @@ async def update_user_profile_endpoint(
 @router.get("/{user_id}", response_model=PublicUser)
 async def get_user_by_id_endpoint(user_id: str, db: Session = Depends(get_db)):
     """Get a user's PUBLIC profile (no email, Stripe, or referral data)"""
-    user = await user_service.get_user(user_id, db)
+    user = await user_service.get_public_user_card(user_id, db)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
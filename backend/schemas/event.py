@@ -1,7 +1,11 @@
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
+
+from schemas.meal import Meal
+from schemas.review import HostRatingSummary
+from schemas.user import PublicUser
 
 
 class EventBase(BaseModel):
@@ -53,9 +57,53 @@ class Event(EventBase):
     created_at: datetime
     image_url: Optional[str] = None
     meal_image_url: Optional[str] = None
+    # {"thumb" | "card" | "full": WebP URL}; None for images uploaded before
+    # variants existed
+    image_variants: Optional[Dict[str, str]] = None
+    meal_image_variants: Optional[Dict[str, str]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    # Only set by `near` feed queries: km from the requested point
+    distance_km: Optional[float] = None
 
     model_config = ConfigDict(
         from_attributes=True,
         alias_generator=to_camel,
         populate_by_name=True,
     )
+
+
+class EventPage(BaseModel):
+    """One page of the keyset-paginated event feed.
+
+    next_cursor is opaque; pass it back as `cursor` for the next page. None
+    means this was the last page.
+    """
+
+    events: List[Event]
+    next_cursor: Optional[str] = None
+    # The campus the page is scoped to; None for the all-campus feed
+    campus: Optional[str] = None
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
+
+
+class EventDetail(BaseModel):
+    """Everything the event page renders, from one SQL round-trip.
+
+    active_seats is the event's seat counter (see services/seat_service).
+    """
+
+    event: Event
+    meal: Optional[Meal] = None
+    host: PublicUser
+    host_rating: HostRatingSummary
+    active_seats: int
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
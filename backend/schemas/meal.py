@@ -1,7 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class MealBase(BaseModel):
@@ -30,6 +30,7 @@ class Meal(MealBase):
     id: str
     user_id: str
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
     created_at: datetime
 
     model_config = ConfigDict(
@@ -37,3 +38,15 @@ class Meal(MealBase):
         alias_generator=to_camel,
         populate_by_name=True,
     )
+
+
+class MealPage(BaseModel):
+    """One page of meal search results; pass next_cursor back as `cursor`."""
+
+    meals: List[Meal]
+    next_cursor: Optional[str] = None
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True,
+    )
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+from typing import Dict, Literal, Optional
+from datetime import datetime
+
+CamelConfig = ConfigDict(
+    from_attributes=True,
+    alias_generator=to_camel,
+    populate_by_name=True,
+)
+
+# What a direct upload will be attached to; "profile" is always the caller
+UploadTarget = Literal["event", "meal", "profile"]
+
+
+class SignedUploadCreate(BaseModel):
+    target: UploadTarget
+    target_id: Optional[str] = None  # event/meal id; ignored for "profile"
+    content_type: Literal["image/jpeg", "image/png", "image/webp"]
+
+    model_config = CamelConfig
+
+
+class SignedUpload(BaseModel):
+    """Where the client PUTs the raw image bytes, with `contentType` as the
+    Content-Type header, before calling /uploads/finalize with `uploadToken`."""
+
+    upload_url: str
+    upload_token: str
+    expires_at: datetime
+
+    model_config = CamelConfig
+
+
+class UploadFinalize(BaseModel):
+    upload_token: str
+
+    model_config = CamelConfig
+
+
+class UploadedImage(BaseModel):
+    target: UploadTarget
+    target_id: str
+    image_url: str
+    image_variants: Optional[Dict[str, str]] = None
+
+    model_config = CamelConfig
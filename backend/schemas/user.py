@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 # One config for every user schema: camelCase over the wire (matching the
@@ -53,6 +53,7 @@ class User(UserBase):
 
     id: str
     created_at: datetime
+    profile_picture_variants: Optional[Dict[str, str]] = None
     # Referral system
     invite_code: Optional[str] = None
     referred_by_user_id: Optional[str] = None
@@ -74,6 +75,7 @@ class PublicUser(BaseModel):
     university: Optional[str] = None
     description: Optional[str] = None
     profile_picture: Optional[str] = None
+    profile_picture_variants: Optional[Dict[str, str]] = None
     taste_archetype: Optional[str] = None
     taste_description: Optional[str] = None
     created_at: datetime
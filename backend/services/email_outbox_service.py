@@ -0,0 +1,157 @@
+"""Delivers queued emails from the email_outbox table through Resend.
+
+A batch is claimed in one short transaction (FOR UPDATE SKIP LOCKED, so
+several app workers can drain the same table): each row becomes 'sending'
+with a lease of EMAIL_OUTBOX_LEASE_SECONDS in next_attempt_at. The emails
+are then sent with no transaction open, and each outcome is committed on
+its own, so a slow Resend never holds row locks and one bad row never
+undoes the others.
+
+A worker that dies mid-batch leaves its rows 'sending'; they are claimed
+again once the lease runs out. Resend gets the row id as idempotency key,
+so such a re-send does not deliver the email twice.
+
+A failed send is retried with exponential backoff until
+EMAIL_OUTBOX_MAX_ATTEMPTS, after which the row is parked as 'failed' (with
+last_error) for a human to look at.
+"""
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+
+from models.email_outbox import EmailOutboxModel
+from services.gateways import email_service
+from utils.config import config
+from utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(
+        seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    )
+
+
+def _claim_due(db: Session, batch_size: int) -> List[Tuple[str, str, str, int]]:
+    """Lease a batch of due rows; returns (id, kind, params, attempt) each."""
+    now = datetime.now(timezone.utc)
+    lease_until = now + timedelta(seconds=config.EMAIL_OUTBOX_LEASE_SECONDS)
+    try:
+        rows = (
+            db.query(EmailOutboxModel)
+            .filter(
+                # A 'sending' row whose lease ran out belongs to a dead worker
+                EmailOutboxModel.status.in_(("pending", "sending")),
+                EmailOutboxModel.next_attempt_at <= now,
+            )
+            .order_by(EmailOutboxModel.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        claimed = []
+        for row in rows:
+            row.status = "sending"
+            row.attempts += 1
+            row.next_attempt_at = lease_until
+            claimed.append((row.id, row.kind, row.params, row.attempts))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return claimed
+
+
+def _record(db: Session, email_id: str, attempt: int, values: Dict[str, Any]) -> None:
+    # Only while our lease holds: a row re-claimed after it ran out is no
+    # longer ours to update
+    try:
+        db.execute(
+            update(EmailOutboxModel)
+            .where(
+                EmailOutboxModel.id == email_id,
+                EmailOutboxModel.status == "sending",
+                EmailOutboxModel.attempts == attempt,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Could not record outcome of email {email_id}: {e}")
+
+
+def deliver_due_emails(
+    db: Session,
+    batch_size: int = config.EMAIL_OUTBOX_BATCH_SIZE,
+    send: Optional[Callable[[Dict[str, Any], str], None]] = None,
+) -> int:
+    """Send one batch of due emails. Returns how many rows were attempted.
+
+    `send(params, idempotency_key)` defaults to email_service.send_now.
+    """
+    send = send or email_service.send_now
+    claimed = _claim_due(db, batch_size)
+
+    for email_id, kind, params, attempt in claimed:
+        try:
+            send(json.loads(params), email_id)
+        except Exception as e:
+            if attempt >= config.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                logger.error(
+                    f"Giving up on {kind} email {email_id} after {attempt} attempts: {e}"
+                )
+                values = {"status": "failed", "last_error": str(e)}
+            else:
+                logger.warning(
+                    f"{kind} email {email_id} failed (attempt {attempt}), retrying: {e}"
+                )
+                values = {
+                    "status": "pending",
+                    "last_error": str(e),
+                    "next_attempt_at": datetime.now(timezone.utc) + _backoff(attempt),
+                }
+        else:
+            values = {
+                "status": "sent",
+                "sent_at": datetime.now(timezone.utc),
+                "last_error": None,
+            }
+        _record(db, email_id, attempt, values)
+
+    return len(claimed)
+
+
+def _drain_once() -> int:
+    db = SessionLocal()
+    try:
+        return deliver_due_emails(db)
+    finally:
+        db.close()
+
+
+async def run_worker():
+    """Poll the outbox until cancelled (started from the app lifespan).
+
+    A full batch means more may be waiting, so the next batch is fetched
+    immediately; otherwise sleep for EMAIL_OUTBOX_POLL_SECONDS.
+    """
+    logger.info("Email outbox worker started")
+    while True:
+        try:
+            attempted = await asyncio.to_thread(_drain_once)
+        except Exception as e:
+            logger.error(f"Email outbox drain failed: {e}", exc_info=True)
+            attempted = 0
+        if attempted < config.EMAIL_OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(config.EMAIL_OUTBOX_POLL_SECONDS)
@@ -1,27 +1,49 @@
 from fastapi import HTTPException, UploadFile
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import desc
+from sqlalchemy import Float, and_, cast, desc, func, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import re
 import uuid
 from stripe import StripeError, InvalidRequestError
+import asyncio
 import logging
 
 from models.event import EventModel
 from models.event_participant import EventParticipantModel
 from models.meal import MealModel
+from models.seat_hold import SeatHoldModel
 from models.user import UserModel
-from schemas.event import Event, EventCreate, EventUpdate
+from models.user_rating_aggregate import UserRatingAggregateModel
+from schemas.event import Event, EventCreate, EventDetail, EventPage, EventUpdate
 from schemas.event_participant import EventParticipant, EventParticipantUser
 from schemas.refund import RefundResponse
-from utils.converters import event_model_to_schema, event_participant_models_to_schemas
-from utils.supabase import supabase
-from utils.uploads import upload_image
+from utils.converters import (
+    event_model_to_schema,
+    event_participant_models_to_schemas,
+    meal_model_to_schema,
+    public_user_model_to_schema,
+)
+from utils.pagination import (
+    decode_cursor,
+    decode_score_cursor,
+    encode_cursor,
+    encode_score_cursor,
+)
+from utils.geo import distance_km, within_radius
+from utils.search import after_cursor, match_and_rank
+from utils.uploads import stored_object_paths
 from utils.calendar import build_event_ics
-from .user_service import get_user
+from utils.config import config
+from utils.http_cache import invalidate
+from .user_service import campus_of, get_user, record_stripe_capabilities
 from .meal_service import get_meal_name
-from .gateways import email_service
+from .rating_aggregate_service import host_summary
+from .seat_service import ACTIVE_STATUSES, has_hold, release_seat
+from .image_service import upload_image
+from .gateways import email_service, storage_service
+from .gateways.geocoding_service import geocode
 from .gateways.stripe_service import (
     capture_payment_intent,
     cancel_payment_intent,
@@ -33,10 +55,6 @@ _EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 logger = logging.getLogger(__name__)
 
-# Statuses that hold (or may hold) a seat. Capacity checks COUNT these rows;
-# EventModel.current_participants is only a denormalized mirror.
-ACTIVE_STATUSES = ("booked", "confirmed")
-
 # Showcase/demo host(s): their events appear in the feed for inspiration but
 # can't be booked (no real Stripe payout). Booking returns a fun message.
 SHOWCASE_HOST_IDS = {"c936d774-91d7-4466-9dda-57445a0aba79"}  # Steve Trump
@@ -47,17 +65,6 @@ def _as_utc(dt: datetime) -> datetime:
     return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
 
 
-def count_active_participants(event_id: str, db: Session) -> int:
-    return (
-        db.query(EventParticipantModel)
-        .filter(
-            EventParticipantModel.event_id == event_id,
-            EventParticipantModel.status.in_(ACTIVE_STATUSES),
-        )
-        .count()
-    )
-
-
 def _events_with_meal_query(db: Session):
     """Base query joining events with meal titles in a single round-trip."""
     return db.query(EventModel, MealModel.title, MealModel.image_url).outerjoin(
@@ -66,6 +73,14 @@ def _events_with_meal_query(db: Session):
     )
 
 
+def _events_with_meal_select():
+    """select() twin of _events_with_meal_query for AsyncSession callers."""
+    return select(EventModel, MealModel.title, MealModel.image_url).outerjoin(
+        MealModel,
+        (MealModel.id == EventModel.meal_id) & (MealModel.is_deleted == False),
+    )
+
+
 def _rows_to_schemas(rows) -> List[Event]:
     return [
         event_model_to_schema(event_model, meal_title or "", meal_image)
@@ -73,28 +88,18 @@ def _rows_to_schemas(rows) -> List[Event]:
     ]
 
 
-def get_event(event_id: str, db: Session) -> Optional[Event]:
+async def get_event(event_id: str, db: AsyncSession) -> Optional[Event]:
     """Get event by ID from database"""
     try:
-        event_model = (
-            db.query(EventModel)
-            .filter(EventModel.id == event_id, EventModel.is_deleted == False)
-            .first()
-        )
-        if event_model:
-            meal = (
-                db.query(MealModel)
-                .filter(
-                    MealModel.id == event_model.meal_id,
-                    MealModel.is_deleted == False,
-                )
-                .first()
-            )
-            return event_model_to_schema(
-                event_model,
-                meal.title if meal else "",
-                meal.image_url if meal else None,
+        result = await db.execute(
+            _events_with_meal_select().where(
+                EventModel.id == event_id, EventModel.is_deleted == False
             )
+        )
+        row = result.first()
+        if row:
+            event_model, meal_title, meal_image = row
+            return event_model_to_schema(event_model, meal_title or "", meal_image)
         return None
     except Exception as e:
         logger.error(f"Error getting event {event_id}: {e}", exc_info=True)
@@ -122,6 +127,37 @@ def is_user_participating(event_id: str, user_id: str, db: Session) -> bool:
         return False
 
 
+async def _chef_charges_enabled(chef: UserModel, db: Session) -> bool:
+    """Whether the chef's Connect account can take charges.
+
+    Trusts the stored flag (kept current by the account.updated webhook) while
+    it is fresh and positive; otherwise reads through to Stripe and stores the
+    answer. A stored "not enabled" is always re-checked so a chef who just
+    finished onboarding isn't blocked by a lagging webhook.
+    """
+    synced_at = chef.stripe_status_synced_at
+    if (
+        chef.stripe_charges_enabled
+        and synced_at is not None
+        and datetime.now(timezone.utc) - _as_utc(synced_at)
+        < timedelta(seconds=config.STRIPE_ACCOUNT_STATUS_TTL_SECONDS)
+    ):
+        return True
+
+    account_status = await retrieve_connected_account(chef.stripe_account_id)
+    charges_enabled = bool(account_status.get("charges_enabled", False))
+    try:
+        record_stripe_capabilities(
+            chef, charges_enabled, account_status.get("payouts_enabled", False)
+        )
+        db.commit()
+    except Exception as e:
+        # Caching is an optimization; never fail a checkout over it
+        db.rollback()
+        logger.warning(f"Could not cache Stripe status for chef {chef.id}: {e}")
+    return charges_enabled
+
+
 async def upload_event_image(image: UploadFile) -> str:
     """Upload an event image (magic-byte validated) and return the public URL"""
     return await upload_image(image, "event-images")
@@ -153,6 +189,8 @@ async def create_event(
         if isinstance(event_date, str):
             event_date = datetime.fromisoformat(event.event_date.replace("Z", "+00:00"))
 
+        latitude, longitude = await geocode(event.location) or (None, None)
+
         # Create new event model
         event_model = EventModel(
             id=str(uuid.uuid4()),
@@ -163,6 +201,9 @@ async def create_event(
             max_participants=event.max_participants,
             current_participants=0,
             location=event.location,
+            campus=campus_of(host.university),
+            latitude=latitude,
+            longitude=longitude,
             event_date=event_date,
             image_url=image_url,
             price=event.price,
@@ -173,11 +214,12 @@ async def create_event(
         db.add(event_model)
         db.commit()
         db.refresh(event_model)
+        invalidate("events")
 
         logger.info(
             f"Event created successfully: {event_model.id} by host {host_user_id}"
         )
-        meal_name = get_meal_name(event_model.meal_id, db)
+        meal_name = await get_meal_name(event_model.meal_id, db)
         return event_model_to_schema(event_model, meal_name)
     except HTTPException:
         raise
@@ -231,11 +273,13 @@ async def validate_checkout_requirements(
         logger.warning(f"User {foodie_id} attempted to join event {event_id} again")
         raise HTTPException(status_code=400, detail="Already joined this event")
 
-    active_count = count_active_participants(event_id, db)
-
-    if active_count >= event.max_participants:
+    # Fast fail only; the seat itself is taken atomically by hold_seat. A
+    # foodie reopening checkout already has their seat in the count.
+    if event.current_participants >= event.max_participants and not has_hold(
+        event_id, foodie_id, db
+    ):
         logger.warning(
-            f"Event {event_id} is full ({active_count}/{event.max_participants})"
+            f"Event {event_id} is full ({event.current_participants}/{event.max_participants})"
         )
         raise HTTPException(status_code=400, detail="Event is full")
 
@@ -249,9 +293,7 @@ async def validate_checkout_requirements(
         logger.warning(f"Chef {chef.id} has no Stripe account configured")
         raise HTTPException(status_code=400, detail="Chef payment not configured")
 
-    account_status = await retrieve_connected_account(chef.stripe_account_id)
-
-    if not account_status.get("charges_enabled", False):
+    if not await _chef_charges_enabled(chef, db):
         logger.warning(f"Chef {chef.id} Stripe account not ready for charges")
         raise HTTPException(status_code=400, detail="Chef payment account not ready")
 
@@ -259,36 +301,224 @@ async def validate_checkout_requirements(
     return event, chef
 
 
+def _feed_select(include_past: bool, campus: Optional[str] = None):
+    """Live events (upcoming only unless include_past) with meal titles,
+    optionally limited to one campus (served by ix_events_campus_feed)."""
+    stmt = _events_with_meal_select().where(EventModel.is_deleted == False)
+    if not include_past:
+        stmt = stmt.where(EventModel.event_date >= datetime.now(timezone.utc))
+    if campus:
+        stmt = stmt.where(EventModel.campus == campus)
+    return stmt
+
+
 async def list_events(
-    db: Session,
+    db: AsyncSession,
     limit: int = 50,
     offset: int = 0,
     include_past: bool = False,
+    campus: Optional[str] = None,
 ) -> List[Event]:
     """List available events (excluding deleted; upcoming only by default)"""
     try:
-        query = _events_with_meal_query(db).filter(EventModel.is_deleted == False)
-        if not include_past:
-            query = query.filter(EventModel.event_date >= datetime.now(timezone.utc))
-        rows = (
-            query.order_by(EventModel.event_date.asc())
+        result = await db.execute(
+            _feed_select(include_past, campus)
+            .order_by(EventModel.event_date.asc())
             .offset(offset)
             .limit(min(limit, 100))
-            .all()
         )
-        return _rows_to_schemas(rows)
+        return _rows_to_schemas(result.all())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error fetching events: {str(e)}")
+
+
+async def list_events_page(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_past: bool = False,
+    campus: Optional[str] = None,
+) -> EventPage:
+    """Keyset-paginated feed ordered by (event_date, id).
+
+    Seeks past the cursor instead of OFFSET-scanning, so deep pages cost the
+    same as the first (backed by ix_events_feed_keyset, or
+    ix_events_campus_feed when scoped to a campus).
+    """
+    limit = max(1, min(limit, 100))
+    stmt = _feed_select(include_past, campus)
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        # Bind with the column types: tuple_ doesn't infer them, and the UUID
+        # type stores a different representation than a plain string bind
+        stmt = stmt.where(
+            tuple_(EventModel.event_date, EventModel.id)
+            > tuple_(
+                literal(after_date, EventModel.event_date.type),
+                literal(after_id, EventModel.id.type),
+            )
+        )
+    try:
+        result = await db.execute(
+            stmt.order_by(EventModel.event_date.asc(), EventModel.id.asc()).limit(
+                limit + 1
+            )
+        )
+        rows = result.all()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error fetching events: {str(e)}")
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_event = rows[-1][0]
+        next_cursor = encode_cursor(last_event.event_date, last_event.id)
+    return EventPage(
+        events=_rows_to_schemas(rows), next_cursor=next_cursor, campus=campus
+    )
+
+
+async def list_events_near(
+    db: AsyncSession,
+    lat: float,
+    lng: float,
+    radius_km: float,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> EventPage:
+    """Upcoming events within `radius_km` of (lat, lng), nearest first.
+
+    Keyset-paginated on (distance, id); each event carries distance_km.
+    Events without coordinates never match.
+    """
+    limit = max(1, min(limit, 100))
+    where, distance_sq = within_radius(
+        db.get_bind().dialect.name,
+        lat,
+        lng,
+        radius_km,
+        EventModel.latitude,
+        EventModel.longitude,
+    )
+    distance_sq = cast(distance_sq, Float)
+    stmt = _feed_select(include_past=False).add_columns(distance_sq).where(where)
+    if cursor:
+        after_distance, after_id = decode_score_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                distance_sq > after_distance,
+                and_(
+                    distance_sq == after_distance,
+                    EventModel.id > literal(after_id, EventModel.id.type),
+                ),
+            )
+        )
+    try:
+        result = await db.execute(
+            stmt.order_by(distance_sq.asc(), EventModel.id.asc()).limit(limit + 1)
+        )
+        rows = result.all()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error fetching events: {str(e)}")
 
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_event, *_, last_distance_sq = rows[-1]
+        next_cursor = encode_score_cursor(last_distance_sq, last_event.id)
+
+    events = _rows_to_schemas(row[:3] for row in rows)
+    for event, row in zip(events, rows):
+        event.distance_km = distance_km(row[3])
+    return EventPage(events=events, next_cursor=next_cursor)
+
+
+async def search_events(
+    query: str,
+    db: AsyncSession,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> EventPage:
+    """Upcoming events matching `query`, best match first (see utils/search.py).
+
+    Keyset-paginated on (rank, id) like the feed, so deep pages stay cheap.
+    """
+    limit = max(1, min(limit, 50))
+    where, rank = match_and_rank(
+        db.get_bind().dialect.name,
+        query,
+        "events",
+        (EventModel.title, EventModel.description, EventModel.location),
+        EventModel.title,
+    )
+    stmt = _feed_select(include_past=False).add_columns(rank).where(where)
+    if cursor:
+        stmt = stmt.where(
+            after_cursor(
+                rank, EventModel.id, decode_score_cursor(cursor), EventModel.id.type
+            )
+        )
+    try:
+        result = await db.execute(
+            stmt.order_by(rank.desc(), EventModel.id.asc()).limit(limit + 1)
+        )
+        rows = result.all()
+    except Exception as e:
+        logger.error(f"Error searching events for {query!r}: {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Error searching events: {str(e)}")
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_event, *_, last_rank = rows[-1]
+        next_cursor = encode_score_cursor(last_rank, last_event.id)
+    return EventPage(
+        events=_rows_to_schemas(row[:3] for row in rows), next_cursor=next_cursor
+    )
+
 
-async def get_event_details(event_id: str, db: Session) -> Event:
+async def get_event_details(event_id: str, db: AsyncSession) -> Event:
     """Get details of a specific event"""
-    event = get_event(event_id, db)
+    event = await get_event(event_id, db)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 
+async def get_event_detail(event_id: str, db: AsyncSession) -> EventDetail:
+    """Event page payload (event, meal, host card, host rating, seat count)
+    in one query instead of the five calls the page used to make."""
+    stmt = (
+        select(EventModel, MealModel, UserModel, UserRatingAggregateModel)
+        .join(UserModel, UserModel.id == EventModel.host_user_id)
+        .outerjoin(
+            MealModel,
+            (MealModel.id == EventModel.meal_id) & (MealModel.is_deleted == False),
+        )
+        .outerjoin(
+            UserRatingAggregateModel,
+            UserRatingAggregateModel.user_id == EventModel.host_user_id,
+        )
+        .where(EventModel.id == event_id, EventModel.is_deleted == False)
+    )
+    row = (await db.execute(stmt)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    event_model, meal_model, host_model, aggregate = row
+    return EventDetail(
+        event=event_model_to_schema(
+            event_model,
+            meal_model.title if meal_model else "",
+            meal_model.image_url if meal_model else None,
+        ),
+        meal=meal_model_to_schema(meal_model) if meal_model else None,
+        host=public_user_model_to_schema(host_model),
+        host_rating=host_summary(host_model.id, aggregate),
+        active_seats=event_model.current_participants,
+    )
+
+
 async def get_event_participants(
     event_id: str, db: Session
 ) -> List[EventParticipantUser]:
@@ -318,16 +548,15 @@ async def get_event_participants(
         )
 
 
-async def get_user_events(user_id: str, db: Session) -> List[Event]:
+async def get_user_events(user_id: str, db: AsyncSession) -> List[Event]:
     """Get all events created by a specific user (excluding deleted ones)"""
     try:
-        rows = (
-            _events_with_meal_query(db)
-            .filter(EventModel.host_user_id == user_id, EventModel.is_deleted == False)
+        result = await db.execute(
+            _events_with_meal_select()
+            .where(EventModel.host_user_id == user_id, EventModel.is_deleted == False)
             .order_by(desc(EventModel.event_date))
-            .all()
         )
-        return _rows_to_schemas(rows)
+        return _rows_to_schemas(result.all())
     except Exception as e:
         raise HTTPException(
             status_code=400, detail=f"Error fetching user events: {str(e)}"
@@ -398,8 +627,18 @@ async def update_event(
                 )
             event_model.max_participants = event_update.max_participants
 
-        if event_update.location is not None:
+        location_changed = (
+            event_update.location is not None
+            and event_update.location != event_model.location
+        )
+        if location_changed:
             event_model.location = event_update.location
+        # Also retry events that were never placed (created before
+        # coordinates existed, or the geocoder was down at the time)
+        if location_changed or event_model.latitude is None:
+            event_model.latitude, event_model.longitude = await geocode(
+                event_model.location
+            ) or (None, None)
 
         if event_update.event_date is not None:
             # Convert string to datetime
@@ -413,9 +652,10 @@ async def update_event(
 
         db.commit()
         db.refresh(event_model)
+        invalidate("events")
 
         logger.info(f"Event {event_id} updated successfully by user {user_id}")
-        meal_name = get_meal_name(event_model.meal_id, db)
+        meal_name = await get_meal_name(event_model.meal_id, db)
         return event_model_to_schema(event_model, meal_name)
     except HTTPException:
         raise
@@ -425,7 +665,87 @@ async def update_event(
         raise HTTPException(status_code=400, detail=f"Error updating event: {str(e)}")
 
 
-async def soft_delete_event(event_id: str, user_id: str, db: Session) -> Dict[str, str]:
+async def set_event_image(
+    event_id: str, image_url: str, user_id: str, db: Session
+) -> Event:
+    """Attach an already-stored image to an event (only the host can)"""
+    event_model = (
+        db.query(EventModel)
+        .filter(EventModel.id == event_id, EventModel.is_deleted == False)
+        .first()
+    )
+    if not event_model:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event_model.host_user_id != user_id:
+        logger.warning(
+            f"User {user_id} attempted to set the image of event {event_id} without permission"
+        )
+        raise HTTPException(
+            status_code=403, detail="Only the event host can update the event"
+        )
+
+    old_image_url = event_model.image_url
+    try:
+        event_model.image_url = image_url
+        db.commit()
+        db.refresh(event_model)
+        invalidate("events")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error setting image of event {event_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Error updating event: {str(e)}")
+
+    if old_image_url and old_image_url != image_url:
+        try:
+            await storage_service.remove(
+                "event-images", stored_object_paths(old_image_url, "event-images")
+            )
+        except Exception as e:
+            logger.warning(f"Failed to delete old image of event {event_id}: {e}")
+
+    logger.info(f"Event {event_id} image updated by user {user_id}")
+    meal_name = await get_meal_name(event_model.meal_id, db)
+    return event_model_to_schema(event_model, meal_name)
+
+
+async def _release_host_cancelled_payment(
+    event_id: str, participation: EventParticipantModel, semaphore: asyncio.Semaphore
+) -> str:
+    """Void or refund one seat of a host-cancelled event.
+
+    Returns the outcome: 'voided', 'refunded', 'already_released',
+    'no_payment' or 'failed'. The idempotency key is stable per participation,
+    so a retried cancellation can never refund the same seat twice.
+    """
+    payment_intent_id = participation.payment_intent_id
+    if not payment_intent_id:
+        return "no_payment"
+    idempotency_key = f"event-cancel-{participation.id}-{participation.status}"
+    async with semaphore:
+        try:
+            if participation.status == "booked":
+                await cancel_payment_intent(
+                    payment_intent_id, idempotency_key=idempotency_key
+                )
+                return "voided"
+            # confirmed: full refund
+            await create_refund(payment_intent_id, idempotency_key=idempotency_key)
+            return "refunded"
+        except InvalidRequestError as e:
+            # Already cancelled/refunded/expired on Stripe's side
+            logger.warning(
+                f"Payment {payment_intent_id} not refundable during event cancel: {e}"
+            )
+            return "already_released"
+        except StripeError as e:
+            logger.error(
+                f"REFUND FAILED during event {event_id} cancellation: "
+                f"participant {participation.participant_id}, payment_intent {payment_intent_id}: {e}"
+            )
+            return "failed"
+
+
+async def soft_delete_event(event_id: str, user_id: str, db: Session) -> Dict[str, Any]:
     """Soft delete an event (only the host can delete)"""
     # Get the event (including deleted ones for this operation)
     event_model = db.query(EventModel).filter(EventModel.id == event_id).first()
@@ -459,34 +779,29 @@ async def soft_delete_event(event_id: str, user_id: str, db: Session) -> Dict[st
         .all()
     )
 
+    # Fan the Stripe calls out (bounded) instead of one round-trip per seat
+    # in series. Only the coroutines touch Stripe; ORM rows are updated here
+    # afterwards, so the session is never used concurrently.
+    semaphore = asyncio.Semaphore(config.STRIPE_REFUND_CONCURRENCY)
+    outcomes = await asyncio.gather(
+        *(_release_host_cancelled_payment(event_id, p, semaphore) for p in participations)
+    )
+
     refund_failures = []
-    for p in participations:
-        if not p.payment_intent_id:
-            p.status = "cancelled"
+    results = []
+    for p, outcome in zip(participations, outcomes):
+        results.append({"participant_id": p.participant_id, "outcome": outcome})
+        if outcome == "failed":
+            refund_failures.append(p.participant_id)
             continue
-        try:
-            if p.status == "booked":
-                await cancel_payment_intent(p.payment_intent_id)
-            else:  # confirmed
-                await create_refund(p.payment_intent_id)  # full refund
-            p.status = "cancelled"
-            p.refunded_at = datetime.now(timezone.utc)
-        except InvalidRequestError as e:
-            # Already cancelled/refunded/expired on Stripe's side
-            logger.warning(
-                f"Payment {p.payment_intent_id} not refundable during event cancel: {e}"
-            )
-            p.status = "cancelled"
+        p.status = "cancelled"
+        if outcome != "no_payment":
             p.refunded_at = datetime.now(timezone.utc)
-        except StripeError as e:
-            logger.error(
-                f"REFUND FAILED during event {event_id} cancellation: "
-                f"participant {p.participant_id}, payment_intent {p.payment_intent_id}: {e}"
-            )
-            refund_failures.append(p.participant_id)
 
     if refund_failures:
-        # Commit the refunds that DID succeed, keep the event alive, surface the error
+        # Commit the refunds that DID succeed, keep the event alive, surface the error.
+        # Retrying is safe: succeeded rows are no longer active, and failed ones
+        # reuse their idempotency key.
         db.commit()
         raise HTTPException(
             status_code=500,
@@ -496,12 +811,19 @@ async def soft_delete_event(event_id: str, user_id: str, db: Session) -> Dict[st
     try:
         event_model.is_deleted = True
         event_model.current_participants = 0
+        # Open checkouts can't book a deleted event; their seats go with it
+        db.query(SeatHoldModel).filter(SeatHoldModel.event_id == event_id).delete()
         db.commit()
+        invalidate("events")
         logger.info(
             f"Event {event_id} cancelled by host {user_id}; "
             f"{len(participations)} participation(s) refunded/voided"
         )
-        return {"message": "Event successfully deleted", "event_id": event_id}
+        return {
+            "message": "Event successfully deleted",
+            "event_id": event_id,
+            "refunds": results,
+        }
     except Exception as e:
         db.rollback()
         logger.error(f"Error deleting event {event_id}: {e}", exc_info=True)
@@ -538,6 +860,8 @@ async def refund_event_participation(
                 EventParticipantModel.participant_id == user_id,
                 EventParticipantModel.status.in_(ACTIVE_STATUSES),
             )
+            # Locked so a double-submitted cancel can't release the seat twice
+            .with_for_update()
             .first()
         )
 
@@ -578,10 +902,9 @@ async def refund_event_participation(
         try:
             participation.status = "cancelled"
             participation.refunded_at = datetime.now(timezone.utc)
-            event_model.current_participants = max(
-                count_active_participants(event_id, db) - 1, 0
-            )
+            release_seat(event_id, db)
             db.commit()
+            invalidate("events")
         except Exception as e:
             db.rollback()
             logger.error(
@@ -774,3 +1097,53 @@ async def send_event_calendar_invite(
 
     logger.info(f"Calendar invite sent for event {event_id} to {to_email}")
     return {"message": "Calendar invite sent"}
+
+
+async def backfill_event_coordinates(db: Session, pause_seconds: float = 0) -> int:
+    """Geocode every live event that has a location but no coordinates (e.g.
+    created before the coordinates columns). Returns how many were placed.
+
+    One event at a time, committing each, so an interrupted run keeps its
+    progress; `pause_seconds` between geocoder calls respects rate limits.
+    """
+    event_ids = [
+        event_id
+        for (event_id,) in db.query(EventModel.id).filter(
+            EventModel.is_deleted == False,
+            EventModel.latitude.is_(None),
+            EventModel.location != "",
+        )
+    ]
+    placed = 0
+    for event_id in event_ids:
+        event_model = db.get(EventModel, event_id)
+        coords = await geocode(event_model.location)
+        if coords:
+            event_model.latitude, event_model.longitude = coords
+            db.commit()
+            placed += 1
+        else:
+            logger.warning(
+                f"Could not place event {event_id}: {event_model.location!r}"
+            )
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
+
+    if placed:
+        invalidate("events")
+    logger.info(f"Backfilled coordinates for {placed}/{len(event_ids)} event(s)")
+    return placed
+
+
+if __name__ == "__main__":
+    import models  # noqa: F401 - registers every table so FKs resolve
+    from utils.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        # Nominatim's usage policy allows at most one request per second
+        pause = 1.0 if config.GEOCODER == "nominatim" else 0
+        asyncio.run(backfill_event_coordinates(session, pause_seconds=pause))
+    finally:
+        session.close()
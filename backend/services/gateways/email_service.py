@@ -1,32 +1,63 @@
+"""Resend email gateway.
+
+Each message has a *_params builder returning the Resend payload. Callers
+either send immediately (send_* - used where the user is waiting on the
+result, e.g. the calendar-invite button) or, from webhooks and other paths
+that must not wait on Resend, enqueue() the payload into the email outbox in
+their own transaction; services/email_outbox_service.py delivers it.
+"""
+
+import asyncio
 import base64
+import json
+from typing import Any, Dict, Optional
+
 import resend
+from sqlalchemy.orm import Session
+
+from models.email_outbox import EmailOutboxModel
 from utils.config import config
 
 resend.api_key = config.RESEND_API_KEY
 
 
-async def send_chef_notification(chef_email: str, event_name: str):
-    resend.Emails.send(
-        {
-            "from": "updates@dormmade.com",
-            "to": chef_email,
-            "template": {
-                "id": "chef_alert",
-                "variables": {
-                    "event_name": event_name,
-                },
+def send_now(params: Dict[str, Any], idempotency_key: Optional[str] = None) -> None:
+    """Blocking Resend call; run it off the event loop.
+
+    Resend drops a repeat of a request with the same idempotency_key (within
+    24h) instead of sending the email again.
+    """
+    if idempotency_key:
+        resend.Emails.send(params, {"idempotency_key": idempotency_key})
+    else:
+        resend.Emails.send(params)
+
+
+def enqueue(db: Session, kind: str, params: Dict[str, Any]) -> None:
+    """Queue an email for background delivery (caller commits)."""
+    db.add(EmailOutboxModel(kind=kind, params=json.dumps(params)))
+
+
+def chef_notification_params(chef_email: str, event_name: str) -> Dict[str, Any]:
+    return {
+        "from": "updates@dormmade.com",
+        "to": chef_email,
+        "template": {
+            "id": "chef_alert",
+            "variables": {
+                "event_name": event_name,
             },
-        }
-    )
+        },
+    }
 
 
-async def send_calendar_invite(
+def calendar_invite_params(
     to_email: str,
     event_title: str,
     event_when: str,
     event_location: str,
     ics_content: str,
-):
+) -> Dict[str, Any]:
     """Email the foodie a calendar invite (.ics attached) for a booked event.
 
     Works with Apple Calendar, Google Calendar and Outlook. The .ics content
@@ -48,33 +79,46 @@ async def send_calendar_invite(
       </div>
     """
 
-    resend.Emails.send(
-        {
-            "from": "updates@dormmade.com",
-            "to": to_email,
-            "subject": f"Your seat is booked: {event_title}",
-            "html": html,
-            "attachments": [
-                {
-                    "filename": "dormmade-event.ics",
-                    "content": ics_b64,
-                    "content_type": "text/calendar",
-                }
-            ],
-        }
-    )
+    return {
+        "from": "updates@dormmade.com",
+        "to": to_email,
+        "subject": f"Your seat is booked: {event_title}",
+        "html": html,
+        "attachments": [
+            {
+                "filename": "dormmade-event.ics",
+                "content": ics_b64,
+                "content_type": "text/calendar",
+            }
+        ],
+    }
 
 
-async def send_booking_confirmation(
+async def send_calendar_invite(
     to_email: str,
     event_title: str,
     event_when: str,
     event_location: str,
     ics_content: str,
 ):
+    await asyncio.to_thread(
+        send_now,
+        calendar_invite_params(
+            to_email, event_title, event_when, event_location, ics_content
+        ),
+    )
+
+
+def booking_confirmation_params(
+    to_email: str,
+    event_title: str,
+    event_when: str,
+    event_location: str,
+    ics_content: str,
+) -> Dict[str, Any]:
     """Auto-sent to the foodie's on-file email the moment a booking is made.
 
-    Fires from the Stripe webhook so every booking gets a confirmation - even
+    Queued from the Stripe webhook so every booking gets a confirmation - even
     if the foodie skips the in-app 'send me a calendar invite' prompt. The
     .ics is attached so they can add it to their calendar straight away.
     """
@@ -96,18 +140,16 @@ async def send_booking_confirmation(
       </div>
     """
 
-    resend.Emails.send(
-        {
-            "from": "updates@dormmade.com",
-            "to": to_email,
-            "subject": f"Booking request received: {event_title}",
-            "html": html,
-            "attachments": [
-                {
-                    "filename": "dormmade-event.ics",
-                    "content": ics_b64,
-                    "content_type": "text/calendar",
-                }
-            ],
-        }
-    )
+    return {
+        "from": "updates@dormmade.com",
+        "to": to_email,
+        "subject": f"Booking request received: {event_title}",
+        "html": html,
+        "attachments": [
+            {
+                "filename": "dormmade-event.ics",
+                "content": ics_b64,
+                "content_type": "text/calendar",
+            }
+        ],
+    }
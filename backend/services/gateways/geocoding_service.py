@@ -0,0 +1,105 @@
+"""Geocoding gateway: free-text event location -> (latitude, longitude).
+
+Backends (GEOCODER):
+- stub (default): no network. Understands "lat,lng" literals and the places
+  in GEOCODER_STUB_PLACES, matched case-insensitively as substrings of the
+  location - enough for local dev, tests and pinning campus buildings.
+- nominatim: any Nominatim-compatible /search endpoint at GEOCODER_URL.
+
+geocode() never raises: an event the geocoder can't place is stored without
+coordinates and simply doesn't show up in `near` feed queries. Results are
+cached for a day ("no such place" too; errors are not).
+"""
+
+from typing import Dict, Optional, Tuple
+import json
+import logging
+import re
+
+import httpx
+
+from utils.cache import cache
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+GEOCODE_CACHE_TTL_SECONDS = 24 * 3600
+_LAT_LNG = re.compile(r"^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+
+
+def _valid(lat: float, lng: float) -> bool:
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+class StubGeocoder:
+    def __init__(self, places: Dict[str, Coordinates]):
+        # Longest names first, so "Dorm 4B Annex" beats "Dorm 4B"
+        self.places = sorted(
+            ((name.lower(), tuple(coords)) for name, coords in places.items()),
+            key=lambda place: -len(place[0]),
+        )
+
+    async def geocode(self, address: str) -> Optional[Coordinates]:
+        match = _LAT_LNG.match(address)
+        if match:
+            lat, lng = float(match.group(1)), float(match.group(2))
+            return (lat, lng) if _valid(lat, lng) else None
+        lowered = address.lower()
+        for name, coords in self.places:
+            if name in lowered:
+                return coords
+        return None
+
+
+class NominatimGeocoder:
+    def __init__(self, base_url: str, timeout: float):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            # Nominatim's usage policy requires an identifying User-Agent
+            headers={"User-Agent": "DormMade/1.0 (event geocoding)"},
+        )
+
+    async def geocode(self, address: str) -> Optional[Coordinates]:
+        response = await self._client.get(
+            "/search", params={"q": address, "format": "jsonv2", "limit": 1}
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        lat, lng = float(results[0]["lat"]), float(results[0]["lon"])
+        return (lat, lng) if _valid(lat, lng) else None
+
+
+def _make_geocoder():
+    if config.GEOCODER == "nominatim":
+        return NominatimGeocoder(config.GEOCODER_URL, config.GEOCODER_TIMEOUT_SECONDS)
+    if config.GEOCODER != "stub":
+        raise ValueError(f"Unknown GEOCODER: {config.GEOCODER}")
+    return StubGeocoder(json.loads(config.GEOCODER_STUB_PLACES))
+
+
+geocoder = _make_geocoder()
+
+
+async def geocode(address: Optional[str]) -> Optional[Coordinates]:
+    """Coordinates for `address`, or None if it can't be placed."""
+    address = (address or "").strip()
+    if not address:
+        return None
+
+    try:
+        # A failure raises through the cache, so only answers get cached
+        coords = await cache.aget_or_set(
+            "geocode",
+            address.lower(),
+            lambda: geocoder.geocode(address),
+            ttl=GEOCODE_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.warning(f"Geocoding {address!r} failed: {e}")
+        return None
+    return (coords[0], coords[1]) if coords else None
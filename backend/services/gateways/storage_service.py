@@ -0,0 +1,207 @@
+"""Async Supabase Storage gateway.
+
+Talks to the Storage REST API over one pooled httpx.AsyncClient per worker,
+so uploads and deletes never block the event loop (the supabase-py client in
+utils/supabase.py is synchronous). Transient failures - connection errors,
+timeouts, 429 and 5xx - are retried with exponential backoff.
+
+Clients can also upload straight to a bucket through a signed upload URL
+(create_signed_upload_url); the API then only reads the object back once to
+validate it (open_object).
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Union
+import asyncio
+import logging
+import os
+
+import httpx
+
+from utils.config import config
+from utils.supabase import SUPABASE_KEY, SUPABASE_URL
+
+logger = logging.getLogger(__name__)
+
+STORAGE_URL = f"{SUPABASE_URL.rstrip('/')}/storage/v1"
+STREAM_CHUNK_SIZE = 64 * 1024
+# Fixed by Supabase: how long a signed upload URL accepts a PUT
+SIGNED_UPLOAD_URL_LIFETIME_SECONDS = 2 * 60 * 60
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_client = httpx.AsyncClient(
+    base_url=STORAGE_URL,
+    headers={"Authorization": f"Bearer {SUPABASE_KEY}", "apikey": SUPABASE_KEY},
+    timeout=httpx.Timeout(
+        config.STORAGE_HTTP_TIMEOUT_SECONDS,
+        connect=min(config.STORAGE_HTTP_TIMEOUT_SECONDS, 5.0),
+    ),
+    limits=httpx.Limits(
+        max_connections=config.STORAGE_MAX_CONNECTIONS,
+        max_keepalive_connections=config.STORAGE_MAX_CONNECTIONS,
+        keepalive_expiry=60,
+    ),
+)
+
+
+class StorageError(Exception):
+    pass
+
+
+class ObjectNotFound(StorageError):
+    pass
+
+
+async def close_http_client():
+    """Close the pooled storage connections (app shutdown)."""
+    await _client.aclose()
+
+
+def public_url(bucket: str, path: str) -> str:
+    return f"{STORAGE_URL}/object/public/{bucket}/{path}"
+
+
+async def _file_chunks(source: BinaryIO) -> AsyncIterator[bytes]:
+    # Local temp file: reads are fast enough to do inline between awaits
+    while chunk := source.read(STREAM_CHUNK_SIZE):
+        yield chunk
+
+
+async def _send(method: str, url: str, make_request_kwargs) -> httpx.Response:
+    """Send with retries; make_request_kwargs() rebuilds the body per attempt."""
+    attempts = config.STORAGE_MAX_RETRIES + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            response = await _client.request(method, url, **make_request_kwargs())
+            if response.status_code not in _RETRY_STATUSES or attempt == attempts:
+                return response
+            logger.warning(
+                f"Storage {method} {url} returned {response.status_code} "
+                f"(attempt {attempt}/{attempts}), retrying"
+            )
+        except httpx.TransportError as e:
+            if attempt == attempts:
+                raise StorageError(f"Storage {method} {url} failed: {e}") from e
+            logger.warning(
+                f"Storage {method} {url} failed (attempt {attempt}/{attempts}): {e}"
+            )
+        await asyncio.sleep(0.25 * 2 ** (attempt - 1))
+    raise AssertionError("unreachable")
+
+
+async def upload(
+    bucket: str, path: str, data: Union[bytes, BinaryIO], content_type: str
+) -> str:
+    """Upload bytes or a seekable file (streamed in chunks); returns public URL."""
+    if isinstance(data, bytes):
+        length = len(data)
+        start: Optional[int] = None
+    else:
+        start = data.tell()
+        length = os.fstat(data.fileno()).st_size - start
+
+    def request_kwargs():
+        if start is None:
+            content = data
+        else:
+            data.seek(start)
+            content = _file_chunks(data)
+        return {
+            "content": content,
+            "headers": {
+                "content-type": content_type,
+                "content-length": str(length),
+                "x-upsert": "false",
+            },
+        }
+
+    response = await _send("POST", f"/object/{bucket}/{path}", request_kwargs)
+    # A retried upload whose first attempt landed reports a duplicate; paths
+    # are unique per upload, so that object is ours
+    if response.status_code == 409 or (
+        response.status_code == 400 and "Duplicate" in response.text
+    ):
+        logger.info(
+            f"Storage object {bucket}/{path} already present, treating as uploaded"
+        )
+    elif response.is_error:
+        raise StorageError(
+            f"Upload to {bucket}/{path} failed: {response.status_code} {response.text}"
+        )
+    return public_url(bucket, path)
+
+
+async def remove(bucket: str, paths: List[str]) -> None:
+    """Delete objects from a bucket (missing objects are not an error)."""
+    if not paths:
+        return
+    response = await _send(
+        "DELETE", f"/object/{bucket}", lambda: {"json": {"prefixes": paths}}
+    )
+    if response.is_error:
+        raise StorageError(
+            f"Delete from {bucket} failed: {response.status_code} {response.text}"
+        )
+
+
+async def list_objects(bucket: str, limit: int = 100) -> List[Dict[str, Any]]:
+    """Objects at the top level of a bucket, oldest first (name, created_at...)."""
+    response = await _send(
+        "POST",
+        f"/object/list/{bucket}",
+        lambda: {
+            "json": {
+                "prefix": "",
+                "limit": limit,
+                "offset": 0,
+                "sortBy": {"column": "created_at", "order": "asc"},
+            }
+        },
+    )
+    if response.is_error:
+        raise StorageError(
+            f"Listing {bucket} failed: {response.status_code} {response.text}"
+        )
+    # Folders come back as entries without an id
+    return [entry for entry in response.json() if entry.get("id")]
+
+
+async def create_signed_upload_url(bucket: str, path: str) -> str:
+    """Absolute URL a client can PUT one object to, without our credentials.
+
+    Supabase fixes the token's lifetime (SIGNED_UPLOAD_URL_LIFETIME_SECONDS);
+    callers that need a shorter window must enforce it themselves when the
+    upload is finalized.
+    """
+    response = await _send(
+        "POST",
+        f"/object/upload/sign/{bucket}/{path}",
+        lambda: {"headers": {"x-upsert": "false"}},
+    )
+    if response.is_error:
+        raise StorageError(
+            f"Signing upload to {bucket}/{path} failed: "
+            f"{response.status_code} {response.text}"
+        )
+    return f"{STORAGE_URL}{response.json()['url']}"
+
+
+@asynccontextmanager
+async def open_object(bucket: str, path: str) -> AsyncIterator[httpx.Response]:
+    """Stream an object (private buckets too); read it with aiter_bytes()."""
+    try:
+        async with _client.stream(
+            "GET", f"/object/authenticated/{bucket}/{path}"
+        ) as response:
+            # Storage reports a missing object as 400 or 404 depending on version
+            if response.status_code in (400, 404):
+                raise ObjectNotFound(f"{bucket}/{path} does not exist")
+            if response.is_error:
+                await response.aread()
+                raise StorageError(
+                    f"Download of {bucket}/{path} failed: "
+                    f"{response.status_code} {response.text}"
+                )
+            yield response
+    except httpx.TransportError as e:
+        raise StorageError(f"Download of {bucket}/{path} failed: {e}") from e
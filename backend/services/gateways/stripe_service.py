@@ -1,20 +1,56 @@
 import stripe
 from stripe import StripeError, InvalidRequestError, SignatureVerificationError
 from typing import Dict, Any, Literal
+from datetime import datetime
 from fastapi import HTTPException
+import httpx
+import math
 import logging
+import ssl
 from utils.config import config
 
 logger = logging.getLogger(__name__)
 
 stripe.api_key = config.STRIPE_SECRET_KEY
+# Stripe retries network failures itself, reusing the same idempotency key
+stripe.max_network_retries = config.STRIPE_MAX_NETWORK_RETRIES
+
+
+class _PooledHTTPXClient(stripe.HTTPXClient):
+    """The SDK's httpx client with an explicit keep-alive pool and timeouts.
+
+    The stock client builds an httpx.AsyncClient with default limits (5s
+    keep-alive expiry) and an 80s timeout; a checkout spike then pays a TLS
+    handshake per call and a hung request pins a handler for over a minute.
+    """
+
+    def __init__(self):
+        super().__init__(timeout=config.STRIPE_HTTP_TIMEOUT_SECONDS)
+        self._client_async = httpx.AsyncClient(
+            verify=ssl.create_default_context(cafile=stripe.ca_bundle_path),
+            limits=httpx.Limits(
+                max_connections=config.STRIPE_MAX_CONNECTIONS,
+                max_keepalive_connections=config.STRIPE_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+        )
+
+
+# One client per worker; every call below goes through the *_async API so a
+# Stripe round-trip never blocks the event loop.
+stripe.default_http_client = _PooledHTTPXClient()
+
+
+async def close_http_client():
+    """Close the pooled Stripe connections (app shutdown)."""
+    await stripe.default_http_client.close_async()
 
 
 async def create_stripe_connect_account(
     user_email: str, user_id: str
 ) -> Dict[str, Any]:
     try:
-        account = stripe.Account.create(
+        account = await stripe.Account.create_async(
             type="express",
             email=user_email,
             metadata={"dorm_made_user_id": user_id},
@@ -24,7 +60,7 @@ async def create_stripe_connect_account(
             },
         )
 
-        account_link = stripe.AccountLink.create(
+        account_link = await stripe.AccountLink.create_async(
             account=account.id,
             refresh_url=f"{config.FRONTEND_URL}/profile/{user_id}?stripe=refresh",
             return_url=f"{config.FRONTEND_URL}/profile/{user_id}?stripe=complete",
@@ -44,7 +80,7 @@ async def create_stripe_connect_account(
 
 async def get_stripe_account_status(stripe_account_id: str) -> Dict[str, Any]:
     try:
-        account = stripe.Account.retrieve(stripe_account_id)
+        account = await stripe.Account.retrieve_async(stripe_account_id)
 
         return {
             "charges_enabled": account.charges_enabled,
@@ -68,7 +104,7 @@ async def create_account_link(
     ],
 ) -> str:
     try:
-        account_link = stripe.AccountLink.create(
+        account_link = await stripe.AccountLink.create_async(
             account=stripe_account_id,
             refresh_url=f"{config.FRONTEND_URL}/profile/{user_id}?stripe=refresh",
             return_url=f"{config.FRONTEND_URL}/profile/{user_id}?stripe=complete",
@@ -112,11 +148,12 @@ async def create_checkout_session(
     foodie_id: str,
     chef_id: str,
     currency: str,
+    expires_at: datetime,
 ) -> Dict[str, Any]:
     try:
         chef_amount = (price_cents * 84) // 100
 
-        session = stripe.checkout.Session.create(
+        session = await stripe.checkout.Session.create_async(
             ui_mode="embedded",
             mode="payment",
             payment_method_types=["card"],
@@ -146,12 +183,14 @@ async def create_checkout_session(
                 "chef_id": chef_id,
             },
             return_url=f"{config.FRONTEND_URL}/explore?session_id={{CHECKOUT_SESSION_ID}}",
+            # Ends with the foodie's seat hold, so nobody pays for a released seat
+            expires_at=math.ceil(expires_at.timestamp()),
         )
 
         logger.info(
             f"Checkout session created: {session.id} for event {event_id}, user {foodie_id}"
         )
-        return {"client_secret": session.client_secret}
+        return {"id": session.id, "client_secret": session.client_secret}
     except StripeError as e:
         logger.error(f"Stripe error creating checkout for event {event_id}: {e}")
         raise HTTPException(status_code=400, detail=f"Stripe API error: {str(e)}")
@@ -159,7 +198,7 @@ async def create_checkout_session(
 
 async def retrieve_checkout_session(session_id: str) -> Dict[str, Any]:
     try:
-        session = stripe.checkout.Session.retrieve(session_id)
+        session = await stripe.checkout.Session.retrieve_async(session_id)
         return {
             "status": session.status,
             "payment_status": session.payment_status,
@@ -183,14 +222,21 @@ async def capture_payment_intent(payment_intent_id: str):
     await stripe.PaymentIntent.capture_async(payment_intent_id)
 
 
-async def cancel_payment_intent(payment_intent_id: str):
+async def cancel_payment_intent(
+    payment_intent_id: str, idempotency_key: str | None = None
+):
     """Cancel (void) an uncaptured PaymentIntent. No Stripe fees are incurred
     because the charge was never captured."""
-    await stripe.PaymentIntent.cancel_async(payment_intent_id)
+    kwargs: Dict[str, Any] = {}
+    if idempotency_key:
+        kwargs["idempotency_key"] = idempotency_key
+    await stripe.PaymentIntent.cancel_async(payment_intent_id, **kwargs)
 
 
 async def create_refund(
-    payment_intent_id: str, amount_cents: int | None = None
+    payment_intent_id: str,
+    amount_cents: int | None = None,
+    idempotency_key: str | None = None,
 ) -> Dict[str, Any]:
     """Refund a captured PaymentIntent. amount_cents=None refunds in full.
     reverse_transfer claws back the chef's share of the transfer."""
@@ -200,5 +246,7 @@ async def create_refund(
     }
     if amount_cents is not None:
         kwargs["amount"] = amount_cents
+    if idempotency_key:
+        kwargs["idempotency_key"] = idempotency_key
     refund = await stripe.Refund.create_async(**kwargs)
     return {"id": refund.id, "status": refund.status}
@@ -0,0 +1,140 @@
+"""Image upload pipeline: validate, re-encode without metadata, store.
+
+Validation and storage paths live in utils/uploads.py, decoding and the
+variants in utils/images.py; this module moves the bytes through the
+storage gateway. Every stored image is a folder - `original.<ext>` plus its
+WebP variants - and a folder that could not be stored completely is
+removed again rather than left half-uploaded in the bucket.
+"""
+
+from fastapi import HTTPException, UploadFile
+from typing import Awaitable, Dict, List
+import asyncio
+import logging
+import tempfile
+
+from .gateways import storage_service
+from utils.images import VARIANT_FORMAT, ImageProcessingError, build_images
+from utils.uploads import (
+    CHUNK_SIZE,
+    bad_type,
+    check_size,
+    new_original_path,
+    spool_capped,
+    stored_object_paths,
+    upload_chunks,
+)
+
+logger = logging.getLogger(__name__)
+
+VARIANT_MIME = f"image/{VARIANT_FORMAT}"
+
+
+async def upload_image(
+    image: UploadFile, bucket: str, filename_prefix: str = ""
+) -> str:
+    """Validate and upload an image; returns the public URL."""
+    # The multipart parser usually knows the size already: reject for free
+    check_size(image.size)
+
+    # buffering=0 gives a raw FileIO, which the storage client streams from
+    with tempfile.TemporaryFile(buffering=0) as spool:
+        detected = await spool_capped(upload_chunks(image), spool)
+        try:
+            original, variants = await asyncio.to_thread(build_images, spool, detected)
+        except ImageProcessingError as e:
+            logger.warning(f"Rejected undecodable upload for bucket {bucket}: {e}")
+            raise HTTPException(status_code=400, detail="Invalid or corrupt image.")
+
+    # Extension and content-type come from the DETECTED type, never the client
+    original_path = new_original_path(detected, filename_prefix)
+    try:
+        return await _store_folder(bucket, original_path, original, detected, variants)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading image to bucket {bucket}: {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Error uploading image: {str(e)}")
+
+
+async def publish_staged_image(
+    staging_bucket: str, staged_path: str, bucket: str, path: str, expected_type: str
+) -> str:
+    """Validate an object a client uploaded to the staging bucket and publish
+    it, with its variants, at `path` in `bucket`.
+
+    Reads the staged object back capped at MAX_SIZE_BYTES and checks its
+    magic bytes match `expected_type`. Only the re-encoded original - no
+    EXIF, content-type from the detected type - ever reaches the public
+    bucket; the client's own bytes never do. The staged object is left for
+    the caller to delete. Returns the public URL of the original.
+    """
+    source = f"{staging_bucket}/{staged_path}"
+    try:
+        with tempfile.TemporaryFile(buffering=0) as spool:
+            async with storage_service.open_object(
+                staging_bucket, staged_path
+            ) as response:
+                length = response.headers.get("content-length")
+                check_size(int(length) if length is not None else None)
+                detected = await spool_capped(response.aiter_bytes(CHUNK_SIZE), spool)
+            if detected != expected_type:
+                raise bad_type()
+            try:
+                original, variants = await asyncio.to_thread(
+                    build_images, spool, detected
+                )
+            except ImageProcessingError as e:
+                logger.warning(f"Rejected undecodable upload {source}: {e}")
+                raise HTTPException(status_code=400, detail="Invalid or corrupt image.")
+
+        return await _store_folder(bucket, path, original, detected, variants)
+    except storage_service.ObjectNotFound:
+        raise HTTPException(status_code=400, detail="Uploaded image not found.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error publishing upload {source}: {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Error uploading image: {str(e)}")
+
+
+async def _store_folder(
+    bucket: str,
+    original_path: str,
+    original: bytes,
+    image_type: str,
+    variants: Dict[str, bytes],
+) -> str:
+    """Upload the original and its variants; returns the original's URL."""
+    folder = original_path.rpartition("/")[0]
+    uploads = [
+        storage_service.upload(bucket, original_path, original, f"image/{image_type}")
+    ] + [
+        storage_service.upload(
+            bucket, f"{folder}/{name}.{VARIANT_FORMAT}", data, VARIANT_MIME
+        )
+        for name, data in variants.items()
+    ]
+    public_url, *_ = await _gather_uploads(bucket, original_path, uploads)
+    return public_url
+
+
+async def _gather_uploads(
+    bucket: str, original_path: str, uploads: List[Awaitable[str]]
+) -> List[str]:
+    """Run the uploads of one image folder; if any fails, let the others
+    finish and then remove the whole folder before re-raising."""
+    results = await asyncio.gather(*uploads, return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        await _discard(bucket, original_path)
+        raise failures[0]
+    return results
+
+
+async def _discard(bucket: str, path: str):
+    try:
+        paths = stored_object_paths(storage_service.public_url(bucket, path), bucket)
+        await storage_service.remove(bucket, paths)
+    except Exception as e:
+        logger.warning(f"Failed to delete rejected upload {bucket}/{path}: {e}")
@@ -1,16 +1,23 @@
 from fastapi import HTTPException, UploadFile
 from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 import uuid
 import logging
 
 from models.meal import MealModel
-from schemas.meal import Meal, MealCreate, MealUpdate
+from schemas.meal import Meal, MealCreate, MealPage, MealUpdate
 from utils.converters import meal_model_to_schema, meal_models_to_schemas
-from utils.supabase import supabase
-from utils.uploads import upload_image
+from utils.cache import cache
+from utils.http_cache import invalidate
+from utils.pagination import decode_score_cursor, encode_score_cursor
+from utils.search import after_cursor, match_and_rank
+from utils.uploads import stored_object_paths
 from .user_service import get_user
+from .image_service import upload_image
+from .gateways import storage_service
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +62,7 @@ async def create_meal(
         db.add(meal_model)
         db.commit()
         db.refresh(meal_model)
+        invalidate("meals")
 
         logger.info(f"Meal created successfully: {meal_model.id} by user {user_id}")
         return meal_model_to_schema(meal_model)
@@ -97,6 +105,48 @@ async def get_user_meals(user_id: str, db: Session) -> List[Meal]:
         )
 
 
+async def search_meals(
+    query: str,
+    db: AsyncSession,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> MealPage:
+    """Meals matching `query` (title, description, ingredients), best first"""
+    limit = max(1, min(limit, 50))
+    where, rank = match_and_rank(
+        db.get_bind().dialect.name,
+        query,
+        "meals",
+        (MealModel.title, MealModel.description, MealModel.ingredients),
+        MealModel.title,
+    )
+    stmt = select(MealModel, rank).where(MealModel.is_deleted == False, where)
+    if cursor:
+        stmt = stmt.where(
+            after_cursor(
+                rank, MealModel.id, decode_score_cursor(cursor), MealModel.id.type
+            )
+        )
+    try:
+        result = await db.execute(
+            stmt.order_by(rank.desc(), MealModel.id.asc()).limit(limit + 1)
+        )
+        rows = result.all()
+    except Exception as e:
+        logger.error(f"Error searching meals for {query!r}: {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Error searching meals: {str(e)}")
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_meal, last_rank = rows[-1]
+        next_cursor = encode_score_cursor(last_rank, last_meal.id)
+    return MealPage(
+        meals=meal_models_to_schemas([meal for meal, _ in rows]),
+        next_cursor=next_cursor,
+    )
+
+
 async def get_meal(meal_id: str, db: Session) -> Meal:
     """Get a specific meal by ID (excluding deleted ones)"""
     try:
@@ -114,15 +164,26 @@ async def get_meal(meal_id: str, db: Session) -> Meal:
         raise HTTPException(status_code=400, detail=f"Error fetching meal: {str(e)}")
 
 
-def get_meal_name(meal_id: str, db: Session) -> str:
+MEAL_TITLE_TTL_SECONDS = 300
+
+
+async def get_meal_name(meal_id: str, db: Session) -> str:
     """Get meal name by ID - returns empty string if not found (excluding deleted ones)"""
-    try:
+    if not meal_id:
+        return ""
+
+    async def load() -> str:
         meal_model = (
             db.query(MealModel)
             .filter(MealModel.id == meal_id, MealModel.is_deleted == False)
             .first()
         )
         return meal_model.title if meal_model else ""
+
+    try:
+        return await cache.aget_or_set(
+            "meal_title", meal_id, load, MEAL_TITLE_TTL_SECONDS
+        )
     except Exception:
         return ""
 
@@ -160,6 +221,8 @@ async def update_meal(
 
         db.commit()
         db.refresh(meal_model)
+        await cache.ainvalidate("meal_title", meal_id)
+        invalidate("meals")
 
         logger.info(f"Meal {meal_id} updated successfully by user {user_id}")
         return meal_model_to_schema(meal_model)
@@ -171,6 +234,49 @@ async def update_meal(
         raise HTTPException(status_code=400, detail=f"Error updating meal: {str(e)}")
 
 
+async def set_meal_image(
+    meal_id: str, image_url: str, user_id: str, db: Session
+) -> Meal:
+    """Attach an already-stored image to a meal (only the creator can)"""
+    meal_model = (
+        db.query(MealModel)
+        .filter(MealModel.id == meal_id, MealModel.is_deleted == False)
+        .first()
+    )
+    if not meal_model:
+        raise HTTPException(status_code=404, detail="Meal not found")
+    if meal_model.user_id != user_id:
+        logger.warning(
+            f"User {user_id} attempted to set the image of meal {meal_id} without permission"
+        )
+        raise HTTPException(
+            status_code=403, detail="Only the meal creator can update the meal"
+        )
+
+    old_image_url = meal_model.image_url
+    try:
+        meal_model.image_url = image_url
+        db.commit()
+        db.refresh(meal_model)
+        # Event payloads embed the meal image too
+        invalidate("meals", "events")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error setting image of meal {meal_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Error updating meal: {str(e)}")
+
+    if old_image_url and old_image_url != image_url:
+        try:
+            await storage_service.remove(
+                "meal-images", stored_object_paths(old_image_url, "meal-images")
+            )
+        except Exception as e:
+            logger.warning(f"Failed to delete old image of meal {meal_id}: {e}")
+
+    logger.info(f"Meal {meal_id} image updated by user {user_id}")
+    return meal_model_to_schema(meal_model)
+
+
 async def soft_delete_meal(meal_id: str, user_id: str, db: Session) -> Dict[str, str]:
     """Soft delete a meal (only the creator can delete)"""
     from typing import Dict
@@ -198,6 +304,8 @@ async def soft_delete_meal(meal_id: str, user_id: str, db: Session) -> Dict[str,
         # Soft delete: set is_deleted to True
         meal_model.is_deleted = True
         db.commit()
+        await cache.ainvalidate("meal_title", meal_id)
+        invalidate("meals")
         logger.info(f"Meal {meal_id} soft deleted by user {user_id}")
         return {"message": "Meal successfully deleted", "meal_id": meal_id}
     except Exception as e:
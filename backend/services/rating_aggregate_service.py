@@ -0,0 +1,162 @@
+"""Incrementally maintained per-user rating totals.
+
+create_event_review / create_guest_review call the record_* helpers before
+committing, so a review and its aggregate bump land in one transaction.
+Profile reads then fetch a single row by primary key instead of running
+COUNT/AVG over every review the user ever received.
+
+Rebuild from scratch (backfill, or repair after manual review edits):
+
+    python -m services.rating_aggregate_service
+"""
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Dict, Optional
+import logging
+
+from models.event_review import EventReviewModel
+from models.guest_review import GuestReviewModel
+from models.user_rating_aggregate import UserRatingAggregateModel
+from schemas.review import GuestRatingSummary, HostRatingSummary
+from utils.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def _avg(total: int, count: int) -> Optional[float]:
+    return round(total / count, 1) if count else None
+
+
+def _increment(db: Session, user_id: str, **deltas: int) -> None:
+    """Atomic upsert: create the user's row or add deltas to it in place."""
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(UserRatingAggregateModel).values(user_id=user_id, **deltas)
+    set_ = {
+        name: getattr(UserRatingAggregateModel, name) + value
+        for name, value in deltas.items()
+    }
+    set_["updated_at"] = func.now()
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserRatingAggregateModel.user_id], set_=set_
+        )
+    )
+
+
+def record_event_review(db: Session, review: EventReviewModel) -> None:
+    """Add a new foodie -> chef review to the chef's totals (caller commits)."""
+    _increment(
+        db,
+        review.host_user_id,
+        host_review_count=1,
+        host_food_sum=review.food_stars,
+        host_space_sum=review.space_stars,
+        host_host_sum=review.host_stars,
+    )
+
+
+def record_guest_review(db: Session, review: GuestReviewModel) -> None:
+    """Add a new host -> foodie review to the guest's totals (caller commits)."""
+    _increment(
+        db,
+        review.guest_id,
+        guest_review_count=1,
+        guest_sociability_sum=review.sociability_stars,
+        guest_etiquette_sum=review.etiquette_stars,
+    )
+
+
+def host_summary(
+    user_id: str, aggregate: Optional[UserRatingAggregateModel]
+) -> HostRatingSummary:
+    count = aggregate.host_review_count if aggregate else 0
+    food = aggregate.host_food_sum if aggregate else 0
+    space = aggregate.host_space_sum if aggregate else 0
+    host = aggregate.host_host_sum if aggregate else 0
+    return HostRatingSummary(
+        user_id=user_id,
+        review_count=count,
+        average_total=_avg(food + space + host, count),
+        average_food=_avg(food, count),
+        average_space=_avg(space, count),
+        average_host=_avg(host, count),
+    )
+
+
+def guest_summary(
+    user_id: str, aggregate: Optional[UserRatingAggregateModel]
+) -> GuestRatingSummary:
+    count = aggregate.guest_review_count if aggregate else 0
+    sociability = aggregate.guest_sociability_sum if aggregate else 0
+    etiquette = aggregate.guest_etiquette_sum if aggregate else 0
+    return GuestRatingSummary(
+        user_id=user_id,
+        review_count=count,
+        average_total=_avg(sociability + etiquette, count),
+        average_sociability=_avg(sociability, count),
+        average_etiquette=_avg(etiquette, count),
+    )
+
+
+def rebuild_rating_aggregates(db: Session) -> int:
+    """Recompute every user's totals from the review tables. Returns row count."""
+    totals: Dict[str, Dict[str, int]] = {}
+
+    host_rows = db.query(
+        EventReviewModel.host_user_id,
+        func.count(EventReviewModel.id),
+        func.sum(EventReviewModel.food_stars),
+        func.sum(EventReviewModel.space_stars),
+        func.sum(EventReviewModel.host_stars),
+    ).group_by(EventReviewModel.host_user_id)
+    for user_id, count, food, space, host in host_rows:
+        totals.setdefault(user_id, {}).update(
+            host_review_count=count,
+            host_food_sum=food,
+            host_space_sum=space,
+            host_host_sum=host,
+        )
+
+    guest_rows = db.query(
+        GuestReviewModel.guest_id,
+        func.count(GuestReviewModel.id),
+        func.sum(GuestReviewModel.sociability_stars),
+        func.sum(GuestReviewModel.etiquette_stars),
+    ).group_by(GuestReviewModel.guest_id)
+    for user_id, count, sociability, etiquette in guest_rows:
+        totals.setdefault(user_id, {}).update(
+            guest_review_count=count,
+            guest_sociability_sum=sociability,
+            guest_etiquette_sum=etiquette,
+        )
+
+    try:
+        db.query(UserRatingAggregateModel).delete(synchronize_session=False)
+        db.add_all(
+            UserRatingAggregateModel(user_id=user_id, **values)
+            for user_id, values in totals.items()
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    cache.invalidate_namespace("host_rating")
+    cache.invalidate_namespace("guest_rating")
+    logger.info(f"Rebuilt rating aggregates for {len(totals)} user(s)")
+    return len(totals)
+
+
+if __name__ == "__main__":
+    import models  # noqa: F401 - registers every table so FKs resolve
+    from utils.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        rebuild_rating_aggregates(session)
+    finally:
+        session.close()
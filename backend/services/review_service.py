@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from typing import List, Optional
-from sqlalchemy import desc, func
+from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 import logging
@@ -11,6 +12,7 @@ from models.event_participant import EventParticipantModel
 from models.event_review import EventReviewModel
 from models.guest_review import GuestReviewModel
 from models.user import UserModel
+from models.user_rating_aggregate import UserRatingAggregateModel
 from schemas.review import (
     EventReview,
     EventReviewCreate,
@@ -23,9 +25,14 @@ from schemas.review import (
     PendingReviews,
     UnratedGuest,
 )
+from utils.cache import cache
+from utils.http_cache import invalidate
+from . import rating_aggregate_service
 
 logger = logging.getLogger(__name__)
 
+RATING_SUMMARY_TTL_SECONDS = 60
+
 
 def _event_review_to_schema(
     review: EventReviewModel, reviewer: UserModel
@@ -137,8 +144,11 @@ async def create_event_review(
             host_comment=(review.host_comment or "").strip() or None,
         )
         db.add(review_model)
+        rating_aggregate_service.record_event_review(db, review_model)
         db.commit()
         db.refresh(review_model)
+        await cache.ainvalidate("host_rating", review_model.host_user_id)
+        invalidate("reviews")
 
         reviewer = db.query(UserModel).filter(UserModel.id == reviewer_id).first()
         logger.info(f"Event review created: event {event_id} by user {reviewer_id}")
@@ -166,33 +176,23 @@ async def get_event_reviews(event_id: str, db: Session) -> List[EventReview]:
         raise HTTPException(status_code=400, detail=f"Error fetching reviews: {str(e)}")
 
 
-async def get_host_rating_summary(user_id: str, db: Session) -> HostRatingSummary:
-    """Aggregate chef score across all reviews of events they hosted."""
+async def get_host_rating_summary(
+    user_id: str, db: AsyncSession
+) -> HostRatingSummary:
+    """Aggregate chef score across all reviews of events they hosted.
+
+    Reads the incrementally maintained totals row (one PK lookup), cached.
+    """
+
+    async def load():
+        aggregate = await db.get(UserRatingAggregateModel, user_id)
+        return rating_aggregate_service.host_summary(user_id, aggregate).model_dump()
+
     try:
-        row = (
-            db.query(
-                func.count(EventReviewModel.id),
-                func.avg(
-                    EventReviewModel.food_stars
-                    + EventReviewModel.space_stars
-                    + EventReviewModel.host_stars
-                ),
-                func.avg(EventReviewModel.food_stars),
-                func.avg(EventReviewModel.space_stars),
-                func.avg(EventReviewModel.host_stars),
-            )
-            .filter(EventReviewModel.host_user_id == user_id)
-            .one()
-        )
-        count, avg_total, avg_food, avg_space, avg_host = row
-        return HostRatingSummary(
-            user_id=user_id,
-            review_count=count or 0,
-            average_total=round(float(avg_total), 1) if avg_total is not None else None,
-            average_food=round(float(avg_food), 1) if avg_food is not None else None,
-            average_space=round(float(avg_space), 1) if avg_space is not None else None,
-            average_host=round(float(avg_host), 1) if avg_host is not None else None,
+        summary = await cache.aget_or_set(
+            "host_rating", user_id, load, RATING_SUMMARY_TTL_SECONDS
         )
+        return HostRatingSummary.model_validate(summary)
     except Exception as e:
         raise HTTPException(
             status_code=400, detail=f"Error fetching host rating: {str(e)}"
@@ -248,8 +248,10 @@ async def create_guest_review(
             comment=(review.comment or "").strip() or None,
         )
         db.add(review_model)
+        rating_aggregate_service.record_guest_review(db, review_model)
         db.commit()
         db.refresh(review_model)
+        await cache.ainvalidate("guest_rating", review_model.guest_id)
 
         host = db.query(UserModel).filter(UserModel.id == host_id).first()
         logger.info(
@@ -325,6 +327,7 @@ async def get_pending_reviews(user_id: str, db: Session) -> PendingReviews:
     now = datetime.now(timezone.utc)
     try:
         # --- Foodie side: attended past events without a review by this user
+        # (anti-join against event_reviews, one round-trip)
         attended = (
             db.query(EventModel, UserModel.name)
             .join(
@@ -332,21 +335,21 @@ async def get_pending_reviews(user_id: str, db: Session) -> PendingReviews:
                 EventParticipantModel.event_id == EventModel.id,
             )
             .join(UserModel, UserModel.id == EventModel.host_user_id)
+            .outerjoin(
+                EventReviewModel,
+                (EventReviewModel.event_id == EventModel.id)
+                & (EventReviewModel.reviewer_id == user_id),
+            )
             .filter(
                 EventParticipantModel.participant_id == user_id,
                 EventParticipantModel.status == "confirmed",
                 EventModel.is_deleted == False,
                 EventModel.event_date < now,
+                EventReviewModel.id.is_(None),
             )
             .order_by(desc(EventModel.event_date))
             .all()
         )
-        reviewed_event_ids = {
-            row[0]
-            for row in db.query(EventReviewModel.event_id)
-            .filter(EventReviewModel.reviewer_id == user_id)
-            .all()
-        }
         pending_event_reviews = [
             PendingEventReview(
                 event_id=event.id,
@@ -355,56 +358,45 @@ async def get_pending_reviews(user_id: str, db: Session) -> PendingReviews:
                 host_name=host_name,
             )
             for event, host_name in attended
-            if event.id not in reviewed_event_ids
         ]
 
-        # --- Chef side: hosted past events with confirmed guests not yet rated
-        hosted = (
-            db.query(EventModel)
+        # --- Chef side: every (hosted past event, confirmed guest) pair with
+        # no guest review yet, in ONE query regardless of how many events the
+        # host has run; grouped per event below.
+        unrated_rows = (
+            db.query(EventModel, UserModel.id, UserModel.name)
+            .join(
+                EventParticipantModel,
+                EventParticipantModel.event_id == EventModel.id,
+            )
+            .join(UserModel, UserModel.id == EventParticipantModel.participant_id)
+            .outerjoin(
+                GuestReviewModel,
+                (GuestReviewModel.event_id == EventModel.id)
+                & (GuestReviewModel.guest_id == EventParticipantModel.participant_id),
+            )
             .filter(
                 EventModel.host_user_id == user_id,
                 EventModel.is_deleted == False,
                 EventModel.event_date < now,
+                EventParticipantModel.status == "confirmed",
+                GuestReviewModel.id.is_(None),
             )
-            .order_by(desc(EventModel.event_date))
+            .order_by(desc(EventModel.event_date), EventModel.id)
             .all()
         )
         pending_guest_reviews: List[PendingGuestReviewEvent] = []
-        for event in hosted:
-            guests = (
-                db.query(UserModel)
-                .join(
-                    EventParticipantModel,
-                    EventParticipantModel.participant_id == UserModel.id,
-                )
-                .filter(
-                    EventParticipantModel.event_id == event.id,
-                    EventParticipantModel.status == "confirmed",
-                )
-                .all()
-            )
-            if not guests:
-                continue
-            rated_guest_ids = {
-                row[0]
-                for row in db.query(GuestReviewModel.guest_id)
-                .filter(GuestReviewModel.event_id == event.id)
-                .all()
-            }
-            unrated = [
-                UnratedGuest(id=guest.id, name=guest.name)
-                for guest in guests
-                if guest.id not in rated_guest_ids
-            ]
-            if unrated:
-                pending_guest_reviews.append(
-                    PendingGuestReviewEvent(
-                        event_id=event.id,
-                        event_title=event.title,
-                        event_date=event.event_date,
-                        unrated_guests=unrated,
-                    )
+        for event, guest_id, guest_name in unrated_rows:
+            current = pending_guest_reviews[-1] if pending_guest_reviews else None
+            if current is None or current.event_id != event.id:
+                current = PendingGuestReviewEvent(
+                    event_id=event.id,
+                    event_title=event.title,
+                    event_date=event.event_date,
+                    unrated_guests=[],
                 )
+                pending_guest_reviews.append(current)
+            current.unrated_guests.append(UnratedGuest(id=guest_id, name=guest_name))
 
         return PendingReviews(
             pending_event_reviews=pending_event_reviews,
@@ -420,28 +412,20 @@ async def get_pending_reviews(user_id: str, db: Session) -> PendingReviews:
 
 
 async def get_guest_rating_summary(user_id: str, db: Session) -> GuestRatingSummary:
-    """Aggregate foodie score across all reviews received as a guest."""
+    """Aggregate foodie score across all reviews received as a guest.
+
+    Reads the incrementally maintained totals row (one PK lookup), cached.
+    """
+
+    async def load():
+        aggregate = db.get(UserRatingAggregateModel, user_id)
+        return rating_aggregate_service.guest_summary(user_id, aggregate).model_dump()
+
     try:
-        row = (
-            db.query(
-                func.count(GuestReviewModel.id),
-                func.avg(
-                    GuestReviewModel.sociability_stars + GuestReviewModel.etiquette_stars
-                ),
-                func.avg(GuestReviewModel.sociability_stars),
-                func.avg(GuestReviewModel.etiquette_stars),
-            )
-            .filter(GuestReviewModel.guest_id == user_id)
-            .one()
-        )
-        count, avg_total, avg_soc, avg_eti = row
-        return GuestRatingSummary(
-            user_id=user_id,
-            review_count=count or 0,
-            average_total=round(float(avg_total), 1) if avg_total is not None else None,
-            average_sociability=round(float(avg_soc), 1) if avg_soc is not None else None,
-            average_etiquette=round(float(avg_eti), 1) if avg_eti is not None else None,
+        summary = await cache.aget_or_set(
+            "guest_rating", user_id, load, RATING_SUMMARY_TTL_SECONDS
         )
+        return GuestRatingSummary.model_validate(summary)
     except Exception as e:
         raise HTTPException(
             status_code=400, detail=f"Error fetching guest rating: {str(e)}"
@@ -0,0 +1,255 @@
+"""Seat accounting on EventModel.current_participants, and seat holds.
+
+The counter is authoritative: a seat is taken by one atomic conditional
+UPDATE (`... SET current_participants = current_participants + 1 WHERE
+current_participants < max_participants`), so concurrent bookings for the
+last seat serialize on the event's row lock and exactly one of them wins.
+The lock is held until the caller commits or rolls back, which also makes
+the seat change atomic with whatever participation change goes with it.
+
+Callers never COUNT participation rows to make capacity decisions.
+
+Seats are taken when checkout opens, as a SeatHoldModel row that expires
+with the Checkout Session. Payment turns the hold into a participation
+without touching the counter again; an abandoned checkout gives the seat
+back on checkout.session.expired or, failing that, through the sweeper
+(run_hold_sweeper) once the hold has expired. So the counter is active
+participations plus live holds, and two foodies can never both be paying
+for the last seat.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import asyncio
+import logging
+import uuid
+
+from models.event import EventModel
+from models.seat_hold import SeatHoldModel
+from utils.config import config
+from utils.database import SessionLocal
+from utils.http_cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+# Statuses that hold a seat on the event.
+ACTIVE_STATUSES = ("booked", "confirmed")
+
+# Stripe wants a Checkout Session's expires_at at least 30 min after it is
+# created; the margin covers the time between computing it and Stripe
+# receiving the request, so the default 30 min TTL is never rejected.
+CHECKOUT_EXPIRY_MARGIN = timedelta(minutes=2)
+
+# checkout.session.completed for a session paid just before it expired can
+# land a little after expires_at; the sweeper leaves such holds alone.
+HOLD_SWEEP_GRACE = timedelta(minutes=5)
+
+
+def hold_expiry() -> datetime:
+    """When a hold (and its Checkout Session) taken right now expires."""
+    return (
+        datetime.now(timezone.utc)
+        + timedelta(seconds=config.SEAT_HOLD_TTL_SECONDS)
+        + CHECKOUT_EXPIRY_MARGIN
+    )
+
+
+def _refresh_counter(event_id: str, db: Session) -> None:
+    # The UPDATE bypasses the identity map; reload a loaded event's counter
+    event = db.identity_map.get((EventModel, (event_id,), None))
+    if event is not None:
+        db.expire(event, ["current_participants"])
+
+
+def reserve_seat(event_id: str, db: Session) -> bool:
+    """Take one seat on a live event. False if the event is full (or gone).
+
+    Does not commit.
+    """
+    result = db.execute(
+        update(EventModel)
+        .where(
+            EventModel.id == event_id,
+            EventModel.is_deleted == False,
+            EventModel.current_participants < EventModel.max_participants,
+        )
+        .values(current_participants=EventModel.current_participants + 1)
+        .execution_options(synchronize_session=False)
+    )
+    _refresh_counter(event_id, db)
+    return result.rowcount == 1
+
+
+def release_seat(event_id: str, db: Session) -> None:
+    """Give one seat back, never going below zero. Does not commit."""
+    db.execute(
+        update(EventModel)
+        .where(EventModel.id == event_id, EventModel.current_participants > 0)
+        .values(current_participants=EventModel.current_participants - 1)
+        .execution_options(synchronize_session=False)
+    )
+    _refresh_counter(event_id, db)
+
+
+def _find_hold(
+    event_id: str, foodie_id: str, db: Session, lock: bool = False
+) -> Optional[SeatHoldModel]:
+    query = db.query(SeatHoldModel).filter(
+        SeatHoldModel.event_id == event_id, SeatHoldModel.foodie_id == foodie_id
+    )
+    if lock:
+        query = query.with_for_update()
+    return query.first()
+
+
+def has_hold(event_id: str, foodie_id: str, db: Session) -> bool:
+    """Whether the foodie already has a seat set aside (expired or not)."""
+    return _find_hold(event_id, foodie_id, db) is not None
+
+
+def _extend_hold(hold: SeatHoldModel, expires_at: datetime, db: Session) -> None:
+    hold.expires_at = expires_at
+    hold.checkout_session_id = None
+    db.commit()
+
+
+def hold_seat(event_id: str, foodie_id: str, db: Session) -> Tuple[SeatHoldModel, bool]:
+    """Set a seat aside for the foodie until hold_expiry().
+
+    A foodie reopening checkout keeps (and extends) their existing hold. It
+    is detached from the previous Checkout Session, so that session expiring
+    can't release it before the new one is attached.
+    Returns (hold, created); raises 400 if the event is full. Commits.
+    """
+    expires_at = hold_expiry()
+
+    hold = _find_hold(event_id, foodie_id, db, lock=True)
+    if hold:
+        _extend_hold(hold, expires_at, db)
+        return hold, False
+
+    if not reserve_seat(event_id, db):
+        db.rollback()
+        logger.warning(f"No seat to hold on event {event_id} for user {foodie_id}")
+        raise HTTPException(status_code=400, detail="Event is full")
+
+    hold = SeatHoldModel(
+        id=str(uuid.uuid4()),
+        event_id=event_id,
+        foodie_id=foodie_id,
+        expires_at=expires_at,
+    )
+    db.add(hold)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request from the same foodie created the hold first;
+        # rolling back also returns the seat this one took
+        db.rollback()
+        hold = _find_hold(event_id, foodie_id, db, lock=True)
+        _extend_hold(hold, expires_at, db)
+        return hold, False
+
+    invalidate("events")
+    logger.info(f"Seat held on event {event_id} for user {foodie_id}")
+    return hold, True
+
+
+def attach_checkout_session(
+    hold: SeatHoldModel, checkout_session_id: str, expires_at: datetime, db: Session
+) -> None:
+    """Tie the hold to its Checkout Session, expiring with it. Commits."""
+    hold.checkout_session_id = checkout_session_id
+    hold.expires_at = expires_at
+    db.commit()
+
+
+def consume_hold(event_id: str, foodie_id: str, db: Session) -> bool:
+    """Turn the foodie's hold into their booking: the hold goes, the seat it
+    took stays taken. False if there was no hold. Does not commit."""
+    hold = _find_hold(event_id, foodie_id, db, lock=True)
+    if not hold:
+        return False
+    db.delete(hold)
+    return True
+
+
+def release_hold(
+    event_id: str,
+    foodie_id: str,
+    db: Session,
+    checkout_session_id: Optional[str] = None,
+) -> bool:
+    """Drop the foodie's hold and give its seat back. With
+    checkout_session_id, only if the hold still belongs to that session (an
+    older session expiring must not free the seat of a newer one).
+
+    False if there was nothing to release. Does not commit.
+    """
+    hold = _find_hold(event_id, foodie_id, db, lock=True)
+    if not hold:
+        return False
+    if checkout_session_id and hold.checkout_session_id != checkout_session_id:
+        return False
+    db.delete(hold)
+    release_seat(event_id, db)
+    return True
+
+
+def release_expired_holds(
+    db: Session, batch_size: int = config.SEAT_HOLD_SWEEP_BATCH_SIZE
+) -> int:
+    """Release one batch of expired holds. Returns how many were released."""
+    cutoff = datetime.now(timezone.utc) - HOLD_SWEEP_GRACE
+    holds = (
+        db.query(SeatHoldModel)
+        .filter(SeatHoldModel.expires_at < cutoff)
+        .order_by(SeatHoldModel.expires_at)
+        .limit(batch_size)
+        # A hold being consumed by the webhook right now is skipped, not waited on
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for hold in holds:
+        db.delete(hold)
+        release_seat(hold.event_id, db)
+
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if holds:
+        invalidate("events")
+        logger.info(f"Released {len(holds)} expired seat hold(s)")
+    return len(holds)
+
+
+def _sweep_once() -> int:
+    db = SessionLocal()
+    try:
+        return release_expired_holds(db)
+    finally:
+        db.close()
+
+
+async def run_hold_sweeper():
+    """Release expired holds until cancelled (started from the app lifespan).
+
+    A full batch means more may be waiting, so the next batch is swept
+    immediately; otherwise sleep for SEAT_HOLD_SWEEP_SECONDS.
+    """
+    logger.info("Seat hold sweeper started")
+    while True:
+        try:
+            released = await asyncio.to_thread(_sweep_once)
+        except Exception as e:
+            logger.error(f"Seat hold sweep failed: {e}", exc_info=True)
+            released = 0
+        if released < config.SEAT_HOLD_SWEEP_BATCH_SIZE:
+            await asyncio.sleep(config.SEAT_HOLD_SWEEP_SECONDS)
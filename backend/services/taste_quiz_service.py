@@ -9,11 +9,13 @@ so we know you're a carnivore").
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from typing import Dict, List
+import hashlib
 import json
 import logging
 
 from models.user import UserModel
 from schemas.user import TasteProfileResponse
+from utils.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -154,7 +156,7 @@ _SECONDARY_PHRASES: Dict[str, str] = {
 }
 
 
-def get_quiz_questions() -> List[Dict]:
+def _public_questions() -> List[Dict]:
     """Quiz definition for the frontend (prompts, images, no signals leaked)."""
     return [
         {
@@ -174,6 +176,22 @@ def get_quiz_questions() -> List[Dict]:
     ]
 
 
+# The quiz only changes with a deploy, so the response body is serialized
+# once here; its content hash versions it (ETag and the immutable URL)
+QUESTIONS_JSON: bytes = json.dumps(
+    _public_questions(), ensure_ascii=False, separators=(",", ":")
+).encode("utf-8")
+QUESTIONS_VERSION = hashlib.sha256(QUESTIONS_JSON).hexdigest()[:16]
+QUESTIONS_ETAG = f'"{QUESTIONS_VERSION}"'
+
+# option id -> index of the question it answers
+_QUESTION_INDEX: Dict[str, int] = {
+    option["id"]: index
+    for index, question in enumerate(QUIZ_QUESTIONS)
+    for option in question["options"]
+}
+
+
 def _score_picks(picks: List[str]) -> List[str]:
     """Return signals ranked by score (primary pick = 2 pts, secondary = 1 pt)."""
     scores: Dict[str, int] = {}
@@ -212,11 +230,8 @@ async def submit_quiz(user_id: str, picks: List[str], db: Session) -> TasteProfi
             status_code=400,
             detail=f"Please answer all {len(QUIZ_QUESTIONS)} questions",
         )
-    valid_ids_per_question = [
-        {option["id"] for option in question["options"]} for question in QUIZ_QUESTIONS
-    ]
     for index, image_id in enumerate(picks):
-        if image_id not in valid_ids_per_question[index]:
+        if _QUESTION_INDEX.get(image_id) != index:
             raise HTTPException(status_code=400, detail=f"Invalid pick: {image_id}")
 
     user_model = db.query(UserModel).filter(UserModel.id == user_id).first()
@@ -234,6 +249,7 @@ async def submit_quiz(user_id: str, picks: List[str], db: Session) -> TasteProfi
         user_model.onboarding_completed = True
         db.commit()
         db.refresh(user_model)
+        await cache.ainvalidate("user_card", user_id)
         logger.info(f"Taste profile saved for user {user_id}: {archetype}")
         return TasteProfileResponse(
             taste_archetype=archetype,
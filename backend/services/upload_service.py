@@ -0,0 +1,230 @@
+"""Direct-to-storage image uploads.
+
+    POST /uploads/sign      -> signed Storage URL + our upload token
+    PUT  <uploadUrl>        -> client sends the image bytes to Supabase
+    POST /uploads/finalize  -> validate the staged object, publish, attach
+
+Image bytes never pass through an API worker on the way in. The signed URL
+points into a PRIVATE staging bucket (UPLOAD_STAGING_BUCKET), never at a
+public path: finalize publishes only the validated, re-encoded image into
+the public bucket, and deletes the staged object however finalize ends.
+Staged objects nobody finalized are removed by run_staging_sweeper once
+their signed URL can no longer be used.
+
+The upload token is a short-lived JWT (UPLOAD_URL_TTL_SECONDS) binding the
+caller, the target record and both storage paths, so finalize cannot be
+pointed at someone else's object or record. It carries no `userId` claim and
+is therefore never accepted as an access token.
+"""
+
+from fastapi import HTTPException
+from datetime import datetime, timedelta, timezone
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from typing import Optional
+import asyncio
+import logging
+
+from models.event import EventModel
+from models.meal import MealModel
+from schemas.upload import (
+    SignedUpload,
+    SignedUploadCreate,
+    UploadedImage,
+    UploadFinalize,
+)
+from utils.config import config
+from utils.images import variant_urls
+from utils.password import ALGORITHM, SECRET_KEY
+from utils.uploads import IMAGE_TYPES, new_original_path, new_staging_path
+from .event_service import set_event_image
+from .meal_service import set_meal_image
+from .user_service import set_profile_picture
+from .image_service import publish_staged_image
+from .gateways import storage_service
+
+logger = logging.getLogger(__name__)
+
+TOKEN_TYPE = "image-upload"
+BUCKETS = {
+    "event": "event-images",
+    "meal": "meal-images",
+    "profile": "profile-pictures",
+}
+STAGING_SWEEP_BATCH_SIZE = 100
+
+
+def _check_target(
+    target: str, target_id: Optional[str], user_id: str, db: Session
+) -> str:
+    """Return the record id the upload is for; 403/404 if the caller can't."""
+    if target == "profile":
+        return user_id
+    if not target_id:
+        raise HTTPException(status_code=400, detail="targetId is required")
+
+    model = EventModel if target == "event" else MealModel
+    record = (
+        db.query(model).filter(model.id == target_id, model.is_deleted == False).first()
+    )
+    if not record:
+        raise HTTPException(status_code=404, detail=f"{target.title()} not found")
+    owner_id = record.host_user_id if target == "event" else record.user_id
+    if owner_id != user_id:
+        logger.warning(
+            f"User {user_id} requested an image upload for {target} {target_id} without permission"
+        )
+        raise HTTPException(
+            status_code=403, detail=f"You can only upload images for your own {target}s"
+        )
+    return target_id
+
+
+async def create_signed_upload(
+    request: SignedUploadCreate, user_id: str, db: Session
+) -> SignedUpload:
+    """Issue a signed Storage upload URL for one image"""
+    target_id = _check_target(request.target, request.target_id, user_id, db)
+    bucket = BUCKETS[request.target]
+    image_type = IMAGE_TYPES[request.content_type]
+    prefix = f"{user_id}_" if request.target == "profile" else ""
+    path = new_original_path(image_type, filename_prefix=prefix)
+    staged_path = new_staging_path(image_type)
+
+    try:
+        upload_url = await storage_service.create_signed_upload_url(
+            config.UPLOAD_STAGING_BUCKET, staged_path
+        )
+    except storage_service.StorageError as e:
+        logger.error(f"Error signing upload for user {user_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=502, detail="Image storage unavailable")
+
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        seconds=config.UPLOAD_URL_TTL_SECONDS
+    )
+    upload_token = jwt.encode(
+        {
+            "typ": TOKEN_TYPE,
+            "sub": user_id,
+            "target": request.target,
+            "targetId": target_id,
+            "bucket": bucket,
+            "path": path,
+            "stagedPath": staged_path,
+            "imageType": image_type,
+            "exp": expires_at,
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    logger.info(f"Signed {request.target} image upload {staged_path} for {user_id}")
+    return SignedUpload(
+        upload_url=upload_url, upload_token=upload_token, expires_at=expires_at
+    )
+
+
+def _decode_upload_token(token: str) -> dict:
+    """Claims of a genuine upload token, expired or not; 400 otherwise.
+
+    Expiry is checked by the caller, after it knows which staged object to
+    clean up.
+    """
+    try:
+        claims = jwt.decode(
+            token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": False}
+        )
+    except JWTError:
+        raise HTTPException(status_code=400, detail="Invalid or expired upload token")
+    if claims.get("typ") != TOKEN_TYPE or "stagedPath" not in claims:
+        raise HTTPException(status_code=400, detail="Invalid or expired upload token")
+    return claims
+
+
+async def _discard_staged(staged_path: str):
+    try:
+        await storage_service.remove(config.UPLOAD_STAGING_BUCKET, [staged_path])
+    except Exception as e:
+        logger.warning(f"Failed to delete staged upload {staged_path}: {e}")
+
+
+async def finalize_upload(
+    request: UploadFinalize, user_id: str, db: Session
+) -> UploadedImage:
+    """Validate a directly uploaded image, publish it and attach it to its
+    record"""
+    claims = _decode_upload_token(request.upload_token)
+    if claims.get("sub") != user_id:
+        # Not the uploader's request: leave their staged object alone (it is
+        # private, and swept if they never finalize it)
+        raise HTTPException(
+            status_code=403, detail="This upload belongs to another user"
+        )
+    staged_path = claims["stagedPath"]
+    bucket, path, target = claims["bucket"], claims["path"], claims["target"]
+
+    try:
+        if claims.get("exp", 0) < datetime.now(timezone.utc).timestamp():
+            raise HTTPException(
+                status_code=400, detail="Invalid or expired upload token"
+            )
+        # Ownership may have changed (event deleted...) since the URL was signed
+        target_id = _check_target(target, claims["targetId"], user_id, db)
+        image_url = await publish_staged_image(
+            config.UPLOAD_STAGING_BUCKET, staged_path, bucket, path, claims["imageType"]
+        )
+    finally:
+        # Published or rejected, the client's own bytes are never kept
+        await _discard_staged(staged_path)
+
+    if target == "event":
+        await set_event_image(target_id, image_url, user_id, db)
+    elif target == "meal":
+        await set_meal_image(target_id, image_url, user_id, db)
+    else:
+        await set_profile_picture(user_id, image_url, db)
+
+    logger.info(f"Finalized {target} image upload {bucket}/{path} for {user_id}")
+    return UploadedImage(
+        target=target,
+        target_id=target_id,
+        image_url=image_url,
+        image_variants=variant_urls(image_url),
+    )
+
+
+async def sweep_staged_uploads(batch_size: int = STAGING_SWEEP_BATCH_SIZE) -> int:
+    """Delete one batch of staged uploads whose signed URL has run out (so
+    nobody can finalize or overwrite them any more). Returns how many."""
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=storage_service.SIGNED_UPLOAD_URL_LIFETIME_SECONDS
+    )
+    objects = await storage_service.list_objects(
+        config.UPLOAD_STAGING_BUCKET, limit=batch_size
+    )
+    stale = [
+        entry["name"]
+        for entry in objects
+        if datetime.fromisoformat(entry["created_at"].replace("Z", "+00:00")) < cutoff
+    ]
+    await storage_service.remove(config.UPLOAD_STAGING_BUCKET, stale)
+    if stale:
+        logger.info(f"Deleted {len(stale)} unfinalized staged upload(s)")
+    return len(stale)
+
+
+async def run_staging_sweeper():
+    """Sweep unfinalized staged uploads until cancelled (started from the app
+    lifespan).
+
+    A full batch means more may be waiting, so the next batch is swept
+    immediately; otherwise sleep for UPLOAD_STAGING_SWEEP_SECONDS.
+    """
+    logger.info("Staged upload sweeper started")
+    while True:
+        try:
+            deleted = await sweep_staged_uploads()
+        except Exception as e:
+            logger.error(f"Staged upload sweep failed: {e}", exc_info=True)
+            deleted = 0
+        if deleted < STAGING_SWEEP_BATCH_SIZE:
+            await asyncio.sleep(config.UPLOAD_STAGING_SWEEP_SECONDS)
@@ -1,16 +1,36 @@
 from fastapi import HTTPException, UploadFile
-from typing import Optional, List
+from typing import Awaitable, Callable, Optional, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 import logging
 
 from models.user import UserModel
-from schemas.user import User, UserCreate, UserLogin, UserUpdate, LoginResponse
-from utils.password import hash_password, verify_password, create_access_token
-from utils.converters import user_model_to_schema, user_models_to_schemas
-from utils.supabase import supabase
-from utils.uploads import upload_image
+from schemas.user import (
+    LoginResponse,
+    PublicUser,
+    User,
+    UserCreate,
+    UserLogin,
+    UserUpdate,
+)
+from utils.password import (
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    create_access_token,
+)
+from utils.cache import cache
+from utils.converters import (
+    public_user_model_to_schema,
+    user_model_to_schema,
+    user_models_to_schemas,
+)
+from utils.uploads import stored_object_paths
+from services.gateways import storage_service
+from services.image_service import upload_image
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +55,63 @@ async def get_user(user_id: str, db: Session) -> Optional[User]:
         return None
 
 
+USER_CARD_TTL_SECONDS = 300
+
+
+async def _cached_user_card(
+    user_id: str, find_user: Callable[[], Awaitable[Optional[UserModel]]]
+) -> Optional[PublicUser]:
+    """The "user_card" cache entry, loaded through `find_user` on a miss.
+
+    The one place the cached card's shape is defined, whichever session
+    type the caller has.
+    """
+
+    async def load():
+        user_model = await find_user()
+        if not user_model:
+            return None
+        return public_user_model_to_schema(user_model).model_dump(mode="json")
+
+    try:
+        card = await cache.aget_or_set(
+            "user_card", user_id, load, USER_CARD_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.error(f"Error getting user card {user_id}: {e}", exc_info=True)
+        return None
+    return PublicUser.model_validate(card) if card else None
+
+
+async def get_public_user_card(user_id: str, db: Session) -> Optional[PublicUser]:
+    """Public profile card (cached; invalidated by profile and taste-quiz writes)"""
+
+    async def find_user():
+        return db.query(UserModel).filter(UserModel.id == user_id).first()
+
+    return await _cached_user_card(user_id, find_user)
+
+
+def campus_of(university: Optional[str]) -> Optional[str]:
+    """Campus key for a free-text university: trimmed, single-spaced, lower.
+
+    Must match the backfill in migration c6f1a3e8d2b7.
+    """
+    key = " ".join((university or "").split()).lower()
+    return key or None
+
+
+async def get_user_campus(user_id: str, db: AsyncSession) -> Optional[str]:
+    """Campus of a user, from the cached profile card"""
+
+    async def find_user():
+        result = await db.execute(select(UserModel).where(UserModel.id == user_id))
+        return result.scalar_one_or_none()
+
+    card = await _cached_user_card(user_id, find_user)
+    return campus_of(card.university) if card else None
+
+
 async def create_user(user: UserCreate, db: Session) -> LoginResponse:
     """Create a new user and log them in immediately (returns token + user).
     Optionally referred by an existing user's invite code."""
@@ -56,7 +133,7 @@ async def create_user(user: UserCreate, db: Session) -> LoginResponse:
             referrer = referral_service.resolve_invite_code(user.invite_code, db)
 
         # Hash password
-        hashed_password = hash_password(user.password)
+        hashed_password = await hash_password_async(user.password)
 
         # Create new user model with their own invite code ready to share
         user_model = UserModel(
@@ -119,10 +196,21 @@ async def authenticate_user(login_data: UserLogin, db: Session) -> LoginResponse
         logger.warning(f"Failed login attempt for email: {login_data.email}")
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    if not verify_password(login_data.password, user_model.hashed_password):
+    if not await verify_password_async(login_data.password, user_model.hashed_password):
         logger.warning(f"Invalid password for user: {login_data.email}")
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    if password_needs_rehash(user_model.hashed_password):
+        # BCRYPT_ROUNDS changed since this hash was made; we have the plaintext
+        # now, so move it to the current cost. Best-effort - login still succeeds.
+        try:
+            user_model.hashed_password = await hash_password_async(login_data.password)
+            db.commit()
+            logger.info(f"Rehashed password for user {user_model.id} at current cost")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Password rehash failed for user {user_model.id}: {e}")
+
     access_token = create_access_token(data={"userId": user_model.id})
     logger.info(f"User authenticated successfully: {user_model.id}")
 
@@ -150,6 +238,7 @@ async def update_user(user_id: str, user_update: UserUpdate, db: Session) -> Use
 
         db.commit()
         db.refresh(user_model)
+        await cache.ainvalidate("user_card", user_id)
 
         logger.info(f"User updated successfully: {user_id}")
         return user_model_to_schema(user_model)
@@ -164,39 +253,15 @@ async def update_user(user_id: str, user_update: UserUpdate, db: Session) -> Use
 async def upload_profile_picture(user_id: str, image: UploadFile, db: Session) -> User:
     """Upload a profile picture to Supabase Storage and update user profile"""
     try:
-        # Get current user to check for existing profile picture
         current_user = await get_user(user_id, db)
         if not current_user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Delete old profile picture if it exists
-        old_picture_url = current_user.profile_picture
-        if old_picture_url:
-            try:
-                # Extract filename from URL
-                if "profile-pictures/" in old_picture_url:
-                    old_filename = old_picture_url.split("profile-pictures/")[-1].split(
-                        "?"
-                    )[0]
-                    supabase.storage.from_("profile-pictures").remove([old_filename])
-            except Exception as e:
-                logger.warning(
-                    f"Failed to delete old profile picture for user {user_id}: {e}"
-                )
-                # Continue with upload even if deletion fails
-
         # Upload new picture (magic-byte validated; JPEG/PNG/WebP)
         public_url = await upload_image(
             image, "profile-pictures", filename_prefix=f"{user_id}_"
         )
-
-        # Update user profile with new picture URL
-        updated_user = await update_user(
-            user_id, UserUpdate(profile_picture=public_url), db
-        )
-
-        logger.info(f"Profile picture uploaded successfully for user: {user_id}")
-        return updated_user
+        return await set_profile_picture(user_id, public_url, db)
     except HTTPException:
         raise
     except Exception as e:
@@ -208,6 +273,32 @@ async def upload_profile_picture(user_id: str, image: UploadFile, db: Session) -
         )
 
 
+async def set_profile_picture(user_id: str, public_url: str, db: Session) -> User:
+    """Point the profile at an already-stored picture and delete the old one"""
+    current_user = await get_user(user_id, db)
+    if not current_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    old_picture_url = current_user.profile_picture
+    updated_user = await update_user(
+        user_id, UserUpdate(profile_picture=public_url), db
+    )
+
+    if old_picture_url and old_picture_url != public_url:
+        try:
+            # The original plus any generated variants
+            old_paths = stored_object_paths(old_picture_url, "profile-pictures")
+            await storage_service.remove("profile-pictures", old_paths)
+        except Exception as e:
+            # The new picture is live; an orphaned old file is harmless
+            logger.warning(
+                f"Failed to delete old profile picture for user {user_id}: {e}"
+            )
+
+    logger.info(f"Profile picture updated successfully for user: {user_id}")
+    return updated_user
+
+
 async def update_stripe_account(
     user_id: str, stripe_account_id: str, db: Session
 ) -> User:
@@ -233,14 +324,25 @@ async def update_stripe_account(
 
 
 async def update_stripe_status(
-    user_id: str, onboarding_complete: bool, db: Session
+    user_id: str,
+    onboarding_complete: bool,
+    db: Session,
+    charges_enabled: Optional[bool] = None,
+    payouts_enabled: Optional[bool] = None,
 ) -> User:
+    """Store onboarding state and, when known, the account's capabilities.
+
+    Passing charges/payouts also stamps stripe_status_synced_at, which is what
+    checkout uses to decide whether it can skip the live Stripe lookup.
+    """
     try:
         user_model = db.query(UserModel).filter(UserModel.id == user_id).first()
         if not user_model:
             raise HTTPException(status_code=404, detail="User not found")
 
         user_model.stripe_onboarding_complete = onboarding_complete
+        if charges_enabled is not None or payouts_enabled is not None:
+            record_stripe_capabilities(user_model, charges_enabled, payouts_enabled)
         db.commit()
         db.refresh(user_model)
 
@@ -260,6 +362,17 @@ async def update_stripe_status(
         )
 
 
+def record_stripe_capabilities(
+    user_model: UserModel,
+    charges_enabled: Optional[bool],
+    payouts_enabled: Optional[bool],
+) -> None:
+    """Stamp the cached Connect capabilities on a user row (caller commits)."""
+    user_model.stripe_charges_enabled = bool(charges_enabled)
+    user_model.stripe_payouts_enabled = bool(payouts_enabled)
+    user_model.stripe_status_synced_at = datetime.now(timezone.utc)
+
+
 def get_user_by_stripe_account(
     stripe_account_id: str, db: Session
 ) -> Optional[UserModel]:
@@ -0,0 +1,127 @@
+"""Processed-event ledger for the Stripe webhooks (stripe_webhook_events).
+
+Stripe delivers at least once and retries anything that isn't a 2xx, so
+one event can arrive many times. process_once() claims the event's ledger
+row before running its handler and records the outcome afterwards:
+
+- processed: redeliveries are acknowledged after one primary-key lookup -
+  no handler queries, no emails.
+- failed: the handler raised; Stripe's retry runs it again.
+- processing: another delivery is being handled right now, so this one
+  gets a 409 and Stripe retries it later. A claim older than STALE_CLAIM
+  (the worker died mid-way) is taken over.
+
+Handlers stay idempotent on their own; the ledger makes the common
+duplicate cheap and keeps type, outcome, attempts and duration per event
+for reconciliation.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+import time
+
+from models.stripe_webhook_event import StripeWebhookEventModel
+from schemas.stripe import WebhookResponse
+
+logger = logging.getLogger(__name__)
+
+STALE_CLAIM = timedelta(minutes=5)
+
+Handler = Callable[[Dict[str, Any], Session], Awaitable[WebhookResponse]]
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Treat naive datetimes as UTC (SQLite test dbs return naive values)."""
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def _in_progress(event_id: str) -> HTTPException:
+    logger.info(f"Stripe event {event_id} is already being processed")
+    return HTTPException(status_code=409, detail="Event is already being processed")
+
+
+def _claim(
+    event_id: str, event_type: str, db: Session
+) -> Optional[StripeWebhookEventModel]:
+    """The ledger row to handle this delivery under, or None if the event was
+    already processed. 409 while another delivery holds a fresh claim."""
+    now = datetime.now(timezone.utc)
+    entry = db.get(StripeWebhookEventModel, event_id)
+
+    if entry is None:
+        entry = StripeWebhookEventModel(id=event_id, type=event_type, started_at=now)
+        db.add(entry)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent delivery of the same event claimed it first
+            db.rollback()
+            raise _in_progress(event_id)
+        return entry
+
+    if entry.status == "processed":
+        return None
+
+    # Failed or stale: re-check under the row lock so only one retry runs it
+    db.refresh(entry, with_for_update=True)
+    if entry.status == "processed":
+        db.commit()
+        return None
+    if entry.status == "processing" and _as_utc(entry.started_at) > now - STALE_CLAIM:
+        db.commit()
+        raise _in_progress(event_id)
+    entry.status = "processing"
+    entry.attempts += 1
+    entry.started_at = now
+    db.commit()
+    return entry
+
+
+def _record(
+    entry: StripeWebhookEventModel,
+    status: str,
+    outcome: str,
+    started: float,
+    db: Session,
+) -> None:
+    # Best-effort: never turn a handled event into a failed delivery
+    event_id = entry.id
+    try:
+        entry.status = status
+        entry.outcome = outcome
+        entry.duration_ms = round((time.perf_counter() - started) * 1000)
+        entry.processed_at = (
+            datetime.now(timezone.utc) if status == "processed" else None
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Could not record outcome of Stripe event {event_id}: {e}")
+
+
+async def process_once(
+    event: Dict[str, Any], db: Session, handler: Handler
+) -> WebhookResponse:
+    """Run `handler` for a verified Stripe event unless it was processed
+    already, recording the outcome in the ledger."""
+    event_id = event["id"]
+    entry = _claim(event_id, event["type"], db)
+    if entry is None:
+        logger.info(f"Stripe event {event_id} already processed, skipping")
+        return WebhookResponse(received=True, message="Event already processed")
+
+    started = time.perf_counter()
+    try:
+        response = await handler(event, db)
+    except Exception as e:
+        db.rollback()
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        _record(entry, "failed", str(detail), started, db)
+        raise
+
+    _record(entry, "processed", response.message, started, db)
+    return response
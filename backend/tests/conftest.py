@@ -43,6 +43,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.dialects.postgresql import UUID
@@ -61,11 +62,23 @@ from models.event import EventModel
 from models.event_participant import EventParticipantModel
 from models.event_review import EventReviewModel
 from models.guest_review import GuestReviewModel
+from models.user_rating_aggregate import UserRatingAggregateModel
+from models.email_outbox import EmailOutboxModel
+from models.seat_hold import SeatHoldModel
+from models.stripe_webhook_event import StripeWebhookEventModel
 
 
 @pytest.fixture()
-def db():
-    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+def db_path(tmp_path):
+    # A file (not :memory:) so the sync and async fixtures share one database
+    return tmp_path / "test.db"
+
+
+@pytest.fixture()
+def db(db_path):
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+    )
     Base.metadata.create_all(engine)
     TestSession = sessionmaker(bind=engine)
     session = TestSession()
@@ -76,6 +89,18 @@ def db():
         engine.dispose()
 
 
+@pytest.fixture()
+async def async_db(db, db_path):
+    """AsyncSession over the same database the sync `db` fixture seeds."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session = async_sessionmaker(engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        await session.close()
+        await engine.dispose()
+
+
 def make_user(db, name="Chef Carla", email=None, stripe_account="acct_123"):
     user = UserModel(
         id=str(uuid.uuid4()),
@@ -133,6 +158,8 @@ def make_participation(db, event, user, status="booked", payment_intent="pi_test
         joined_at=datetime.now(timezone.utc),
     )
     db.add(p)
+    if status in ("booked", "confirmed"):
+        event.current_participants += 1  # as the booking paths do
     db.commit()
     return p
 
@@ -140,16 +167,24 @@ def make_participation(db, event, user, status="booked", payment_intent="pi_test
 @pytest.fixture()
 def stripe_calls(monkeypatch):
     """Stub every outbound Stripe call and record invocations."""
-    calls = {"captured": [], "cancelled": [], "refunded": [], "accounts": []}
+    calls = {
+        "captured": [],
+        "cancelled": [],
+        "refunded": [],
+        "accounts": [],
+        "idempotency_keys": [],
+    }
 
     async def fake_capture(pi):
         calls["captured"].append(pi)
 
-    async def fake_cancel(pi):
+    async def fake_cancel(pi, idempotency_key=None):
         calls["cancelled"].append(pi)
+        calls["idempotency_keys"].append(idempotency_key)
 
-    async def fake_refund(pi, amount_cents=None):
+    async def fake_refund(pi, amount_cents=None, idempotency_key=None):
         calls["refunded"].append((pi, amount_cents))
+        calls["idempotency_keys"].append(idempotency_key)
         return {"id": "re_test", "status": "succeeded"}
 
     async def fake_account(acct):
@@ -169,13 +204,25 @@ def stripe_calls(monkeypatch):
     return calls
 
 
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Each test starts with an empty service cache."""
+    from utils.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def no_emails(monkeypatch):
+    """Record Resend payloads instead of sending them."""
     import services.gateways.email_service as email_service
 
-    async def fake_send(**kwargs):
-        return None
-
+    sent = []
     monkeypatch.setattr(
-        email_service, "send_chef_notification", fake_send, raising=False
+        email_service,
+        "send_now",
+        lambda params, idempotency_key=None: sent.append(params),
     )
+    return sent
@@ -0,0 +1,65 @@
+"""Tests for password login: off-loop bcrypt and rehash on cost change."""
+
+import pytest
+from fastapi import HTTPException
+
+from tests.conftest import make_user
+
+import services.user_service as user_service
+import utils.password as password
+from schemas.user import UserLogin
+
+
+@pytest.fixture(autouse=True)
+def cheap_bcrypt(monkeypatch):
+    monkeypatch.setattr(password, "BCRYPT_ROUNDS", 4)
+
+
+async def test_login_verifies_password(db):
+    user = make_user(db, email="carla@test.edu")
+    user.hashed_password = await password.hash_password_async("hunter22")
+    db.commit()
+
+    resp = await user_service.authenticate_user(
+        UserLogin(email="carla@test.edu", password="hunter22"), db
+    )
+    assert resp.user.id == user.id
+
+    with pytest.raises(HTTPException) as e:
+        await user_service.authenticate_user(
+            UserLogin(email="carla@test.edu", password="wrong"), db
+        )
+    assert e.value.status_code == 401
+
+
+async def test_login_rehashes_when_cost_changes(db, monkeypatch):
+    user = make_user(db, email="carla@test.edu")
+    user.hashed_password = await password.hash_password_async("hunter22")
+    db.commit()
+    assert user.hashed_password.startswith("$2b$04$")
+
+    monkeypatch.setattr(password, "BCRYPT_ROUNDS", 5)
+    await user_service.authenticate_user(
+        UserLogin(email="carla@test.edu", password="hunter22"), db
+    )
+    db.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
+    assert password.verify_password("hunter22", user.hashed_password)
+
+
+# ---------- verified-token cache ----------
+
+
+def test_token_cache_hits_on_repeat_and_respects_exp(monkeypatch):
+    monkeypatch.setattr(password, "_token_cache", password._VerifiedTokenCache(10))
+    token = password.create_access_token({"userId": "u1"})
+
+    assert password.verify_token(token) == "u1"
+    assert password.verify_token(token) == "u1"
+    stats = password.token_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    # An entry past its exp is dropped, never served
+    password._token_cache.put(b"expired", "u2", password.time.time() - 1)
+    assert password._token_cache.get(b"expired") is None
+    assert password.token_cache_stats()["size"] == 1
@@ -0,0 +1,138 @@
+"""Tests for the service read cache (memory backend) and its first users."""
+
+import asyncio
+import threading
+
+from tests.conftest import make_user, make_meal
+
+import utils.cache as cache_module
+from utils.cache import Cache, MemoryBackend
+from schemas.meal import MealUpdate
+import services.meal_service as meal_service
+
+
+def test_memory_backend_expires_and_evicts_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    backend = MemoryBackend(max_entries=2)
+
+    backend.set("a", "1", ttl=10)
+    backend.set("b", "2", ttl=10)
+    backend.get("a")  # a is now most recently used
+    backend.set("c", "3", ttl=10)
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+
+    now[0] += 11
+    assert backend.get("a") is None
+
+
+def test_namespace_invalidation_drops_every_key():
+    cache = Cache(MemoryBackend(100))
+    cache.set("user_card", "u1", {"name": "A"}, ttl=60)
+    cache.set("meal_title", "m1", "Feijoada", ttl=60)
+
+    cache.invalidate_namespace("user_card")
+    assert cache.get_or_set("user_card", "u1", lambda: {"name": "B"}, 60) == {
+        "name": "B"
+    }
+    assert cache.get_or_set("meal_title", "m1", lambda: "other", 60) == "Feijoada"
+
+
+async def test_concurrent_misses_load_once():
+    cache = Cache(MemoryBackend(100))
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return {"review_count": 3}
+
+    results = await asyncio.gather(
+        *(cache.aget_or_set("host_rating", "u1", load, 60) for _ in range(5))
+    )
+    assert loads == [1]
+    assert all(r == {"review_count": 3} for r in results)
+
+
+async def test_failed_load_frees_the_flight_for_every_waiter():
+    cache = Cache(MemoryBackend(100))
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise ConnectionError("db down")
+        return "Feijoada"
+
+    results = await asyncio.gather(
+        *(cache.aget_or_set("meal_title", "m1", load, 60) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], ConnectionError)
+    assert results[1:] == ["Feijoada", "Feijoada"]
+    assert calls == [1, 1]
+    assert cache._async_flights == {}
+
+
+async def test_blocking_backend_is_called_off_the_event_loop():
+    loop_thread = threading.get_ident()
+
+    class SlowRemote(MemoryBackend):
+        blocking = True
+        threads = set()
+
+        def get(self, key):
+            self.threads.add(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value, ttl):
+            self.threads.add(threading.get_ident())
+            super().set(key, value, ttl)
+
+        def delete(self, key):
+            self.threads.add(threading.get_ident())
+            super().delete(key)
+
+        def incr(self, key):
+            self.threads.add(threading.get_ident())
+            return super().incr(key)
+
+    backend = SlowRemote(100)
+    cache = Cache(backend)
+
+    async def load():
+        return {"review_count": 3}
+
+    assert await cache.aget_or_set("host_rating", "u1", load, 60) == {"review_count": 3}
+    assert await cache.aget_or_set("host_rating", "u1", load, 60) == {"review_count": 3}
+    await cache.ainvalidate("host_rating", "u1")
+    await cache.ainvalidate_namespace("host_rating")
+    assert backend.threads and loop_thread not in backend.threads
+
+
+def test_broken_backend_degrades_to_loader():
+    class Down:
+        def __getattr__(self, name):
+            def fail(*args, **kwargs):
+                raise ConnectionError("redis down")
+
+            return fail
+
+    cache = Cache(Down())
+    assert cache.get_or_set("meal_title", "m1", lambda: "Feijoada", 60) == "Feijoada"
+
+
+async def test_meal_title_cached_until_meal_update(db):
+    user = make_user(db)
+    meal = make_meal(db, user)
+    assert await meal_service.get_meal_name(meal.id, db) == "Feijoada"
+
+    # Direct DB edits bypass invalidation: the cached title is still served
+    meal.title = "Moqueca"
+    db.commit()
+    assert await meal_service.get_meal_name(meal.id, db) == "Feijoada"
+
+    await meal_service.update_meal(meal.id, MealUpdate(title="Moqueca"), user.id, db)
+    assert await meal_service.get_meal_name(meal.id, db) == "Moqueca"
@@ -0,0 +1,299 @@
+"""Tests for signed direct-to-storage uploads (sign -> client PUT -> finalize)."""
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+import services.gateways.storage_service as storage_service
+from models.meal import MealModel
+from models.user import UserModel
+from schemas.upload import SignedUploadCreate, UploadFinalize
+from services import upload_service
+from tests.conftest import make_meal, make_user
+
+
+def png_bytes():
+    out = io.BytesIO()
+    Image.new("RGB", (40, 20), (10, 120, 60)).save(out, format="PNG")
+    return out.getvalue()
+
+
+class FakeBucket(dict):
+    """{(bucket, path): bytes}, plus the content-type and creation time each
+    was stored with."""
+
+    def __init__(self):
+        super().__init__()
+        self.content_types = {}
+        self.created_at = {}
+
+
+@pytest.fixture()
+def bucket(monkeypatch):
+    """A fake Storage API backed by a FakeBucket."""
+    objects = FakeBucket()
+    prefix = "/storage/v1/object"
+
+    async def handler(request: httpx.Request):
+        path = request.url.path[len(prefix) :]
+        if request.method == "POST" and path.startswith("/upload/sign/"):
+            return httpx.Response(200, json={"url": f"/object{path}?token=t"})
+        if request.method == "POST" and path.startswith("/list/"):
+            name = path[len("/list/") :]
+            listed = sorted(
+                (objects.created_at[key], key[1]) for key in objects if key[0] == name
+            )
+            return httpx.Response(
+                200,
+                json=[
+                    {"id": p, "name": p, "created_at": created.isoformat()}
+                    for created, p in listed
+                ],
+            )
+        if request.method == "GET" and path.startswith("/authenticated/"):
+            key = tuple(path[len("/authenticated/") :].split("/", 1))
+            if key not in objects:
+                return httpx.Response(400, json={"error": "not_found"})
+            return httpx.Response(200, content=objects[key])
+        if request.method == "POST":
+            body = b"".join([chunk async for chunk in request.stream])
+            key = tuple(path[1:].split("/", 1))
+            if key in objects and request.headers["x-upsert"] != "true":
+                return httpx.Response(409, json={"error": "Duplicate"})
+            objects[key] = body
+            objects.content_types[key] = request.headers["content-type"]
+            objects.created_at[key] = datetime.now(timezone.utc)
+            return httpx.Response(200, json={})
+        if request.method == "DELETE":
+            name = path[1:]
+            for p in json.loads(request.content)["prefixes"]:
+                objects.pop((name, p), None)
+            return httpx.Response(200, json={})
+        return httpx.Response(405)
+
+    client = httpx.AsyncClient(
+        base_url=storage_service.STORAGE_URL, transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(storage_service, "_client", client)
+    return objects
+
+
+def client_put(objects, signed, data, content_type="image/png"):
+    """What the browser does with the signed URL."""
+    path = signed.upload_url.split("/upload/sign/", 1)[1].split("?")[0]
+    key = tuple(path.split("/", 1))
+    objects[key] = data
+    objects.content_types[key] = content_type
+    objects.created_at[key] = datetime.now(timezone.utc)
+    return key
+
+
+async def test_meal_image_uploaded_directly_is_validated_and_attached(db, bucket):
+    chef = make_user(db)
+    meal = make_meal(db, chef)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="meal", target_id=meal.id, content_type="image/png"),
+        chef.id,
+        db,
+    )
+    client_put(bucket, signed, png_bytes())
+
+    result = await upload_service.finalize_upload(
+        UploadFinalize(upload_token=signed.upload_token), chef.id, db
+    )
+
+    assert result.image_url.endswith("/original.png")
+    assert set(result.image_variants) == {"thumb", "card", "full"}
+    stored = {path.rsplit("/", 1)[1] for _, path in bucket}
+    assert stored == {"original.png", "thumb.webp", "card.webp", "full.webp"}
+    db.expire_all()
+    assert db.get(MealModel, meal.id).image_url == result.image_url
+
+
+async def test_signed_url_points_into_the_private_staging_bucket(db, bucket):
+    user = make_user(db)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/png"), user.id, db
+    )
+    staged = client_put(bucket, signed, b"<html>not an image</html>", "text/html")
+
+    assert staged[0] == upload_service.config.UPLOAD_STAGING_BUCKET
+    assert staged[0] not in upload_service.BUCKETS.values()
+
+
+async def test_directly_uploaded_original_is_rewritten_without_exif(db, bucket):
+    user = make_user(db)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/jpeg"), user.id, db
+    )
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    exif.get_ifd(0x8825)[2] = (40.0, 48.0, 27.0)  # GPSLatitude
+    out = io.BytesIO()
+    Image.new("RGB", (40, 20), (10, 120, 60)).save(
+        out, format="JPEG", exif=exif.tobytes()
+    )
+    client_put(bucket, signed, out.getvalue(), content_type="text/html")
+
+    result = await upload_service.finalize_upload(
+        UploadFinalize(upload_token=signed.upload_token), user.id, db
+    )
+
+    key = next(k for k in bucket if k[1].endswith("/original.jpg"))
+    assert result.image_url.endswith(key[1])
+    assert bucket.content_types[key] == "image/jpeg"
+    with Image.open(io.BytesIO(bucket[key])) as img:
+        assert img.format == "JPEG"
+        assert not img.getexif()
+
+
+async def test_profile_picture_replaces_and_deletes_the_old_one(db, bucket):
+    user = make_user(db)
+    first = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/png"), user.id, db
+    )
+    client_put(bucket, first, png_bytes())
+    await upload_service.finalize_upload(
+        UploadFinalize(upload_token=first.upload_token), user.id, db
+    )
+    second = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/png"), user.id, db
+    )
+    client_put(bucket, second, png_bytes())
+    result = await upload_service.finalize_upload(
+        UploadFinalize(upload_token=second.upload_token), user.id, db
+    )
+
+    assert len(bucket) == 4  # only the new original + variants remain
+    db.expire_all()
+    assert db.get(UserModel, user.id).profile_picture == result.image_url
+
+
+async def test_mismatched_bytes_are_rejected_and_deleted(db, bucket):
+    user = make_user(db)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/jpeg"), user.id, db
+    )
+    client_put(bucket, signed, png_bytes())  # declared JPEG, sent PNG
+
+    with pytest.raises(HTTPException) as e:
+        await upload_service.finalize_upload(
+            UploadFinalize(upload_token=signed.upload_token), user.id, db
+        )
+    assert "Invalid file type" in e.value.detail
+    assert bucket == {}
+    db.expire_all()
+    assert db.get(UserModel, user.id).profile_picture is None
+
+
+async def test_oversized_object_rejected_from_content_length(db, bucket, monkeypatch):
+    monkeypatch.setattr("utils.uploads.MAX_SIZE_BYTES", 1024)
+    user = make_user(db)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/png"), user.id, db
+    )
+    client_put(bucket, signed, png_bytes() + b"\x00" * 5000)
+
+    with pytest.raises(HTTPException) as e:
+        await upload_service.finalize_upload(
+            UploadFinalize(upload_token=signed.upload_token), user.id, db
+        )
+    assert "exceeds" in e.value.detail
+    assert bucket == {}
+
+
+async def test_cannot_sign_or_finalize_for_someone_elses_record(db, bucket):
+    chef = make_user(db)
+    other = make_user(db, name="Other", stripe_account=None)
+    meal = make_meal(db, chef)
+
+    with pytest.raises(HTTPException) as e:
+        await upload_service.create_signed_upload(
+            SignedUploadCreate(
+                target="meal", target_id=meal.id, content_type="image/png"
+            ),
+            other.id,
+            db,
+        )
+    assert e.value.status_code == 403
+
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="meal", target_id=meal.id, content_type="image/png"),
+        chef.id,
+        db,
+    )
+    with pytest.raises(HTTPException) as e:
+        await upload_service.finalize_upload(
+            UploadFinalize(upload_token=signed.upload_token), other.id, db
+        )
+    assert e.value.status_code == 403
+
+
+async def test_finalize_for_a_deleted_record_deletes_the_staged_upload(db, bucket):
+    chef = make_user(db)
+    meal = make_meal(db, chef)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="meal", target_id=meal.id, content_type="image/png"),
+        chef.id,
+        db,
+    )
+    client_put(bucket, signed, png_bytes())
+    meal.is_deleted = True
+    db.commit()
+
+    with pytest.raises(HTTPException) as e:
+        await upload_service.finalize_upload(
+            UploadFinalize(upload_token=signed.upload_token), chef.id, db
+        )
+    assert e.value.status_code == 404
+    assert bucket == {}
+
+
+async def test_sweeper_deletes_only_staged_uploads_past_the_signed_url_lifetime(
+    db, bucket
+):
+    user = make_user(db)
+    keys = []
+    for _ in range(2):
+        signed = await upload_service.create_signed_upload(
+            SignedUploadCreate(target="profile", content_type="image/png"), user.id, db
+        )
+        keys.append(client_put(bucket, signed, png_bytes()))
+    abandoned, recent = keys
+    bucket.created_at[abandoned] = datetime.now(timezone.utc) - timedelta(hours=3)
+
+    assert await upload_service.sweep_staged_uploads() == 1
+    assert set(bucket) == {recent}
+
+
+async def test_expired_upload_token_rejected(db, bucket, monkeypatch):
+    monkeypatch.setattr(upload_service.config, "UPLOAD_URL_TTL_SECONDS", -1)
+    user = make_user(db)
+    signed = await upload_service.create_signed_upload(
+        SignedUploadCreate(target="profile", content_type="image/png"), user.id, db
+    )
+    client_put(bucket, signed, png_bytes())
+
+    with pytest.raises(HTTPException) as e:
+        await upload_service.finalize_upload(
+            UploadFinalize(upload_token=signed.upload_token), user.id, db
+        )
+    assert e.value.status_code == 400
+    assert bucket == {}
+
+
+def test_upload_token_is_not_an_access_token(db):
+    from utils.password import verify_token
+
+    token = upload_service.jwt.encode(
+        {"typ": upload_service.TOKEN_TYPE, "sub": "u1", "exp": 9999999999},
+        upload_service.SECRET_KEY,
+        algorithm=upload_service.ALGORITHM,
+    )
+    with pytest.raises(HTTPException):
+        verify_token(token)
@@ -0,0 +1,111 @@
+"""Tests for the email outbox: webhook enqueueing and the delivery worker."""
+
+from datetime import datetime, timedelta, timezone
+
+from tests.conftest import make_user, make_meal, make_event
+from tests.test_payments import checkout_event
+
+from routers.gateways.stripe.webhook import handle_checkout_session_completed
+from models.email_outbox import EmailOutboxModel
+from services.email_outbox_service import deliver_due_emails
+from services.gateways import email_service
+
+
+async def test_webhook_queues_emails_without_sending(db, stripe_calls, no_emails):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+
+    await handle_checkout_session_completed(
+        checkout_event("pi_1", event.id, foodie.id), db
+    )
+
+    kinds = {row.kind for row in db.query(EmailOutboxModel)}
+    assert kinds == {"chef_notification", "booking_confirmation"}
+    assert no_emails == []
+
+
+async def test_worker_sends_due_batch(db, stripe_calls, no_emails):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+    await handle_checkout_session_completed(
+        checkout_event("pi_1", event.id, foodie.id), db
+    )
+
+    assert deliver_due_emails(db) == 2
+    assert {p["to"] for p in no_emails} == {host.email, foodie.email}
+    assert all(row.status == "sent" for row in db.query(EmailOutboxModel))
+    # Nothing left to do
+    assert deliver_due_emails(db) == 0
+
+
+def test_worker_backs_off_then_gives_up(db, monkeypatch):
+    monkeypatch.setattr("utils.config.config.EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    email_service.enqueue(
+        db, "chef_notification", email_service.chef_notification_params("a@b.c", "X")
+    )
+    db.commit()
+
+    def failing_send(params, idempotency_key):
+        raise RuntimeError("resend down")
+
+    assert deliver_due_emails(db, send=failing_send) == 1
+    row = db.query(EmailOutboxModel).one()
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert row.last_error == "resend down"
+    # Backed off: not due again yet
+    assert deliver_due_emails(db, send=failing_send) == 0
+
+    row.next_attempt_at = datetime.now(timezone.utc)
+    db.commit()
+    assert deliver_due_emails(db, send=failing_send) == 1
+    db.refresh(row)
+    assert row.status == "failed"
+    assert row.attempts == 2
+
+
+def test_rows_are_sent_outside_the_claim_and_keyed_by_id(db):
+    for to in ("a@b.c", "d@e.f"):
+        email_service.enqueue(
+            db, "chef_notification", email_service.chef_notification_params(to, "X")
+        )
+    db.commit()
+    ids = {row.id for row in db.query(EmailOutboxModel)}
+    seen = []
+
+    def send(params, idempotency_key):
+        # Already claimed and committed: another worker would skip it
+        assert not db.in_transaction()
+        seen.append(idempotency_key)
+        if params["to"] == "d@e.f":
+            raise RuntimeError("bounced")
+
+    assert deliver_due_emails(db, send=send) == 2
+    assert set(seen) == ids
+    statuses = {
+        row.params.count("a@b.c"): row.status for row in db.query(EmailOutboxModel)
+    }
+    assert statuses == {1: "sent", 0: "pending"}
+
+
+def test_expired_lease_is_claimed_again_with_the_same_key(db):
+    email_service.enqueue(
+        db, "chef_notification", email_service.chef_notification_params("a@b.c", "X")
+    )
+    db.commit()
+    row = db.query(EmailOutboxModel).one()
+
+    # A worker claimed it and died before recording the outcome
+    row.status = "sending"
+    row.attempts = 1
+    row.next_attempt_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    db.commit()
+    assert deliver_due_emails(db, send=lambda params, key: None) == 0
+
+    row.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+    keys = []
+    assert deliver_due_emails(db, send=lambda params, key: keys.append(key)) == 1
+    assert keys == [row.id]
+    db.refresh(row)
+    assert (row.status, row.attempts) == ("sent", 2)
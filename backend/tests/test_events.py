@@ -0,0 +1,213 @@
+"""Tests for the public event feed and event detail reads."""
+
+import pytest
+from fastapi import HTTPException, Request
+
+from tests.conftest import make_user, make_meal, make_event
+
+import services.event_service as event_service
+
+
+async def test_list_events_upcoming_only_in_date_order(db, async_db):
+    host = make_user(db)
+    meal = make_meal(db, host)
+    later = make_event(db, host, meal, days_ahead=10)
+    sooner = make_event(db, host, meal, days_ahead=2)
+    make_event(db, host, meal, days_ahead=-3)
+
+    events = await event_service.list_events(async_db)
+    assert [e.id for e in events] == [sooner.id, later.id]
+    assert events[0].meal_name == "Feijoada"
+
+
+async def test_list_events_skips_deleted(db, async_db):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host))
+    event.is_deleted = True
+    db.commit()
+
+    assert await event_service.list_events(async_db) == []
+
+
+async def test_get_event_details_includes_meal(db, async_db):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host))
+
+    details = await event_service.get_event_details(event.id, async_db)
+    assert details.id == event.id
+    assert details.meal_name == "Feijoada"
+
+
+async def test_get_event_details_missing_is_404(db, async_db):
+    with pytest.raises(HTTPException) as e:
+        await event_service.get_event_details(
+            "00000000-0000-0000-0000-000000000000", async_db
+        )
+    assert e.value.status_code == 404
+
+
+# ---------- keyset feed ----------
+
+
+async def test_feed_pages_through_all_events_without_repeats(db, async_db):
+    host = make_user(db)
+    meal = make_meal(db, host)
+    events = [make_event(db, host, meal, days_ahead=d) for d in (1, 2, 2, 3, 4)]
+    # Force a tie on event_date so the id tie-breaker is exercised
+    events[2].event_date = events[1].event_date
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = await event_service.list_events_page(async_db, limit=2, cursor=cursor)
+        seen.extend(e.id for e in page.events)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == 5
+    assert set(seen) == {e.id for e in events}
+
+
+async def test_feed_last_page_has_no_cursor(db, async_db):
+    host = make_user(db)
+    make_event(db, host, make_meal(db, host))
+
+    page = await event_service.list_events_page(async_db, limit=5)
+    assert len(page.events) == 1
+    assert page.next_cursor is None
+
+
+async def test_feed_rejects_garbage_cursor(db, async_db):
+    with pytest.raises(HTTPException) as e:
+        await event_service.list_events_page(async_db, cursor="not-a-cursor")
+    assert e.value.status_code == 400
+
+
+# ---------- aggregated event detail ----------
+
+
+async def test_event_detail_bundles_meal_host_rating_and_seats(db, async_db):
+    from tests.conftest import make_participation
+    from models.user_rating_aggregate import UserRatingAggregateModel
+
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host), max_participants=4)
+    for i, status in enumerate(("booked", "confirmed", "cancelled")):
+        make_participation(
+            db, event, make_user(db, name=f"F{i}"), status=status, payment_intent=None
+        )
+    db.add(
+        UserRatingAggregateModel(
+            user_id=host.id,
+            host_review_count=2,
+            host_food_sum=10,
+            host_space_sum=8,
+            host_host_sum=9,
+        )
+    )
+    db.commit()
+
+    detail = await event_service.get_event_detail(event.id, async_db)
+    assert detail.event.id == event.id
+    assert detail.meal.title == "Feijoada"
+    assert detail.host.id == host.id
+    assert detail.host_rating.review_count == 2
+    assert detail.host_rating.average_food == 5.0
+    assert detail.active_seats == 2
+
+
+async def test_event_detail_missing_is_404(db, async_db):
+    with pytest.raises(HTTPException) as e:
+        await event_service.get_event_detail(
+            "00000000-0000-0000-0000-000000000000", async_db
+        )
+    assert e.value.status_code == 404
+
+
+async def test_campus_feed_only_returns_that_campus(db, async_db):
+    columbia = make_user(db)
+    nyu = make_user(db, name="Other Host")
+    for host, campus in ((columbia, "columbia university"), (nyu, "nyu")):
+        event = make_event(db, host, make_meal(db, host))
+        event.campus = campus
+    db.commit()
+
+    page = await event_service.list_events_page(async_db, campus="nyu")
+    assert [e.host_user_id for e in page.events] == [nyu.id]
+    assert page.campus == "nyu"
+    everything = await event_service.list_events_page(async_db)
+    assert len(everything.events) == 2 and everything.campus is None
+
+
+async def test_new_event_takes_the_hosts_normalized_campus(db):
+    from models.event import EventModel
+    from schemas.event import EventCreate
+
+    host = make_user(db)
+    host.university = "  Columbia   University "
+    db.commit()
+    event = await event_service.create_event(
+        EventCreate(
+            title="Dumplings",
+            description="Pleated by hand",
+            max_participants=6,
+            location="Dorm 4B",
+            event_date="2030-01-01T19:00:00Z",
+            price=800,
+            currency="usd",
+        ),
+        host.id,
+        db,
+    )
+    assert db.get(EventModel, event.id).campus == "columbia university"
+
+
+async def test_signed_in_feed_defaults_to_the_viewers_campus(db, async_db):
+    from routers.events import _feed_campus
+
+    viewer = make_user(db)
+    viewer.university = "NYU"
+    db.commit()
+
+    async def private(campus, all_campuses, viewer_id):
+        request = Request({"type": "http"})
+        scoped = await _feed_campus(request, campus, all_campuses, viewer_id, async_db)
+        return scoped, getattr(request.state, "http_cache_private", False)
+
+    # Only the campus taken from the token makes the listing private
+    assert await private(None, False, viewer.id) == ("nyu", True)
+    assert await private(None, True, viewer.id) == (None, False)  # all_campuses
+    assert await private(None, False, None) == (None, False)  # anonymous
+    assert await private(" Columbia  University", False, viewer.id) == (
+        "columbia university",
+        False,
+    )
+
+
+async def test_list_events_by_host_runs_on_the_async_session(db, async_db):
+    from routers.events import list_events_endpoint
+
+    host, other = make_user(db), make_user(db, name="Other")
+    mine = make_event(db, host, make_meal(db, host))
+    make_event(db, other, make_meal(db, other))
+
+    events = await list_events_endpoint(
+        Request({"type": "http"}), user_id=host.id, db=async_db
+    )
+    assert [e.id for e in events] == [mine.id]
+
+
+async def test_sync_and_async_card_loaders_share_one_cache_entry(db, async_db):
+    from services import user_service
+
+    viewer = make_user(db)
+    viewer.university = "NYU"
+    db.commit()
+
+    card = await user_service.get_public_user_card(viewer.id, db)
+    # Served from the entry the sync loader cached, not a fresh read
+    viewer.university = "Columbia"
+    db.commit()
+    assert await user_service.get_user_campus(viewer.id, async_db) == "nyu"
+    assert await user_service.get_public_user_card(viewer.id, db) == card
@@ -0,0 +1,164 @@
+"""Tests for event geocoding and the `near` (radius) feed mode."""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from models.event import EventModel
+from schemas.event import EventCreate, EventUpdate
+from services import event_service
+from services.gateways import geocoding_service
+from tests.conftest import make_event, make_meal, make_user
+from utils.geo import parse_near, within_radius
+
+# Around a campus quad: ~0.5 km, ~1.5 km and ~8 km north of it
+QUAD = (40.8075, -73.9626)
+NORTH_OFFSETS_KM = {"Close": 0.5, "Walkable": 1.5, "Far": 8.0}
+
+
+def seed(db):
+    host = make_user(db)
+    meal = make_meal(db, host)
+    for title, km in NORTH_OFFSETS_KM.items():
+        event = make_event(db, host, meal)
+        event.title = title
+        event.latitude = QUAD[0] + km / 110.574
+        event.longitude = QUAD[1]
+    make_event(db, host, meal).title = "Unplaced"  # no coordinates
+    db.commit()
+    return host, meal
+
+
+async def test_near_feed_is_nearest_first_within_radius(db, async_db):
+    seed(db)
+    page = await event_service.list_events_near(async_db, *QUAD, radius_km=2)
+
+    assert [event.title for event in page.events] == ["Close", "Walkable"]
+    assert page.events[0].distance_km == pytest.approx(0.5, abs=0.01)
+    assert page.events[1].distance_km == pytest.approx(1.5, abs=0.01)
+    assert page.next_cursor is None
+
+
+async def test_near_feed_pages_by_distance(db, async_db):
+    seed(db)
+    first = await event_service.list_events_near(async_db, *QUAD, radius_km=10, limit=2)
+    second = await event_service.list_events_near(
+        async_db, *QUAD, radius_km=10, limit=2, cursor=first.next_cursor
+    )
+    assert [e.title for e in first.events + second.events] == [
+        "Close",
+        "Walkable",
+        "Far",
+    ]
+    assert second.next_cursor is None
+
+
+async def test_feed_cursor_is_not_a_near_cursor(db, async_db):
+    seed(db)
+    page = await event_service.list_events_page(async_db, limit=1)
+    with pytest.raises(HTTPException) as e:
+        await event_service.list_events_near(
+            async_db, *QUAD, radius_km=2, cursor=page.next_cursor
+        )
+    assert e.value.status_code == 400
+
+
+def test_parse_near_rejects_garbage():
+    assert parse_near("40.8,-73.9") == (40.8, -73.9)
+    for bad in ("40.8", "north,south", "91,0"):
+        with pytest.raises(HTTPException):
+            parse_near(bad)
+
+
+def test_postgres_uses_the_gist_point_index():
+    where, _ = within_radius(
+        "postgresql", *QUAD, 2, EventModel.latitude, EventModel.longitude
+    )
+    sql = str(
+        select(EventModel.id)
+        .where(where)
+        .compile(dialect=postgresql.dialect(paramstyle="named"))
+    )
+    assert "point(events.longitude, events.latitude) <@ box(" in sql
+    assert "events.latitude IS NOT NULL" in sql
+
+
+@pytest.fixture()
+def stub_places(monkeypatch):
+    monkeypatch.setattr(
+        geocoding_service,
+        "geocoder",
+        geocoding_service.StubGeocoder({"Dorm 4B": QUAD, "Library": (40.81, -73.96)}),
+    )
+
+
+async def test_events_are_geocoded_on_create_and_relocation(db, stub_places):
+    host = make_user(db)
+    event = await event_service.create_event(
+        EventCreate(
+            title="Arepas",
+            description="Corn cakes",
+            max_participants=4,
+            location="Common room, dorm 4b",
+            event_date="2030-01-01T19:00:00Z",
+            price=1000,
+            currency="usd",
+        ),
+        host.id,
+        db,
+    )
+    assert (event.latitude, event.longitude) == QUAD
+
+    moved = await event_service.update_event(
+        event.id, EventUpdate(location="40.75, -73.99"), host.id, db
+    )
+    assert (moved.latitude, moved.longitude) == (40.75, -73.99)
+
+    unknown = await event_service.update_event(
+        event.id, EventUpdate(location="Somewhere new"), host.id, db
+    )
+    assert unknown.latitude is None and unknown.longitude is None
+
+
+async def test_unplaced_event_is_geocoded_when_resaved_unchanged(db, stub_places):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host))  # Dorm 4B, no coordinates
+
+    resaved = await event_service.update_event(
+        event.id, EventUpdate(location="Dorm 4B"), host.id, db
+    )
+    assert (resaved.latitude, resaved.longitude) == QUAD
+
+
+async def test_backfill_places_only_events_without_coordinates(db, stub_places):
+    host = make_user(db)
+    meal = make_meal(db, host)
+    unplaced, placed, unknown, deleted = (make_event(db, host, meal) for _ in range(4))
+    placed.latitude, placed.longitude = (1.0, 2.0)
+    unknown.location = "Nowhere"
+    deleted.is_deleted = True
+    db.commit()
+
+    assert await event_service.backfill_event_coordinates(db) == 1
+    db.expire_all()
+    assert (unplaced.latitude, unplaced.longitude) == QUAD
+    assert (placed.latitude, placed.longitude) == (1.0, 2.0)
+    assert unknown.latitude is None and deleted.latitude is None
+
+
+async def test_geocoder_failure_is_not_fatal_or_cached(monkeypatch):
+    calls = []
+
+    class Flaky:
+        async def geocode(self, address):
+            calls.append(address)
+            if len(calls) == 1:
+                raise RuntimeError("timeout")
+            return QUAD
+
+    monkeypatch.setattr(geocoding_service, "geocoder", Flaky())
+    assert await geocoding_service.geocode("Dorm 4B") is None
+    assert await geocoding_service.geocode("Dorm 4B") == QUAD
+    assert await geocoding_service.geocode("dorm 4b") == QUAD  # cached
+    assert len(calls) == 2
@@ -0,0 +1,90 @@
+"""Tests for ETag / 304 / Cache-Control handling on @cacheable endpoints."""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import utils.http_cache as http_cache
+from utils.http_cache import HTTPCacheMiddleware, cacheable, mark_private
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(HTTPCacheMiddleware)
+
+    @app.get("/public")
+    @cacheable(max_age=30, s_maxage=60, tags=("events",))
+    async def public():
+        return {"events": [1, 2, 3]}
+
+    @app.get("/private")
+    async def private():
+        return {"me": "secret"}
+
+    @app.get("/feed")
+    @cacheable(max_age=30, s_maxage=60, tags=("events",), vary=("Authorization",))
+    async def feed(request: Request, mine: bool = False):
+        if mine:
+            mark_private(request)
+        return {"events": [1]}
+
+    return TestClient(app)
+
+
+def test_cacheable_endpoint_gets_etag_and_cache_control():
+    resp = make_client().get("/public")
+    assert resp.status_code == 200
+    assert resp.json() == {"events": [1, 2, 3]}
+    assert resp.headers["etag"].startswith('W/"')
+    assert resp.headers["cache-control"] == "public, max-age=30, s-maxage=60"
+    assert resp.headers["cache-tag"] == "events"
+
+
+def test_marked_private_response_stays_out_of_shared_caches():
+    client = make_client()
+    mine = client.get("/feed", params={"mine": True})
+    assert mine.headers["cache-control"] == "private, max-age=30"
+    assert mine.headers["etag"].startswith('W/"')
+
+    shared = client.get("/feed")
+    assert shared.headers["cache-control"] == "public, max-age=30, s-maxage=60"
+    assert shared.headers["vary"] == "Authorization"
+
+
+def test_matching_if_none_match_returns_304():
+    client = make_client()
+    etag = client.get("/public").headers["etag"]
+
+    resp = client.get("/public", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    stale = client.get("/public", headers={"If-None-Match": 'W/"other"'})
+    assert stale.status_code == 200
+
+
+def test_unmarked_endpoint_is_untouched():
+    resp = make_client().get("/private")
+    assert "etag" not in resp.headers
+    assert "cache-control" not in resp.headers
+
+
+def test_invalidate_notifies_purgers(monkeypatch):
+    purged = []
+    monkeypatch.setattr(http_cache, "_purgers", [purged.append])
+    http_cache.invalidate("events", "meals")
+    assert purged == [("events", "meals")]
+
+
+def test_vary_is_merged_with_existing_vary():
+    app = FastAPI()
+    app.add_middleware(HTTPCacheMiddleware)
+
+    @app.get("/mine")
+    @cacheable(max_age=30, vary=("Authorization",))
+    async def mine():
+        return JSONResponse({"ok": True}, headers={"Vary": "Origin"})
+
+    resp = TestClient(app).get("/mine")
+    assert resp.headers["vary"] == "Origin, Authorization"
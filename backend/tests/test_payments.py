@@ -2,6 +2,7 @@
 cancellation/refund policy, and host accept (capture)."""
 
 import pytest
+from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
 
 from tests.conftest import make_user, make_meal, make_event, make_participation
@@ -11,6 +12,8 @@ from routers.gateways.stripe.webhook import (
     handle_checkout_session_completed,
     handle_payment_intent_canceled,
 )
+from routers.gateways.stripe.connect_webhook import handle_account_updated
+from services.seat_service import release_seat, reserve_seat
 from models.event_participant import EventParticipantModel
 
 
@@ -64,6 +67,87 @@ async def test_checkout_rejects_past_event(db, stripe_calls):
     assert "past" in e.value.detail.lower()
 
 
+async def test_checkout_uses_fresh_cached_account_status(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    host.stripe_charges_enabled = True
+    host.stripe_status_synced_at = datetime.now(timezone.utc)
+    db.commit()
+    event = make_event(db, host, make_meal(db, host))
+
+    await event_service.validate_checkout_requirements(event.id, foodie.id, db)
+    assert stripe_calls["accounts"] == []
+
+
+async def test_checkout_refreshes_stale_account_status(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    host.stripe_charges_enabled = True
+    host.stripe_status_synced_at = datetime.now(timezone.utc) - timedelta(days=2)
+    db.commit()
+    event = make_event(db, host, make_meal(db, host))
+
+    await event_service.validate_checkout_requirements(event.id, foodie.id, db)
+    assert stripe_calls["accounts"] == ["acct_123"]
+    # The live answer is cached, so the next checkout skips Stripe
+    await event_service.validate_checkout_requirements(event.id, foodie.id, db)
+    assert stripe_calls["accounts"] == ["acct_123"]
+
+
+async def test_account_updated_webhook_stores_capabilities(db):
+    host = make_user(db, stripe_account="acct_hook")
+    await handle_account_updated(
+        {
+            "data": {
+                "object": {
+                    "id": "acct_hook",
+                    "details_submitted": True,
+                    "charges_enabled": True,
+                    "payouts_enabled": False,
+                }
+            }
+        },
+        db,
+    )
+    db.refresh(host)
+    assert host.stripe_charges_enabled is True
+    assert host.stripe_payouts_enabled is False
+    assert host.stripe_status_synced_at is not None
+
+
+# ---------- seat counter ----------
+
+
+def test_reserve_seat_stops_at_capacity(db):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host), max_participants=2)
+    assert event.current_participants == 0
+    assert reserve_seat(event.id, db) is True
+    assert event.current_participants == 1  # loaded instance sees the UPDATE
+    assert reserve_seat(event.id, db) is True
+    assert reserve_seat(event.id, db) is False
+    db.commit()
+    db.refresh(event)
+    assert event.current_participants == 2
+
+
+def test_reserve_seat_refuses_deleted_event(db):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host))
+    event.is_deleted = True
+    db.commit()
+    assert reserve_seat(event.id, db) is False
+
+
+def test_release_seat_never_goes_negative(db):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host))
+    reserve_seat(event.id, db)
+    release_seat(event.id, db)
+    release_seat(event.id, db)
+    db.commit()
+    db.refresh(event)
+    assert event.current_participants == 0
+
+
 # ---------- webhook: checkout.session.completed ----------
 
 
@@ -103,8 +187,10 @@ async def test_webhook_full_event_cancels_payment(db, stripe_calls):
     )
     assert "full" in resp.message.lower()
     assert stripe_calls["cancelled"] == ["pi_late"]
-    # No second participation row was created
+    # No second participation row was created, and no seat was taken
     assert db.query(EventParticipantModel).count() == 1
+    db.refresh(event)
+    assert event.current_participants == 1
 
 
 async def test_webhook_missing_event_raises_500(db, stripe_calls):
@@ -121,8 +207,6 @@ async def test_webhook_payment_canceled_releases_booked_seat(db, stripe_calls):
     host, foodie = make_user(db), make_user(db, name="Foodie")
     event = make_event(db, host, make_meal(db, host))
     make_participation(db, event, foodie, status="booked", payment_intent="pi_exp")
-    event.current_participants = 1
-    db.commit()
     await handle_payment_intent_canceled(
         {"data": {"object": {"id": "pi_exp"}}}, db
     )
@@ -139,8 +223,6 @@ async def test_foodie_can_cancel_free_while_booked(db, stripe_calls):
     host, foodie = make_user(db), make_user(db, name="Foodie")
     event = make_event(db, host, make_meal(db, host))
     make_participation(db, event, foodie, status="booked", payment_intent="pi_b")
-    event.current_participants = 1
-    db.commit()
 
     resp = await event_service.refund_event_participation(event.id, foodie.id, db)
     assert "cancelled" in resp.message.lower()
@@ -181,6 +263,47 @@ async def test_host_cancel_refunds_confirmed_and_voids_booked(db, stripe_calls):
     assert event.is_deleted is True
 
 
+async def test_host_cancel_reports_per_participant_outcomes(db, stripe_calls):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host), max_participants=3)
+    f1, f2 = make_user(db, name="F1"), make_user(db, name="F2")
+    p1 = make_participation(db, event, f1, status="confirmed", payment_intent="pi_c")
+    p2 = make_participation(db, event, f2, status="booked", payment_intent="pi_b")
+
+    result = await event_service.soft_delete_event(event.id, host.id, db)
+    outcomes = {r["participant_id"]: r["outcome"] for r in result["refunds"]}
+    assert outcomes == {f1.id: "refunded", f2.id: "voided"}
+    assert set(stripe_calls["idempotency_keys"]) == {
+        f"event-cancel-{p1.id}-confirmed",
+        f"event-cancel-{p2.id}-booked",
+    }
+
+
+async def test_host_cancel_partial_failure_keeps_event(db, stripe_calls, monkeypatch):
+    from stripe import APIConnectionError
+
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host), max_participants=3)
+    f1, f2 = make_user(db, name="F1"), make_user(db, name="F2")
+    make_participation(db, event, f1, status="confirmed", payment_intent="pi_c")
+    make_participation(db, event, f2, status="booked", payment_intent="pi_b")
+
+    async def failing_refund(pi, amount_cents=None, idempotency_key=None):
+        raise APIConnectionError("network down")
+
+    monkeypatch.setattr(event_service, "create_refund", failing_refund)
+    with pytest.raises(HTTPException) as e:
+        await event_service.soft_delete_event(event.id, host.id, db)
+    assert e.value.status_code == 500
+
+    statuses = {
+        p.participant_id: p.status for p in db.query(EventParticipantModel).all()
+    }
+    assert statuses == {f1.id: "confirmed", f2.id: "cancelled"}
+    db.refresh(event)
+    assert event.is_deleted is False
+
+
 async def test_only_host_can_delete_event(db, stripe_calls):
     host, other = make_user(db), make_user(db, name="Other")
     event = make_event(db, host, make_meal(db, host))
@@ -0,0 +1,145 @@
+"""Tests for the rating system: pending-review gates and rating aggregates."""
+
+import uuid
+
+from sqlalchemy import event as sa_event
+
+from tests.conftest import make_user, make_meal, make_event, make_participation
+
+import services.review_service as review_service
+from models.guest_review import GuestReviewModel
+from schemas.review import EventReviewCreate, GuestReviewCreate
+from services.rating_aggregate_service import rebuild_rating_aggregates
+
+
+def rate_guest(db, event, host, guest):
+    db.add(
+        GuestReviewModel(
+            id=str(uuid.uuid4()),
+            event_id=event.id,
+            host_id=host.id,
+            guest_id=guest.id,
+            sociability_stars=5,
+            etiquette_stars=4,
+        )
+    )
+    db.commit()
+
+
+def count_queries(db):
+    """Attach a SELECT counter to the session's engine; returns the live list."""
+    statements = []
+
+    @sa_event.listens_for(db.get_bind(), "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+def host_past_events(db, host, guests, n_events):
+    meal = make_meal(db, host)
+    events = []
+    for i in range(n_events):
+        event = make_event(db, host, meal, days_ahead=-(i + 1))
+        for guest in guests:
+            make_participation(
+                db,
+                event,
+                guest,
+                status="confirmed",
+                payment_intent=f"pi_{uuid.uuid4()}",
+            )
+        events.append(event)
+    return events
+
+
+async def test_pending_guest_reviews_lists_only_unrated_guests(db):
+    host = make_user(db)
+    g1, g2 = make_user(db, name="G1"), make_user(db, name="G2")
+    older, newer = reversed(host_past_events(db, host, [g1, g2], 2))
+    rate_guest(db, newer, host, g1)
+    rate_guest(db, older, host, g1)
+    rate_guest(db, older, host, g2)
+
+    pending = await review_service.get_pending_reviews(host.id, db)
+    assert [p.event_id for p in pending.pending_guest_reviews] == [newer.id]
+    assert [g.id for g in pending.pending_guest_reviews[0].unrated_guests] == [g2.id]
+
+
+async def test_pending_event_reviews_for_attended_events(db):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = host_past_events(db, host, [foodie], 1)[0]
+
+    pending = await review_service.get_pending_reviews(foodie.id, db)
+    assert [p.event_id for p in pending.pending_event_reviews] == [event.id]
+    assert pending.pending_event_reviews[0].host_name == host.name
+
+
+async def test_pending_reviews_query_count_is_constant(db):
+    guests = [make_user(db, name=f"G{i}") for i in range(3)]
+
+    few_host = make_user(db)
+    host_past_events(db, few_host, guests, 1)
+    statements = count_queries(db)
+    await review_service.get_pending_reviews(few_host.id, db)
+    few = len(statements)
+
+    many_host = make_user(db)
+    host_past_events(db, many_host, guests, 8)
+    statements.clear()
+    pending = await review_service.get_pending_reviews(many_host.id, db)
+
+    assert len(pending.pending_guest_reviews) == 8
+    assert len(statements) == few
+
+
+# ---------- rating aggregates ----------
+
+
+async def test_reviews_update_rating_aggregates(db, async_db):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = host_past_events(db, host, [foodie], 1)[0]
+
+    await review_service.create_event_review(
+        event.id,
+        EventReviewCreate(food_stars=5, space_stars=4, host_stars=5),
+        foodie.id,
+        db,
+    )
+    await review_service.create_guest_review(
+        event.id,
+        GuestReviewCreate(guest_id=foodie.id, sociability_stars=4, etiquette_stars=5),
+        host.id,
+        db,
+    )
+
+    host_rating = await review_service.get_host_rating_summary(host.id, async_db)
+    assert host_rating.review_count == 1
+    assert host_rating.average_total == 14.0
+    assert host_rating.average_space == 4.0
+
+    guest_rating = await review_service.get_guest_rating_summary(foodie.id, db)
+    assert guest_rating.review_count == 1
+    assert guest_rating.average_total == 9.0
+
+
+async def test_unreviewed_user_has_empty_summary(db, async_db):
+    user = make_user(db)
+    rating = await review_service.get_host_rating_summary(user.id, async_db)
+    assert rating.review_count == 0
+    assert rating.average_total is None
+
+
+async def test_rebuild_rating_aggregates_matches_reviews(db):
+    host = make_user(db)
+    guests = [make_user(db, name=f"G{i}") for i in range(2)]
+    event = host_past_events(db, host, guests, 1)[0]
+    for guest in guests:
+        rate_guest(db, event, host, guest)  # bypasses the incremental path
+
+    assert rebuild_rating_aggregates(db) == 2
+    rating = await review_service.get_guest_rating_summary(guests[0].id, db)
+    assert rating.review_count == 1
+    assert rating.average_sociability == 5.0
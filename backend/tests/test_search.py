@@ -0,0 +1,109 @@
+"""Tests for event/meal search (SQLite fallback; Postgres SQL is compiled only)."""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from models.event import EventModel
+from models.meal import MealModel
+from services import event_service, meal_service
+from tests.conftest import make_event, make_meal, make_user
+from utils.search import match_and_rank
+
+
+def seed_events(db):
+    host = make_user(db)
+    meal = make_meal(db, host)
+    titled = {}
+    for title, location, days in [
+        ("Taco Tuesday", "Dorm 4B", 3),
+        ("Feijoada Night", "Taco Hall", 4),
+        ("Pasta Party", "Dorm 2A", 5),
+        ("Late Taco Run", "Quad", 6),
+    ]:
+        event = make_event(db, host, meal, days_ahead=days)
+        event.title, event.location = title, location
+        titled[title] = event
+    db.commit()
+    return titled
+
+
+async def test_title_matches_rank_above_location_matches(db, async_db):
+    seed_events(db)
+    page = await event_service.search_events("taco", async_db)
+
+    titles = [event.title for event in page.events]
+    assert set(titles) == {"Taco Tuesday", "Late Taco Run", "Feijoada Night"}
+    assert titles[-1] == "Feijoada Night"  # matched on location only
+    assert page.next_cursor is None
+
+
+async def test_every_word_must_match(db, async_db):
+    seed_events(db)
+    page = await event_service.search_events("taco tuesday", async_db)
+    assert [event.title for event in page.events] == ["Taco Tuesday"]
+
+
+async def test_search_pages_with_keyset_cursor(db, async_db):
+    seed_events(db)
+    seen = []
+    cursor = None
+    while True:
+        page = await event_service.search_events(
+            "taco", async_db, limit=1, cursor=cursor
+        )
+        seen += [event.title for event in page.events]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    full = await event_service.search_events("taco", async_db)
+    assert seen == [event.title for event in full.events]
+
+
+async def test_deleted_and_past_events_are_not_found(db, async_db):
+    titled = seed_events(db)
+    titled["Taco Tuesday"].is_deleted = True
+    past = titled["Late Taco Run"]
+    past.event_date = past.event_date.replace(year=2020)
+    db.commit()
+
+    page = await event_service.search_events("taco", async_db)
+    assert [event.title for event in page.events] == ["Feijoada Night"]
+
+
+async def test_meal_search_covers_ingredients(db, async_db):
+    chef = make_user(db)
+    stew = make_meal(db, chef)  # "Feijoada", ingredients "beans, pork"
+    other = make_meal(db, chef)
+    other.title, other.ingredients = "Beans & Rice", "beans, rice"
+    db.commit()
+
+    page = await meal_service.search_meals("beans", async_db)
+    ids = [meal.id for meal in page.meals]
+    assert ids[0] == other.id  # title + ingredients beat ingredients only
+    assert set(ids) == {stew.id, other.id}
+
+
+async def test_bad_cursor_rejected(db, async_db):
+    with pytest.raises(HTTPException) as e:
+        await event_service.search_events("taco", async_db, cursor="nope")
+    assert e.value.status_code == 400
+
+
+def test_postgres_query_uses_search_vector_and_trigrams():
+    where, rank = match_and_rank(
+        "postgresql",
+        "lazagna",
+        "meals",
+        (MealModel.title, MealModel.description, MealModel.ingredients),
+        MealModel.title,
+    )
+    sql = str(
+        select(MealModel.id, rank)
+        .where(where)
+        .compile(dialect=postgresql.dialect(paramstyle="named"))
+    )
+    assert "meals.search_vector @@ websearch_to_tsquery" in sql
+    assert "<% meals.title" in sql
+    assert "ts_rank_cd(meals.search_vector" in sql
@@ -0,0 +1,211 @@
+"""Tests for seat holds: taken when checkout opens, consumed by the booking
+webhook, released on checkout expiry or by the sweeper."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+
+from tests.conftest import make_user, make_meal, make_event
+from tests.test_payments import checkout_event
+
+import routers.events as events_router
+import services.event_service as event_service
+from routers.gateways.stripe.webhook import (
+    handle_checkout_session_completed,
+    handle_checkout_session_expired,
+)
+from models.event_participant import EventParticipantModel
+from models.seat_hold import SeatHoldModel
+from services.seat_service import hold_seat, release_expired_holds
+
+
+def expired_event(session_id, event_id, foodie_id):
+    return {
+        "data": {
+            "object": {
+                "id": session_id,
+                "metadata": {"event_id": event_id, "foodie_id": foodie_id},
+            }
+        }
+    }
+
+
+@pytest.fixture()
+def stripe_checkout(monkeypatch, stripe_calls):
+    """Stub Checkout Session creation; records the expires_at it was given."""
+    sessions = []
+
+    async def fake_create(**kwargs):
+        sessions.append(kwargs)
+        return {"id": f"cs_{len(sessions)}", "client_secret": "secret"}
+
+    monkeypatch.setattr(
+        events_router.stripe_service, "create_checkout_session", fake_create
+    )
+    return sessions
+
+
+async def test_checkout_holds_the_last_seat(db, stripe_checkout):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host), max_participants=1)
+    first, second = make_user(db, name="F1"), make_user(db, name="F2")
+
+    await events_router.create_checkout_session_endpoint(event.id, first.id, db)
+    db.refresh(event)
+    assert event.current_participants == 1
+    hold = db.query(SeatHoldModel).one()
+    assert hold.checkout_session_id == "cs_1"
+
+    with pytest.raises(HTTPException) as e:
+        await events_router.create_checkout_session_endpoint(event.id, second.id, db)
+    assert "full" in e.value.detail.lower()
+    assert len(stripe_checkout) == 1  # no session opened for the loser
+
+
+async def test_checkout_expiry_clears_stripes_30_minute_minimum(db, stripe_checkout):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+
+    called_at = datetime.now(timezone.utc)
+    await events_router.create_checkout_session_endpoint(event.id, foodie.id, db)
+
+    expires_at = stripe_checkout[0]["expires_at"]
+    assert (expires_at - called_at).total_seconds() >= 1800
+    hold = db.query(SeatHoldModel).one()
+    assert hold.expires_at.replace(tzinfo=timezone.utc) == expires_at
+
+
+async def test_reopening_checkout_keeps_the_same_seat(db, stripe_checkout):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host), max_participants=1)
+
+    await events_router.create_checkout_session_endpoint(event.id, foodie.id, db)
+    await events_router.create_checkout_session_endpoint(event.id, foodie.id, db)
+
+    db.refresh(event)
+    assert event.current_participants == 1
+    assert db.query(SeatHoldModel).one().checkout_session_id == "cs_2"
+
+
+async def test_old_session_expiring_mid_reopen_keeps_the_hold(db, stripe_checkout):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host), max_participants=1)
+    await events_router.create_checkout_session_endpoint(event.id, foodie.id, db)
+
+    # Reopening: hold extended, new session not attached yet, and cs_1's
+    # checkout.session.expired arrives in between
+    hold, created = hold_seat(event.id, foodie.id, db)
+    assert not created and hold.checkout_session_id is None
+    resp = await handle_checkout_session_expired(
+        expired_event("cs_1", event.id, foodie.id), db
+    )
+
+    assert "no seat hold" in resp.message.lower()
+    assert db.query(SeatHoldModel).count() == 1
+    db.refresh(event)
+    assert event.current_participants == 1
+
+
+async def test_failed_session_creation_gives_the_seat_back(
+    db, stripe_calls, monkeypatch
+):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+
+    async def broken(**kwargs):
+        raise HTTPException(status_code=400, detail="Stripe API error")
+
+    monkeypatch.setattr(events_router.stripe_service, "create_checkout_session", broken)
+    with pytest.raises(HTTPException):
+        await events_router.create_checkout_session_endpoint(event.id, foodie.id, db)
+
+    db.refresh(event)
+    assert event.current_participants == 0
+    assert db.query(SeatHoldModel).count() == 0
+
+
+async def test_booking_consumes_the_hold_without_a_second_seat(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host), max_participants=1)
+    hold_seat(event.id, foodie.id, db)
+
+    resp = await handle_checkout_session_completed(
+        checkout_event("pi_1", event.id, foodie.id), db
+    )
+    assert "created" in resp.message.lower()
+    assert db.query(SeatHoldModel).count() == 0
+    assert db.query(EventParticipantModel).one().status == "booked"
+    db.refresh(event)
+    assert event.current_participants == 1
+    assert stripe_calls["cancelled"] == []
+
+
+async def test_holder_can_pass_validation_on_a_full_event(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host), max_participants=1)
+    hold_seat(event.id, foodie.id, db)
+
+    await event_service.validate_checkout_requirements(event.id, foodie.id, db)
+    with pytest.raises(HTTPException):
+        await event_service.validate_checkout_requirements(
+            event.id, make_user(db, name="Other").id, db
+        )
+
+
+async def test_expired_checkout_releases_only_its_own_hold(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+    hold, _ = hold_seat(event.id, foodie.id, db)
+    hold.checkout_session_id = "cs_new"
+    db.commit()
+
+    stale = await handle_checkout_session_expired(
+        expired_event("cs_old", event.id, foodie.id), db
+    )
+    assert "no seat hold" in stale.message.lower()
+    assert db.query(SeatHoldModel).count() == 1
+
+    await handle_checkout_session_expired(
+        expired_event("cs_new", event.id, foodie.id), db
+    )
+    assert db.query(SeatHoldModel).count() == 0
+    db.refresh(event)
+    assert event.current_participants == 0
+
+
+def test_sweeper_releases_only_expired_holds(db):
+    host = make_user(db)
+    event = make_event(db, host, make_meal(db, host), max_participants=3)
+    abandoned, in_grace, live = (
+        make_user(db, name=name) for name in ("Gone", "Paying", "Browsing")
+    )
+    now = datetime.now(timezone.utc)
+    for foodie, expires_at in [
+        (abandoned, now - timedelta(hours=1)),
+        (in_grace, now - timedelta(minutes=1)),
+        (live, now + timedelta(minutes=20)),
+    ]:
+        hold, _ = hold_seat(event.id, foodie.id, db)
+        hold.expires_at = expires_at
+    db.commit()
+
+    assert release_expired_holds(db) == 1
+    assert {h.foodie_id for h in db.query(SeatHoldModel)} == {in_grace.id, live.id}
+    db.refresh(event)
+    assert event.current_participants == 2
+    assert release_expired_holds(db) == 0
+
+
+async def test_booking_after_hold_was_swept_takes_a_free_seat(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+    hold, _ = hold_seat(event.id, foodie.id, db)
+    hold.expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.commit()
+    release_expired_holds(db)
+
+    await handle_checkout_session_completed(
+        checkout_event("pi_1", event.id, foodie.id), db
+    )
+    db.refresh(event)
+    assert event.current_participants == 1
@@ -0,0 +1,78 @@
+"""Tests for the async Supabase Storage gateway (no network: MockTransport)."""
+
+import tempfile
+
+import httpx
+import pytest
+
+import services.gateways.storage_service as storage_service
+
+
+@pytest.fixture()
+def storage(monkeypatch):
+    """Route the gateway's client through a scripted transport."""
+    state = {"responses": [], "requests": []}
+
+    async def handler(request: httpx.Request):
+        body = b"".join([chunk async for chunk in request.stream])
+        state["requests"].append((request.method, request.url.path, body))
+        status = state["responses"].pop(0) if state["responses"] else 200
+        return httpx.Response(status, json={})
+
+    client = httpx.AsyncClient(
+        base_url=storage_service.STORAGE_URL, transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(storage_service, "_client", client)
+    monkeypatch.setattr(storage_service.asyncio, "sleep", _no_sleep)
+    return state
+
+
+async def _no_sleep(seconds):
+    return None
+
+
+async def test_upload_streams_file_and_returns_public_url(storage):
+    with tempfile.TemporaryFile(buffering=0) as f:
+        f.write(b"x" * 200_000)
+        f.seek(0)
+        url = await storage_service.upload(
+            "meal-images", "a/original.png", f, "image/png"
+        )
+
+    assert url.endswith("/storage/v1/object/public/meal-images/a/original.png")
+    method, path, body = storage["requests"][0]
+    assert (method, path) == ("POST", "/storage/v1/object/meal-images/a/original.png")
+    assert body == b"x" * 200_000
+
+
+async def test_upload_retries_transient_errors_with_full_body(storage):
+    storage["responses"] = [503, 200]
+    with tempfile.TemporaryFile(buffering=0) as f:
+        f.write(b"payload")
+        f.seek(0)
+        await storage_service.upload("meal-images", "a/original.png", f, "image/png")
+
+    assert [body for _, _, body in storage["requests"]] == [b"payload", b"payload"]
+
+
+async def test_upload_duplicate_after_retry_counts_as_success(storage):
+    storage["responses"] = [502, 409]
+    url = await storage_service.upload(
+        "meal-images", "a/thumb.webp", b"w", "image/webp"
+    )
+    assert url.endswith("a/thumb.webp")
+
+
+async def test_upload_gives_up_after_retries(storage, monkeypatch):
+    monkeypatch.setattr(storage_service.config, "STORAGE_MAX_RETRIES", 1)
+    storage["responses"] = [500, 500]
+    with pytest.raises(storage_service.StorageError):
+        await storage_service.upload("meal-images", "a/x.webp", b"w", "image/webp")
+    assert len(storage["requests"]) == 2
+
+
+async def test_remove_sends_prefixes(storage):
+    await storage_service.remove("profile-pictures", ["a/original.jpg", "a/thumb.webp"])
+    method, path, body = storage["requests"][0]
+    assert (method, path) == ("DELETE", "/storage/v1/object/profile-pictures")
+    assert b"a/thumb.webp" in body
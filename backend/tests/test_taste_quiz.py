@@ -0,0 +1,73 @@
+"""Tests for the prebuilt taste-quiz payload and pick validation."""
+
+import json
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from routers import onboarding
+from services import taste_quiz_service
+from tests.conftest import make_user
+
+
+def make_client():
+    app = FastAPI()
+    app.include_router(onboarding.router)
+    return TestClient(app)
+
+
+def test_questions_served_from_prebuilt_bytes_with_content_etag():
+    client = make_client()
+    resp = client.get("/taste-quiz/questions")
+
+    assert resp.status_code == 200
+    assert resp.content == taste_quiz_service.QUESTIONS_JSON
+    questions = resp.json()
+    assert len(questions) == 8
+    assert set(questions[0]["options"][0]) == {"id", "label", "imageUrl", "emoji"}
+    assert resp.headers["etag"] == f'"{taste_quiz_service.QUESTIONS_VERSION}"'
+    assert resp.headers["cache-control"] == "public, max-age=3600, s-maxage=86400"
+    assert resp.headers["x-quiz-version"] == taste_quiz_service.QUESTIONS_VERSION
+
+    again = client.get(
+        "/taste-quiz/questions", headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_versioned_questions_are_immutable():
+    client = make_client()
+    version = taste_quiz_service.QUESTIONS_VERSION
+
+    resp = client.get(f"/taste-quiz/questions/{version}")
+    assert resp.status_code == 200
+    assert "immutable" in resp.headers["cache-control"]
+    assert json.loads(resp.content) == client.get("/taste-quiz/questions").json()
+
+    assert client.get("/taste-quiz/questions/0000").status_code == 404
+
+
+def _first_option_picks():
+    return [
+        question["options"][0]["id"] for question in taste_quiz_service.QUIZ_QUESTIONS
+    ]
+
+
+async def test_pick_must_answer_its_own_question(db):
+    user = make_user(db)
+    picks = _first_option_picks()
+    picks[0], picks[1] = picks[1], picks[0]  # valid ids, wrong questions
+
+    with pytest.raises(HTTPException) as e:
+        await taste_quiz_service.submit_quiz(user.id, picks, db)
+    assert e.value.status_code == 400
+    assert "Invalid pick" in e.value.detail
+
+
+async def test_valid_picks_store_profile(db):
+    user = make_user(db)
+    profile = await taste_quiz_service.submit_quiz(user.id, _first_option_picks(), db)
+    assert profile.onboarding_completed
+    assert profile.taste_archetype
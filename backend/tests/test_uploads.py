@@ -0,0 +1,174 @@
+"""Tests for the streaming, size-capped image upload helper."""
+
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+import services.image_service as image_service
+import utils.uploads as uploads
+from utils.images import variant_urls
+
+
+def encode(fmt, size=(2000, 1000), **save_kwargs):
+    out = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 40)).save(out, format=fmt, **save_kwargs)
+    return out.getvalue()
+
+
+PNG = encode("PNG", size=(40, 20))
+
+
+@pytest.fixture()
+def uploaded(monkeypatch):
+    uploaded = []
+
+    async def fake_upload(bucket, path, data, content_type, upsert=False):
+        data = data if isinstance(data, bytes) else data.read()
+        uploaded.append((path, data, content_type))
+        return f"https://cdn.test/{path}"
+
+    monkeypatch.setattr(image_service.storage_service, "upload", fake_upload)
+    return uploaded
+
+
+class CountingStream(io.BytesIO):
+    """Records how many bytes the helper actually pulled."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+async def test_valid_image_is_streamed_to_storage(uploaded):
+    url = await image_service.upload_image(
+        UploadFile(io.BytesIO(PNG)), "meal-images", filename_prefix="u1_"
+    )
+    assert url.startswith("https://cdn.test/u1_") and url.endswith("/original.png")
+    original_path, original_bytes, content_type = uploaded[0]
+    assert content_type == "image/png"
+    with Image.open(io.BytesIO(original_bytes)) as img:
+        assert (img.format, img.size) == ("PNG", (40, 20))
+    folder = original_path.rsplit("/", 1)[0]
+    assert {path for path, _, _ in uploaded[1:]} == {
+        f"{folder}/thumb.webp",
+        f"{folder}/card.webp",
+        f"{folder}/full.webp",
+    }
+
+
+async def test_variants_are_resized_webp_without_exif(uploaded):
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    jpeg = encode("JPEG", exif=exif.tobytes())
+
+    await image_service.upload_image(UploadFile(io.BytesIO(jpeg)), "event-images")
+
+    variants = {path.rsplit("/", 1)[1]: data for path, data, _ in uploaded[1:]}
+    widths = {}
+    for name, data in variants.items():
+        with Image.open(io.BytesIO(data)) as img:
+            assert img.format == "WEBP"
+            assert not img.getexif()
+            widths[name] = img.width
+    assert widths == {"thumb.webp": 160, "card.webp": 480, "full.webp": 1280}
+
+
+async def test_original_is_stored_without_exif_and_upright(uploaded):
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    exif[0x0112] = 6  # Orientation: rotate 90 CW to display
+    exif.get_ifd(0x8825)[2] = (40.0, 48.0, 27.0)  # GPSLatitude
+    jpeg = encode("JPEG", size=(200, 100), exif=exif.tobytes())
+
+    url = await image_service.upload_image(UploadFile(io.BytesIO(jpeg)), "event-images")
+
+    assert url.endswith("/original.jpg")
+    _, original, content_type = uploaded[0]
+    assert content_type == "image/jpeg"
+    with Image.open(io.BytesIO(original)) as img:
+        assert img.format == "JPEG"
+        assert not img.getexif()
+        assert img.size == (100, 200)
+
+
+async def test_undecodable_image_rejected(uploaded):
+    truncated = PNG[:40]
+    with pytest.raises(HTTPException) as e:
+        await image_service.upload_image(
+            UploadFile(io.BytesIO(truncated)), "meal-images"
+        )
+    assert e.value.status_code == 400
+    assert uploaded == []
+
+
+async def test_failed_variant_upload_removes_the_whole_folder(monkeypatch):
+    stored, removed = [], []
+
+    async def flaky_upload(bucket, path, data, content_type, upsert=False):
+        if path.endswith("/card.webp"):
+            raise RuntimeError("storage hiccup")
+        stored.append(path)
+        return f"https://cdn.test/{path}"
+
+    async def fake_remove(bucket, paths):
+        removed.extend(paths)
+
+    monkeypatch.setattr(image_service.storage_service, "upload", flaky_upload)
+    monkeypatch.setattr(image_service.storage_service, "remove", fake_remove)
+    monkeypatch.setattr(
+        image_service.storage_service,
+        "public_url",
+        lambda bucket, path: f"https://cdn.test/{bucket}/{path}",
+    )
+
+    with pytest.raises(HTTPException) as e:
+        await image_service.upload_image(UploadFile(io.BytesIO(PNG)), "meal-images")
+    assert "storage hiccup" in e.value.detail
+    assert len(stored) == 3
+    assert set(stored) <= set(removed)
+
+
+def test_variant_urls_only_for_pipeline_uploads():
+    url = "https://x.supabase.co/storage/v1/object/public/meal-images/ab_1/original.jpg"
+    assert variant_urls(url)["card"].endswith("/meal-images/ab_1/card.webp")
+    assert variant_urls("https://x/meal-images/ab_1.jpg") is None
+    assert variant_urls(None) is None
+    assert uploads.stored_object_paths(url, "meal-images") == [
+        "ab_1/original.jpg",
+        "ab_1/thumb.webp",
+        "ab_1/card.webp",
+        "ab_1/full.webp",
+    ]
+
+
+async def test_oversized_upload_stops_reading_at_the_cap(uploaded, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_SIZE_BYTES", 1024)
+    stream = CountingStream(PNG + b"\x00" * 100_000)
+
+    with pytest.raises(HTTPException) as e:
+        await image_service.upload_image(UploadFile(stream), "meal-images")
+    assert "exceeds" in e.value.detail
+    assert stream.bytes_read <= 1024 + uploads.CHUNK_SIZE
+    assert uploaded == []
+
+
+async def test_declared_size_over_cap_rejected_without_reading(uploaded):
+    stream = CountingStream(PNG)
+    upload = UploadFile(stream, size=uploads.MAX_SIZE_BYTES + 1)
+    with pytest.raises(HTTPException):
+        await image_service.upload_image(upload, "meal-images")
+    assert stream.bytes_read == 0
+
+
+async def test_non_image_rejected_on_first_chunk(uploaded):
+    stream = CountingStream(b"%PDF-1.7" + b"\x00" * 1_000_000)
+    with pytest.raises(HTTPException) as e:
+        await image_service.upload_image(UploadFile(stream), "meal-images")
+    assert "Invalid file type" in e.value.detail
+    assert stream.bytes_read == uploads.CHUNK_SIZE
+    assert uploaded == []
@@ -0,0 +1,143 @@
+"""Tests for the Stripe webhook event ledger (dedup by Stripe event id)."""
+
+import hashlib
+import hmac
+import json
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from tests.conftest import make_user, make_meal, make_event
+
+from routers.gateways.stripe import webhook
+from models.event_participant import EventParticipantModel
+from models.stripe_webhook_event import StripeWebhookEventModel
+from schemas.stripe import WebhookResponse
+from services.webhook_ledger_service import process_once
+from utils.config import config
+from utils.database import get_db
+
+
+def stripe_event(event_id="evt_1", event_type="checkout.session.completed"):
+    return {"id": event_id, "type": event_type, "data": {"object": {}}}
+
+
+class Handler:
+    """Counts calls; raises while `fail` is set."""
+
+    def __init__(self, fail=None):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self, event, db):
+        self.calls += 1
+        if self.fail:
+            raise self.fail
+        return WebhookResponse(received=True, message="Handled")
+
+
+async def test_redelivery_is_answered_from_the_ledger(db):
+    handler = Handler()
+    first = await process_once(stripe_event(), db, handler)
+    again = await process_once(stripe_event(), db, handler)
+
+    assert first.message == "Handled"
+    assert again.message == "Event already processed"
+    assert handler.calls == 1
+    row = db.get(StripeWebhookEventModel, "evt_1")
+    assert (row.type, row.status, row.outcome) == (
+        "checkout.session.completed",
+        "processed",
+        "Handled",
+    )
+    assert row.attempts == 1
+    assert row.duration_ms is not None and row.processed_at is not None
+
+
+async def test_failed_event_is_recorded_and_retried(db):
+    handler = Handler(fail=HTTPException(status_code=500, detail="boom"))
+    with pytest.raises(HTTPException):
+        await process_once(stripe_event(), db, handler)
+    row = db.get(StripeWebhookEventModel, "evt_1")
+    assert (row.status, row.outcome) == ("failed", "boom")
+
+    handler.fail = None
+    await process_once(stripe_event(), db, handler)
+    db.refresh(row)
+    assert (row.status, row.attempts) == ("processed", 2)
+    assert handler.calls == 2
+
+
+async def test_in_flight_event_gets_409_until_its_claim_is_stale(db):
+    db.add(
+        StripeWebhookEventModel(
+            id="evt_1",
+            type="payment_intent.canceled",
+            started_at=datetime.now(timezone.utc),
+        )
+    )
+    db.commit()
+    handler = Handler()
+    with pytest.raises(HTTPException) as e:
+        await process_once(stripe_event(), db, handler)
+    assert e.value.status_code == 409
+    assert handler.calls == 0
+
+    row = db.get(StripeWebhookEventModel, "evt_1")
+    row.started_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.commit()
+    await process_once(stripe_event(), db, handler)
+    assert handler.calls == 1
+
+
+def signed(payload: bytes) -> str:
+    timestamp = int(time.time())
+    signature = hmac.new(
+        config.STRIPE_WEBHOOK_SECRET.encode(),
+        f"{timestamp}.".encode() + payload,
+        hashlib.sha256,
+    ).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def test_endpoint_books_once_across_redeliveries(db, stripe_calls):
+    host, foodie = make_user(db), make_user(db, name="Foodie")
+    event = make_event(db, host, make_meal(db, host))
+    payload = json.dumps(
+        {
+            "id": "evt_checkout",
+            "object": "event",
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "id": "cs_1",
+                    "object": "checkout.session",
+                    "payment_intent": "pi_1",
+                    "metadata": {"event_id": event.id, "foodie_id": foodie.id},
+                }
+            },
+        }
+    ).encode()
+
+    app = FastAPI()
+    app.include_router(webhook.router)
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    messages = [
+        client.post(
+            "/webhooks/stripe",
+            content=payload,
+            headers={"stripe-signature": signed(payload)},
+        ).json()["message"]
+        for _ in range(2)
+    ]
+
+    assert messages == [
+        f"Created participation for event {event.id}",
+        "Event already processed",
+    ]
+    assert db.query(EventParticipantModel).count() == 1
+    assert db.get(StripeWebhookEventModel, "evt_checkout").status == "processed"
@@ -1,10 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Annotated
+from typing import Annotated, Optional
 
 from utils.password import verify_token
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user_id(
@@ -31,3 +32,21 @@ async def get_current_user_id(
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def get_optional_user_id(
+    credentials: Annotated[
+        Optional[HTTPAuthorizationCredentials], Depends(optional_security)
+    ],
+) -> Optional[str]:
+    """User ID for public endpoints that personalize for signed-in callers.
+
+    No token, or one that doesn't verify, means anonymous (None) rather than
+    401 - a stale token shouldn't break a public page.
+    """
+    if credentials is None:
+        return None
+    try:
+        return str(verify_token(credentials.credentials))
+    except Exception:
+        return None
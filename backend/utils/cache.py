@@ -0,0 +1,260 @@
+"""Read-through cache for hot service lookups.
+
+    await cache.aget_or_set("host_rating", user_id, aload, ttl=60)
+    await cache.ainvalidate("meal_title", meal_id)      # one key
+    await cache.ainvalidate_namespace("meal_title")     # every key in it
+
+    cache.get_or_set(...), cache.invalidate(...)  # sync twins, for sync code
+
+Backends (CACHE_BACKEND):
+- memory (default): per-worker TTL + LRU dict. Invalidation only reaches
+  the worker that made the write; the TTL bounds staleness elsewhere.
+- redis: shared by every worker via REDIS_URL (needs the `redis` package).
+
+Values must be JSON-serializable so both backends behave the same - cache
+dicts/strings, never ORM objects. Concurrent misses on the same key load
+once (single-flight) and the others wait for that result.
+
+Backend calls are synchronous. The async methods (aget_or_set,
+ainvalidate, ainvalidate_namespace) run them in a worker thread when the
+backend does network I/O (`blocking`), so a slow Redis never stalls the
+event loop - as long as `async def` code only uses those. The sync methods
+are for sync code (scripts, threadpool endpoints).
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """TTL + LRU in-process store (thread-safe)."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        # Namespace generations live apart from the LRU: evicting one would
+        # resurrect entries it had invalidated
+        self._counters: Dict[str, int] = {}
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key])
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisBackend:
+    """Any Redis-protocol server (Redis, Valkey, KeyDB, Dragonfly).
+
+    Entries carry a TTL and generation counters don't, so run the server with
+    a volatile-* maxmemory policy to keep counters from being evicted.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("CACHE_BACKEND=redis requires the `redis` package")
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl: float):
+        self._client.set(key, value, px=int(ttl * 1000))
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(key))
+
+    def clear(self):
+        # Shared server: never FLUSHDB; bumping generations is enough
+        pass
+
+
+class _Flight:
+    """A single-flight lock and how many callers are using it; the entry is
+    dropped when the last one leaves, whether its load succeeded or not."""
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.users = 0
+
+
+class Cache:
+    def __init__(self, backend, prefix: str = "dm"):
+        self.backend = backend
+        self.prefix = prefix
+        self._flight_lock = threading.Lock()
+        self._sync_flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, _Flight] = {}
+
+    # -- keys ---------------------------------------------------------------
+
+    def _generation(self, namespace: str) -> str:
+        return (
+            self._safe(lambda: self.backend.get(f"{self.prefix}:{namespace}:gen"), None)
+            or "0"
+        )
+
+    def _key(self, namespace: str, key: Any) -> str:
+        return f"{self.prefix}:{namespace}:{self._generation(namespace)}:{key}"
+
+    # -- primitives (a broken backend degrades to "always miss") -------------
+
+    def _safe(self, op: Callable[[], Any], default: Any) -> Any:
+        try:
+            return op()
+        except Exception as e:
+            logger.warning(f"Cache backend error: {e}")
+            return default
+
+    def get(self, namespace: str, key: Any) -> Any:
+        raw = self._safe(lambda: self.backend.get(self._key(namespace, key)), None)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, namespace: str, key: Any, value: Any, ttl: float):
+        raw = json.dumps(value)
+        self._safe(lambda: self.backend.set(self._key(namespace, key), raw, ttl), None)
+
+    def invalidate(self, namespace: str, key: Any):
+        self._safe(lambda: self.backend.delete(self._key(namespace, key)), None)
+
+    def invalidate_namespace(self, namespace: str):
+        self._safe(lambda: self.backend.incr(f"{self.prefix}:{namespace}:gen"), None)
+
+    def clear(self):
+        self._safe(self.backend.clear, None)
+
+    # -- async twins (off the event loop for network backends) --------------
+
+    async def _off_loop(self, op: Callable[..., Any], *args: Any) -> Any:
+        if getattr(self.backend, "blocking", False):
+            return await asyncio.to_thread(op, *args)
+        return op(*args)
+
+    async def _aget(self, namespace: str, key: Any) -> Any:
+        return await self._off_loop(self.get, namespace, key)
+
+    async def _aset(self, namespace: str, key: Any, value: Any, ttl: float):
+        await self._off_loop(self.set, namespace, key, value, ttl)
+
+    async def ainvalidate(self, namespace: str, key: Any):
+        await self._off_loop(self.invalidate, namespace, key)
+
+    async def ainvalidate_namespace(self, namespace: str):
+        await self._off_loop(self.invalidate_namespace, namespace)
+
+    # -- read-through with single-flight -------------------------------------
+
+    def get_or_set(
+        self, namespace: str, key: Any, load: Callable[[], Any], ttl: float
+    ) -> Any:
+        value = self.get(namespace, key)
+        if value is not _MISSING:
+            return value
+        flight_key = f"{namespace}:{key}"
+        with self._flight_lock:
+            flight = self._sync_flights.setdefault(
+                flight_key, _Flight(threading.Lock())
+            )
+            flight.users += 1
+        try:
+            with flight.lock:
+                value = self.get(namespace, key)
+                if value is _MISSING:
+                    value = load()
+                    self.set(namespace, key, value, ttl)
+        finally:
+            # A failed load is not cached; the next caller retries it
+            with self._flight_lock:
+                flight.users -= 1
+                if not flight.users:
+                    self._sync_flights.pop(flight_key, None)
+        return value
+
+    async def aget_or_set(
+        self,
+        namespace: str,
+        key: Any,
+        load: Callable[[], Awaitable[Any]],
+        ttl: float,
+    ) -> Any:
+        value = await self._aget(namespace, key)
+        if value is not _MISSING:
+            return value
+        flight_key = f"{namespace}:{key}"
+        # Only touched from the event loop, so no thread lock needed
+        flight = self._async_flights.setdefault(flight_key, _Flight(asyncio.Lock()))
+        flight.users += 1
+        try:
+            async with flight.lock:
+                value = await self._aget(namespace, key)
+                if value is _MISSING:
+                    value = await load()
+                    await self._aset(namespace, key, value, ttl)
+        finally:
+            flight.users -= 1
+            if not flight.users:
+                self._async_flights.pop(flight_key, None)
+        return value
+
+
+def _make_backend():
+    if config.CACHE_BACKEND == "redis":
+        return RedisBackend(config.REDIS_URL)
+    if config.CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND: {config.CACHE_BACKEND}")
+    return MemoryBackend(config.CACHE_MAX_ENTRIES)
+
+
+cache = Cache(_make_backend())
@@ -10,6 +10,66 @@ class Config:
     STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
     RESEND_API_KEY = os.getenv("RESEND_API_KEY")
+    # Shared outbound Stripe HTTP client (keep-alive pool per worker)
+    STRIPE_HTTP_TIMEOUT_SECONDS = float(os.getenv("STRIPE_HTTP_TIMEOUT_SECONDS", "20"))
+    STRIPE_MAX_CONNECTIONS = int(os.getenv("STRIPE_MAX_CONNECTIONS", "50"))
+    STRIPE_MAX_NETWORK_RETRIES = int(os.getenv("STRIPE_MAX_NETWORK_RETRIES", "2"))
+    # Max Stripe refund/void calls in flight while a host cancels an event
+    STRIPE_REFUND_CONCURRENCY = int(os.getenv("STRIPE_REFUND_CONCURRENCY", "8"))
+    # How long a chef's stored charges_enabled is trusted before checkout
+    # re-reads it from Stripe (account.updated keeps it fresh in between)
+    STRIPE_ACCOUNT_STATUS_TTL_SECONDS = int(
+        os.getenv("STRIPE_ACCOUNT_STATUS_TTL_SECONDS", "3600")
+    )
+    # Email outbox worker (services/email_outbox_service.py). Disable on all
+    # but one deployment if you'd rather not have every worker polling.
+    EMAIL_OUTBOX_WORKER_ENABLED = (
+        os.getenv("EMAIL_OUTBOX_WORKER_ENABLED", "true").lower() == "true"
+    )
+    EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+    # How long a claimed email stays with its worker before another may
+    # claim it (the first worker is assumed dead)
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+    # Supabase Storage gateway (services/gateways/storage_service.py)
+    STORAGE_HTTP_TIMEOUT_SECONDS = float(
+        os.getenv("STORAGE_HTTP_TIMEOUT_SECONDS", "30")
+    )
+    STORAGE_MAX_CONNECTIONS = int(os.getenv("STORAGE_MAX_CONNECTIONS", "20"))
+    STORAGE_MAX_RETRIES = int(os.getenv("STORAGE_MAX_RETRIES", "2"))
+    # Direct-to-storage uploads (services/upload_service.py): how long a
+    # client has between asking for an upload URL and finalizing it
+    UPLOAD_URL_TTL_SECONDS = int(os.getenv("UPLOAD_URL_TTL_SECONDS", "600"))
+    # Private bucket direct uploads land in until finalize publishes them,
+    # and the sweeper that deletes the ones never finalized
+    UPLOAD_STAGING_BUCKET = os.getenv("UPLOAD_STAGING_BUCKET", "upload-staging")
+    UPLOAD_STAGING_SWEEPER_ENABLED = (
+        os.getenv("UPLOAD_STAGING_SWEEPER_ENABLED", "true").lower() == "true"
+    )
+    UPLOAD_STAGING_SWEEP_SECONDS = float(
+        os.getenv("UPLOAD_STAGING_SWEEP_SECONDS", "900")
+    )
+    # Service read cache (utils/cache.py): "memory" (per worker) or "redis"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    # Event location geocoding (services/gateways/geocoding_service.py):
+    # "stub" (no network) or "nominatim"
+    GEOCODER = os.getenv("GEOCODER", "stub").lower()
+    GEOCODER_URL = os.getenv("GEOCODER_URL", "https://nominatim.openstreetmap.org")
+    GEOCODER_TIMEOUT_SECONDS = float(os.getenv("GEOCODER_TIMEOUT_SECONDS", "3"))
+    # JSON {"place name": [lat, lng]} the stub geocoder knows
+    GEOCODER_STUB_PLACES = os.getenv("GEOCODER_STUB_PLACES", "{}")
+    # Seat holds (services/seat_service.py): how long a seat is set aside for
+    # an open Checkout Session - also the session's expires_at, so Stripe's
+    # 30 min..24 h range applies - and how often expired holds are swept
+    SEAT_HOLD_TTL_SECONDS = int(os.getenv("SEAT_HOLD_TTL_SECONDS", "1800"))
+    SEAT_HOLD_SWEEPER_ENABLED = (
+        os.getenv("SEAT_HOLD_SWEEPER_ENABLED", "true").lower() == "true"
+    )
+    SEAT_HOLD_SWEEP_SECONDS = float(os.getenv("SEAT_HOLD_SWEEP_SECONDS", "60"))
+    SEAT_HOLD_SWEEP_BATCH_SIZE = int(os.getenv("SEAT_HOLD_SWEEP_BATCH_SIZE", "100"))
 
     @classmethod
     def validate(cls):
@@ -23,6 +83,10 @@ class Config:
             raise ValueError("STRIPE_WEBHOOK_SECRET not set in environment")
         if not cls.RESEND_API_KEY:
             raise ValueError("RESEND_API_KEY not set in environment")
+        # Stripe's Checkout expiry window is 30 min..24 h; seat_service adds a
+        # couple of minutes of margin on top of the TTL
+        if not 1800 <= cls.SEAT_HOLD_TTL_SECONDS <= 86000:
+            raise ValueError("SEAT_HOLD_TTL_SECONDS must be between 1800 and 86000")
 
 
 config = Config()
@@ -8,10 +8,11 @@ from models.user import UserModel
 from models.event import EventModel
 from models.event_participant import EventParticipantModel
 from models.meal import MealModel
-from schemas.user import User
+from schemas.user import PublicUser, User
 from schemas.event import Event
 from schemas.event_participant import EventParticipant
 from schemas.meal import Meal
+from utils.images import variant_urls
 
 
 def user_model_to_schema(
@@ -25,6 +26,7 @@ def user_model_to_schema(
         university=user_model.university,
         description=user_model.description,
         profile_picture=user_model.profile_picture,
+        profile_picture_variants=variant_urls(user_model.profile_picture),
         stripe_account_id=user_model.stripe_account_id,
         stripe_onboarding_complete=user_model.stripe_onboarding_complete,
         invite_code=getattr(user_model, "invite_code", None),
@@ -37,6 +39,21 @@ def user_model_to_schema(
     )
 
 
+def public_user_model_to_schema(user_model: UserModel) -> PublicUser:
+    """Convert UserModel to the PublicUser card (no email/Stripe/referral data)"""
+    return PublicUser(
+        id=user_model.id,
+        name=user_model.name,
+        university=user_model.university,
+        description=user_model.description,
+        profile_picture=user_model.profile_picture,
+        profile_picture_variants=variant_urls(user_model.profile_picture),
+        taste_archetype=getattr(user_model, "taste_archetype", None),
+        taste_description=getattr(user_model, "taste_description", None),
+        created_at=user_model.created_at,
+    )
+
+
 def event_model_to_schema(
     event_model: EventModel, meal_name: str = "", meal_image_url: Optional[str] = None
 ) -> Event:
@@ -47,13 +64,17 @@ def event_model_to_schema(
         meal_id=event_model.meal_id,
         meal_name=meal_name,
         meal_image_url=meal_image_url,
+        meal_image_variants=variant_urls(meal_image_url),
         title=event_model.title,
         description=event_model.description,
         max_participants=event_model.max_participants,
         current_participants=event_model.current_participants,
         location=event_model.location,
+        latitude=event_model.latitude,
+        longitude=event_model.longitude,
         event_date=event_model.event_date,
         image_url=event_model.image_url,
+        image_variants=variant_urls(event_model.image_url),
         price=event_model.price,
         currency=event_model.currency,
         created_at=event_model.created_at,
@@ -102,6 +123,7 @@ def meal_model_to_schema(meal_model: MealModel) -> Meal:
         description=meal_model.description,
         ingredients=meal_model.ingredients,
         image_url=meal_model.image_url,
+        image_variants=variant_urls(meal_model.image_url),
         created_at=meal_model.created_at,
     )
 
@@ -1,24 +1,153 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
+import logging
 import os
+import threading
+import time
+import uuid
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 USER = os.getenv("DB_USER")
 PASSWORD = os.getenv("DB_PASSWORD")
 HOST = os.getenv("DB_HOST")
 PORT = os.getenv("DB_PORT")
 DBNAME = os.getenv("DB_NAME")
 
+# Pool tuning (per engine, so each uvicorn worker holds up to
+# POOL_SIZE + MAX_OVERFLOW connections on each of the sync and async engines)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Supabase / cloud load balancers silently drop idle connections; recycle
+# before they do instead of finding out via a 500 on the next query.
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# 0 disables the server-side statement timeout
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Set when DB_HOST is a PgBouncer in transaction mode (e.g. Supabase's pooler
+# on port 6543): no server-side prepared statements, no startup parameters.
+PGBOUNCER_TRANSACTION_MODE = (
+    os.getenv("DB_PGBOUNCER_TRANSACTION_MODE", "false").lower() == "true"
+)
+
 sslmode = "disable" if HOST in ["localhost", "127.0.0.1"] else "require"
 DATABASE_URL = (
     f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode={sslmode}"
 )
+# Same database through asyncpg, for read paths that must not block the event
+# loop. asyncpg spells the TLS option `ssl`, not `sslmode`.
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?ssl={sslmode}"
+)
+if PGBOUNCER_TRANSACTION_MODE:
+    ASYNC_DATABASE_URL += "&prepared_statement_cache_size=0"
+
+
+class _PoolWaitStats:
+    """Running totals of how long callers waited to check out a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time (pool contention)."""
+
+    wait_stats = _PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool twin of TimedQueuePool for the asyncpg engine."""
+
+    wait_stats = _PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+
+def _sync_connect_args() -> dict:
+    if STATEMENT_TIMEOUT_MS and not PGBOUNCER_TRANSACTION_MODE:
+        return {"options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    connect_args: dict = {}
+    if STATEMENT_TIMEOUT_MS and not PGBOUNCER_TRANSACTION_MODE:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(STATEMENT_TIMEOUT_MS)
+        }
+    if PGBOUNCER_TRANSACTION_MODE:
+        # Statements may land on a different server connection than the one
+        # they were prepared on; disable the cache and use unique names.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = (
+            lambda: f"__asyncpg_{uuid.uuid4()}__"
+        )
+    return connect_args
+
+
+if STATEMENT_TIMEOUT_MS and PGBOUNCER_TRANSACTION_MODE:
+    # PgBouncer rejects unknown startup parameters, and a session-level SET
+    # would leak across clients in transaction mode.
+    logger.warning(
+        "DB_STATEMENT_TIMEOUT_MS is ignored in PgBouncer transaction mode; "
+        "set it on the database role instead (ALTER ROLE ... SET statement_timeout)"
+    )
+
+_pool_kwargs = dict(
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=POOL_RECYCLE,
+    pool_pre_ping=POOL_PRE_PING,
+)
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    connect_args=_sync_connect_args(),
+    **_pool_kwargs,
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=TimedAsyncQueuePool,
+    connect_args=_async_connect_args(),
+    **_pool_kwargs,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attribute access after commit would otherwise trigger
+# an implicit (sync) refresh, which AsyncSession cannot do.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
@@ -27,9 +156,40 @@ def get_database_url():
     return DATABASE_URL
 
 
+def _describe_pool(pool, wait_stats: _PoolWaitStats) -> dict:
+    checkouts = wait_stats.checkouts
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": checkouts,
+        "avg_wait_ms": (
+            round(wait_stats.total_wait / checkouts * 1000, 3) if checkouts else 0.0
+        ),
+        "max_wait_ms": round(wait_stats.max_wait * 1000, 3),
+    }
+
+
+def pool_stats() -> dict:
+    """In-use counts and checkout wait times for both engines on this worker."""
+    return {
+        "sync": _describe_pool(engine.pool, TimedQueuePool.wait_stats),
+        "async": _describe_pool(
+            async_engine.sync_engine.pool, TimedAsyncQueuePool.wait_stats
+        ),
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async counterpart of get_db for endpoints ported to AsyncSession."""
+    async with AsyncSessionLocal() as db:
+        yield db
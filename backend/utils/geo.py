@@ -0,0 +1,78 @@
+"""Radius queries over event coordinates.
+
+Distances use the equirectangular approximation: plain arithmetic, so the
+same SQL runs on Postgres and SQLite, and well under 1% off at the radii we
+allow (MAX_RADIUS_KM). Results are ordered by squared distance, which is
+monotonic in distance and needs no sqrt in SQL.
+
+Postgres prefilters with a bounding box on the GiST point index
+(ix_events_location_point); SQLite uses plain range predicates. Boxes that
+would cross the antimeridian are not handled - no campus is near one.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func
+from typing import Tuple
+import math
+
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LNG_AT_EQUATOR = 111.320
+MAX_RADIUS_KM = 50.0
+
+
+def parse_near(near: str) -> Tuple[float, float]:
+    """`"lat,lng"` -> (lat, lng); 400 on anything else."""
+    try:
+        lat_text, lng_text = near.split(",")
+        lat, lng = float(lat_text), float(lng_text)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="near must be 'lat,lng'")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(status_code=400, detail="near is out of range")
+    return lat, lng
+
+
+def check_radius(radius_km: float) -> float:
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise HTTPException(
+            status_code=400,
+            detail=f"radius must be between 0 and {MAX_RADIUS_KM:g} km",
+        )
+    return radius_km
+
+
+def _km_per_deg_lng(lat: float) -> float:
+    # Clamp so a point at a pole doesn't make the box infinitely wide
+    return KM_PER_DEG_LNG_AT_EQUATOR * max(math.cos(math.radians(lat)), 0.01)
+
+
+def within_radius(
+    dialect: str, lat: float, lng: float, radius_km: float, lat_column, lng_column
+):
+    """(WHERE clause, squared-distance-in-km² expression) around (lat, lng)."""
+    lat_span = radius_km / KM_PER_DEG_LAT
+    lng_span = radius_km / _km_per_deg_lng(lat)
+    dy = (lat_column - lat) * KM_PER_DEG_LAT
+    dx = (lng_column - lng) * _km_per_deg_lng(lat)
+    distance_sq = dy * dy + dx * dx
+
+    if dialect == "postgresql":
+        # Same expression and predicate as the partial index, so it's used
+        box = func.box(
+            func.point(lng - lng_span, lat - lat_span),
+            func.point(lng + lng_span, lat + lat_span),
+        )
+        in_box = and_(
+            lat_column.isnot(None),
+            func.point(lng_column, lat_column).op("<@")(box),
+        )
+    else:
+        in_box = and_(
+            lat_column.between(lat - lat_span, lat + lat_span),
+            lng_column.between(lng - lng_span, lng + lng_span),
+        )
+    return and_(in_box, distance_sq <= radius_km * radius_km), distance_sq
+
+
+def distance_km(distance_sq: float) -> float:
+    return round(math.sqrt(distance_sq), 3)
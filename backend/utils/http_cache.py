@@ -0,0 +1,183 @@
+"""HTTP caching for public, read-mostly GET endpoints.
+
+Mark an endpoint with @cacheable(...). HTTPCacheMiddleware then gives its
+200 responses a weak ETag (hash of the body) and the route's Cache-Control,
+and answers a matching If-None-Match with 304 and no body. The route's tags
+go out as Cache-Tag / Surrogate-Key so a CDN can purge them selectively.
+
+A response that turns out to depend on the caller (e.g. a feed scoped by
+the signed-in user's campus) calls mark_private(request): it then goes out
+`private` without s-maxage, so browsers still revalidate it by ETag but no
+shared cache stores it.
+
+Writes call invalidate("events", ...) after committing. Browsers need
+nothing more - the ETag changes with the body. Registered purgers (e.g. a
+CDN purge-by-tag client) are told which tags went stale so edge copies
+don't outlive their data by up to max-age.
+"""
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Callable, Dict, Iterable, List, Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+_POLICY_ATTR = "__http_cache_policy__"
+_PRIVATE_STATE = "http_cache_private"
+
+
+class CachePolicy:
+    def __init__(
+        self,
+        max_age: int,
+        s_maxage: Optional[int] = None,
+        stale_while_revalidate: int = 0,
+        tags: Iterable[str] = (),
+        immutable: bool = False,
+        vary: Iterable[str] = (),
+    ):
+        self.tags = tuple(tags)
+        self.vary = tuple(vary)
+        directives = [f"max-age={max_age}"]
+        if stale_while_revalidate:
+            directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+        if immutable:
+            directives.append("immutable")
+        self.private_cache_control = ", ".join(["private"] + directives)
+        if s_maxage is not None:
+            directives.insert(1, f"s-maxage={s_maxage}")
+        self.cache_control = ", ".join(["public"] + directives)
+
+    def headers(self, etag: str, private: bool = False) -> Dict[str, str]:
+        cache_control = self.private_cache_control if private else self.cache_control
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if self.tags:
+            headers["Cache-Tag"] = ",".join(self.tags)
+            headers["Surrogate-Key"] = " ".join(self.tags)
+        if self.vary:
+            headers["Vary"] = ", ".join(self.vary)
+        return headers
+
+
+def cacheable(
+    max_age: int,
+    s_maxage: Optional[int] = None,
+    stale_while_revalidate: int = 0,
+    tags: Iterable[str] = (),
+    vary: Iterable[str] = (),
+):
+    """Mark a public GET endpoint as HTTP-cacheable (see module docstring).
+
+    Only use on responses that are identical for every caller - never on
+    anything that reads the current user - unless `vary` names the request
+    header the response depends on (e.g. vary=("Authorization",)), so
+    caches key on it.
+    """
+    policy = CachePolicy(max_age, s_maxage, stale_while_revalidate, tags, vary=vary)
+
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, _POLICY_ATTR, policy)
+        return endpoint
+
+    return decorator
+
+
+def mark_private(request: Request):
+    """Serve this response `private`: it depends on who is asking, so only
+    the caller's own browser may keep it."""
+    setattr(request.state, _PRIVATE_STATE, True)
+
+
+def weak_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+def precomputed_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    policy: CachePolicy,
+    media_type: str = "application/json",
+) -> Response:
+    """Serve a body built ahead of time under its known ETag.
+
+    For static payloads: no per-request serialization or hashing, so don't
+    also decorate the endpoint with @cacheable.
+    """
+    headers = policy.headers(etag)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, headers=headers, media_type=media_type)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same validator
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted
+        for candidate in if_none_match.split(",")
+    )
+
+
+class HTTPCacheMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD") or response.status_code != 200:
+            return response
+        # The router stores the matched endpoint in the (shared) scope
+        policy: Optional[CachePolicy] = getattr(
+            request.scope.get("endpoint"), _POLICY_ATTR, None
+        )
+        if policy is None:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = weak_etag(body)
+        headers = dict(response.headers)
+        headers.pop("content-length", None)
+        existing_vary = headers.pop("vary", None)
+        private = getattr(request.state, _PRIVATE_STATE, False)
+        headers.update(policy.headers(etag, private=private))
+        if existing_vary:
+            # e.g. CORS's Vary: Origin - keep it alongside the policy's
+            headers["Vary"] = ", ".join(
+                filter(None, [existing_vary, headers.get("Vary")])
+            )
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type,
+        )
+
+
+_purgers: List[Callable[[Iterable[str]], None]] = []
+
+
+def register_purger(purger: Callable[[Iterable[str]], None]):
+    """Call `purger(tags)` whenever those tags are invalidated."""
+    _purgers.append(purger)
+
+
+def invalidate(*tags: str):
+    """Tell shared caches that responses tagged with `tags` are stale.
+
+    Best-effort: a failing purger is logged and never fails the write that
+    triggered it.
+    """
+    for purger in _purgers:
+        try:
+            purger(tags)
+        except Exception as e:
+            logger.error(f"Cache purge for {tags} failed: {e}")
@@ -0,0 +1,108 @@
+"""Responsive image variants for uploaded photos.
+
+Every upload is stored as a folder: the original plus one WebP per entry in
+VARIANT_WIDTHS. All of them are re-encoded without EXIF (no GPS / camera
+data) after being rotated per the EXIF orientation, so nothing ends up
+sideways; the original keeps its format and full size:
+
+    <bucket>/<name>/original.jpg
+    <bucket>/<name>/thumb.webp    160px wide - avatars, list rows
+    <bucket>/<name>/card.webp     480px wide - feed cards
+    <bucket>/<name>/full.webp    1280px wide - detail pages
+
+Variants only ever shrink; a small original yields same-size WebPs. URLs are
+derived from the original's URL (variant_urls), so no extra columns are
+needed and pre-pipeline images (flat names) simply have no variant map.
+"""
+
+from PIL import Image, ImageOps
+from typing import BinaryIO, Dict, Optional, Tuple
+import io
+
+VARIANT_WIDTHS = {"thumb": 160, "card": 480, "full": 1280}
+VARIANT_FORMAT = "webp"
+WEBP_QUALITY = 80
+# Originals are re-encoded only to drop metadata, so keep them near-lossless
+ORIGINAL_JPEG_QUALITY = 92
+ORIGINAL_WEBP_QUALITY = 92
+ORIGINAL_STEM = "original"
+
+# 5MB of compressed input can still decode to a huge bitmap; refuse anything
+# beyond ~40 megapixels instead of allocating it
+MAX_PIXELS = 40_000_000
+
+
+class ImageProcessingError(ValueError):
+    pass
+
+
+def _encode_original(image: Image.Image, image_type: str) -> bytes:
+    """Full-size re-encode in the upload's own format, metadata dropped."""
+    if image_type == "jpeg" and image.mode not in ("RGB", "L", "CMYK"):
+        image = image.convert("RGB")
+    out = io.BytesIO()
+    # Only colour profile and transparency are carried over - no exif=, no
+    # text chunks
+    options = {
+        key: image.info[key]
+        for key in ("icc_profile", "transparency")
+        if image.info.get(key) is not None
+    }
+    if image_type == "jpeg":
+        options["quality"] = ORIGINAL_JPEG_QUALITY
+    elif image_type == "webp":
+        options["quality"] = ORIGINAL_WEBP_QUALITY
+    image.save(out, format=image_type.upper(), **options)
+    return out.getvalue()
+
+
+def build_images(source: BinaryIO, image_type: str) -> Tuple[bytes, Dict[str, bytes]]:
+    """Decode `source` (detected as `image_type`) and return (original without
+    metadata, {variant name: WebP bytes}). CPU-bound."""
+    try:
+        with Image.open(source) as image:
+            width, height = image.size
+            if width * height > MAX_PIXELS:
+                raise ImageProcessingError("Image dimensions are too large")
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except ImageProcessingError:
+        raise
+    except Exception as e:
+        raise ImageProcessingError(f"Could not decode image: {e}")
+
+    try:
+        original = _encode_original(image, image_type)
+    except Exception as e:
+        raise ImageProcessingError(f"Could not re-encode image: {e}")
+
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants: Dict[str, bytes] = {}
+    for name, target_width in VARIANT_WIDTHS.items():
+        resized = image.copy()
+        if resized.width > target_width:
+            target_height = round(resized.height * target_width / resized.width)
+            resized = resized.resize(
+                (target_width, max(target_height, 1)), Image.Resampling.LANCZOS
+            )
+        out = io.BytesIO()
+        # No exif= argument: the re-encoded file carries no metadata
+        resized.save(out, format=VARIANT_FORMAT, quality=WEBP_QUALITY, method=4)
+        variants[name] = out.getvalue()
+    return original, variants
+
+
+def variant_urls(original_url: Optional[str]) -> Optional[Dict[str, str]]:
+    """{variant name: URL} for an uploaded original, or None for legacy images."""
+    if not original_url:
+        return None
+    base, _, query = original_url.partition("?")
+    folder, _, filename = base.rpartition("/")
+    if not filename.startswith(f"{ORIGINAL_STEM}."):
+        return None
+    suffix = f"?{query}" if query else ""
+    return {
+        name: f"{folder}/{name}.{VARIANT_FORMAT}{suffix}" for name in VARIANT_WIDTHS
+    }
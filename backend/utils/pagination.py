@@ -0,0 +1,54 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor is the sort key of the last row a client has seen, JSON-encoded and
+base64url'd so clients treat it as a token rather than something to build.
+Feeds resume with `WHERE (sort_key, id) > (cursor values)` instead of OFFSET,
+so page N costs the same as page 1.
+"""
+
+from fastapi import HTTPException
+from datetime import datetime
+from typing import Any, Tuple
+import base64
+import json
+
+
+def _encode(sort_value: Any, row_id: str) -> str:
+    payload = json.dumps({"k": sort_value, "i": row_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> Tuple[Any, str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    return payload["k"], str(payload["i"])
+
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    return _encode(sort_value.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Return (sort_value, row_id); 400 on anything that isn't one of ours."""
+    try:
+        sort_value, row_id = _decode(cursor)
+        return datetime.fromisoformat(sort_value), row_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_score_cursor(score: float, row_id: str) -> str:
+    """Cursor for feeds ordered by a float score (search rank)."""
+    # JSON round-trips a float exactly, so the seek compares equal to the
+    # score the database computes again for the same row
+    return _encode(score, row_id)
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        score, row_id = _decode(cursor)
+        if not isinstance(score, (int, float)) or isinstance(score, bool):
+            raise TypeError("score cursor expected")
+        return float(score), row_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,8 +1,15 @@
 import bcrypt
 from fastapi import HTTPException
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
+from collections import OrderedDict
+from typing import Optional
+import asyncio
+import hashlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,11 +25,21 @@ ALGORITHM = "HS256"
 # a 30-minute token was logging people out mid-form (beta feedback, July 2026)
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7
 
+# bcrypt cost factor (log2 rounds). Each +1 doubles hash/verify time; existing
+# hashes are upgraded (or downgraded) transparently on the user's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt releases the GIL, so a thread pool gives real parallelism while
+# keeping ~250ms of CPU per call off the event loop.
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "0")) or (os.cpu_count() or 1)
+_bcrypt_pool = ThreadPoolExecutor(
+    max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt"
+)
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
@@ -34,6 +51,29 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a hash was made with a cost other than BCRYPT_ROUNDS"""
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt worker pool (use from async handlers)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt worker pool (use from async handlers)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _bcrypt_pool, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(0)):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -49,13 +89,80 @@ def create_access_token(data: dict, expires_delta: timedelta = timedelta(0)):
     return encoded_jwt
 
 
+class _VerifiedTokenCache:
+    """Bounded LRU of already-verified tokens -> (user_id, exp).
+
+    Keyed by SHA-256 of the token so raw bearer tokens never sit in memory
+    longer than the request. Entries die at the token's own exp, so caching
+    never extends a token's life.
+    """
+
+    def __init__(self, max_size: int):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, tuple[str, float]]" = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, user_id: str, exp: float):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (user_id, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# 0 disables the cache (every request runs a full jwt.decode)
+_token_cache = _VerifiedTokenCache(int(os.getenv("JWT_CACHE_SIZE", "10000")))
+
+
+def token_cache_stats() -> dict:
+    """Hit/miss counters for the verified-token cache on this worker"""
+    return _token_cache.stats()
+
+
 def verify_token(token: str):
     """Verify and decode JWT token"""
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    user_id = _token_cache.get(key)
+    if user_id is not None:
+        return user_id
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("userId")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return user_id
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+    # Tokens we issue always carry exp; one without it is verified every time
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _token_cache.put(key, user_id, float(exp))
+    return user_id
@@ -0,0 +1,71 @@
+"""Ranked text search over events and meals.
+
+Postgres: each searchable table has a generated, weighted `search_vector`
+tsvector column (see migration a7c3e9f1b2d4) with a GIN index, and a
+pg_trgm GIN index on `title`. A row matches when the vector matches the
+query (websearch syntax: quotes, OR, -word) or the query is a close fuzzy
+match for a word in the title, so "lazagna" still finds "Lasagna night".
+Rank is ts_rank_cd, normalized to 0..1, plus a smaller fuzzy-title bonus.
+
+SQLite (tests, local dev): every query word must appear as a substring of
+some field; rank sums the same A/B/C weights Postgres uses per matching
+word and field. No stemming, no typo tolerance.
+
+The search_vector columns are not mapped on the models: they are generated
+by Postgres and never written, and SQLite can't create them.
+"""
+
+from sqlalchemy import Float, and_, case, cast, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from typing import List, Sequence, Tuple
+
+TEXT_SEARCH_CONFIG = "english"
+# Default ts_rank weights for setweight() labels A, B, C
+FIELD_WEIGHTS = (1.0, 0.4, 0.2)
+FUZZY_WEIGHT = 0.25
+MAX_QUERY_TERMS = 8
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def match_and_rank(dialect: str, query: str, table: str, fields: Sequence, title):
+    """(WHERE clause, rank expression) for `query` against `table`.
+
+    `fields` are the columns behind search_vector in weight order (A, B, C);
+    `title` is the trigram-indexed column.
+    """
+    if dialect == "postgresql":
+        vector = literal_column(f"{table}.search_vector", TSVECTOR)
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+        fuzzy = literal(query).op("<%")(title)
+        where = or_(vector.op("@@")(tsquery), fuzzy)
+        # Normalization 32: rank / (rank + 1)
+        text_rank = func.ts_rank_cd(vector, tsquery, 32)
+        fuzzy_rank = func.word_similarity(query, title)
+        return where, cast(text_rank + FUZZY_WEIGHT * fuzzy_rank, Float)
+
+    terms = query.lower().split()[:MAX_QUERY_TERMS]
+    matches: List = []
+    scores: List = []
+    for term in terms:
+        pattern = _like_pattern(term)
+        hits = [func.lower(field).like(pattern, escape="\\") for field in fields]
+        matches.append(or_(*hits))
+        scores += [
+            case((hit, weight), else_=0.0) for hit, weight in zip(hits, FIELD_WEIGHTS)
+        ]
+    if not matches:
+        return literal(False), literal(0.0)
+    return and_(*matches), cast(sum(scores[1:], scores[0]), Float)
+
+
+def after_cursor(rank, id_column, after: Tuple[float, str], id_type):
+    """Keyset seek for ORDER BY rank DESC, id ASC."""
+    after_rank, after_id = after
+    return or_(
+        rank < after_rank,
+        and_(rank == after_rank, id_column > literal(after_id, id_type)),
+    )
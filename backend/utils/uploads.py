@@ -1,21 +1,46 @@
-"""Shared image upload helper for Supabase Storage.
+"""Image upload validation and storage paths.
 
 Validates by MAGIC BYTES (not the client-supplied content-type header or
-filename), whitelists the extension from the detected type, and uploads to
-the given bucket. Replaces three drifted copy-pastes in user/meal/event
-services.
+filename) and whitelists the extension from the detected type. The body is
+read in chunks into an unbuffered temp file and rejected the moment it
+passes MAX_SIZE_BYTES (or fails the magic-byte sniff on its first bytes),
+so an oversized or bogus body is never held in memory.
+
+Every upload is stored as a folder: `original.<ext>` plus the WebP variants
+(see utils/images.py). The upload pipeline itself - decode, strip EXIF,
+store - is services/image_service.py.
 """
 
 from fastapi import HTTPException, UploadFile
 from datetime import datetime
+from typing import AsyncIterator, BinaryIO, List, Optional
 import uuid
-import logging
-
-from utils.supabase import supabase
 
-logger = logging.getLogger(__name__)
+from utils.images import ORIGINAL_STEM, VARIANT_FORMAT, VARIANT_WIDTHS
 
 MAX_SIZE_BYTES = 5 * 1024 * 1024  # 5MB
+CHUNK_SIZE = 64 * 1024
+# Enough bytes for every signature _detect_image_type checks
+_SNIFF_BYTES = 12
+# Client-declared content-type -> the type _detect_image_type must then find
+IMAGE_TYPES = {"image/jpeg": "jpeg", "image/png": "png", "image/webp": "webp"}
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=400, detail="File size exceeds 5MB limit.")
+
+
+def check_size(size: Optional[int]):
+    """400 if a size known up front (multipart, content-length) is too big."""
+    if size is not None and size > MAX_SIZE_BYTES:
+        raise _too_large()
+
+
+def bad_type() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed.",
+    )
 
 
 def _detect_image_type(contents: bytes) -> str | None:
@@ -29,37 +54,65 @@ def _detect_image_type(contents: bytes) -> str | None:
     return None
 
 
-async def upload_image(
-    image: UploadFile, bucket: str, filename_prefix: str = ""
-) -> str:
-    """Validate and upload an image; returns the public URL."""
-    contents = await image.read()
+async def upload_chunks(image: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await image.read(CHUNK_SIZE):
+        yield chunk
+
 
-    if len(contents) > MAX_SIZE_BYTES:
-        raise HTTPException(status_code=400, detail="File size exceeds 5MB limit.")
+async def spool_capped(chunks: AsyncIterator[bytes], spool: BinaryIO) -> str:
+    """Copy `chunks` into `spool` one by one; return the detected type.
+
+    Raises 400 as soon as the sniffed type is wrong or the size passes the cap.
+    """
+    head = b""
+    detected = None
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > MAX_SIZE_BYTES:
+            raise _too_large()
+        if detected is None:
+            head += chunk[:_SNIFF_BYTES]
+            if len(head) >= _SNIFF_BYTES:
+                detected = _detect_image_type(head)
+                if detected is None:
+                    raise bad_type()
+        spool.write(chunk)
 
-    detected = _detect_image_type(contents)
     if detected is None:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed.",
-        )
+        # Tiny file: EOF before _SNIFF_BYTES; JPEG/PNG can still match
+        detected = _detect_image_type(head)
+        if detected is None:
+            raise bad_type()
+    spool.seek(0)
+    return detected
 
-    # Extension and content-type come from the DETECTED type, never the client
-    extension = "jpg" if detected == "jpeg" else detected
-    content_type = f"image/{detected}"
 
-    unique_filename = (
-        f"{filename_prefix}{uuid.uuid4()}_{int(datetime.now().timestamp())}.{extension}"
-    )
+def new_original_path(image_type: str, filename_prefix: str = "") -> str:
+    """Fresh `<folder>/original.<ext>` path for an image of the given type."""
+    extension = "jpg" if image_type == "jpeg" else image_type
+    folder = f"{filename_prefix}{uuid.uuid4()}_{int(datetime.now().timestamp())}"
+    return f"{folder}/{ORIGINAL_STEM}.{extension}"
+
+
+def new_staging_path(image_type: str) -> str:
+    """Fresh flat path in the staging bucket for a direct upload."""
+    extension = "jpg" if image_type == "jpeg" else image_type
+    return f"{uuid.uuid4()}.{extension}"
+
+
+def stored_object_paths(public_url: str, bucket: str) -> List[str]:
+    """Every storage path behind an uploaded image's public URL (for removal).
 
-    try:
-        supabase.storage.from_(bucket).upload(
-            unique_filename, contents, {"content-type": content_type}
-        )
-        return supabase.storage.from_(bucket).get_public_url(unique_filename)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error uploading image to bucket {bucket}: {e}", exc_info=True)
-        raise HTTPException(status_code=400, detail=f"Error uploading image: {str(e)}")
+    Pipeline uploads are a folder (original + variants); older uploads are a
+    single flat object.
+    """
+    marker = f"{bucket}/"
+    if marker not in public_url:
+        return []
+    path = public_url.split(marker)[-1].split("?")[0]
+    folder, _, filename = path.rpartition("/")
+    if folder and filename.startswith(f"{ORIGINAL_STEM}."):
+        variants = [f"{folder}/{name}.{VARIANT_FORMAT}" for name in VARIANT_WIDTHS]
+        return [path] + variants
+    return [path]